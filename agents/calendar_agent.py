@@ -8,7 +8,11 @@ from dotenv import load_dotenv
 
 # LangGraph 프로젝트 내부의 google_calendar_handler 사용
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from google_calendar_handler import GoogleCalendarHandler
+from google_calendar_handler import GoogleCalendarHandler, make_event_id
+from dedup import dedup_index, duplicate_status
+from event_registry import event_registry
+from row_status import STATUS_SYNCED, skipped_status, failed_status
+from progress import emit
 
 load_dotenv()
 
@@ -18,11 +22,59 @@ class CalendarAgent:
 
     def __init__(self):
         self.handler = GoogleCalendarHandler()
+        self.sheet_id = os.getenv("GOOGLE_SHEET_ID", "")
+
+    def _event_infos(self, event: dict) -> list:
+        """
+        캘린더 등록용 이벤트 정보 구성 (문자 하나에 일정이 여러 개면 일정마다 하나씩)
+
+        행 번호와 원본 텍스트(두 번째 일정부터는 일정 번호도)로 결정적인 이벤트 ID를 붙여,
+        재개/재시도 시 같은 행의 일정이 두 번 등록되지 않도록 합니다.
+        모든 일정에 원본 행 번호(source_row), 원본 텍스트(source_text), 일정 번호(part)를 함께 기록합니다.
+        """
+        row_number = event["row_number"]
+        text = event.get("original_text", "")
+        infos = []
+        for part, source in enumerate(event.get("events") or [event]):
+            id_parts = (self.sheet_id, row_number, text) + ((part,) if part else ())
+            infos.append({
+                "title": source.get("title", ""),
+                "date": source.get("date", ""),
+                "time": source.get("time", ""),
+                "location": source.get("location", ""),
+                "description": source.get("description", ""),
+                "notes": source.get("notes", ""),
+                "event_id": make_event_id(*id_parts),
+                "source_row": row_number,
+                "source_text": text,
+                "part": part,
+            })
+        return infos
+
+    def _claim(self, event_info: dict):
+        """
+        같은 일정(날짜/시간이 같고 제목이 비슷한 일정)이 이미 등록됐는지 확인
+
+        Returns:
+            tuple 또는 None: 중복이면 (원본 행 번호, 원본 이벤트 ID)
+        """
+        row_number = event_info["source_row"]
+        claimed = dedup_index.claim_event(
+            row_number, event_info["source_text"], event_info["title"], event_info["date"], event_info["time"],
+            event_info["event_id"], part=event_info["part"]
+        )
+        if claimed is not None:
+            original_row, original_event_id = claimed
+            emit("calendar", "done", f"🔁 행 {row_number}: 행 {original_row}와 같은 일정이라 등록을 건너뜁니다.",
+                 row=row_number, event_id=original_event_id, status_text=duplicate_status(original_row))
+        return claimed
 
     def create_calendar_event(self, state: dict) -> dict:
         """
         파싱된 이벤트를 구글 캘린더에 등록합니다.
 
+        문자 하나에 일정이 여러 개면 모두 한 번의 배치 요청으로 등록합니다.
+
         Args:
             state: 현재 워크플로우 상태
 
@@ -33,70 +85,158 @@ class CalendarAgent:
         if not current_event:
             return {"messages": ["⚠️  등록할 이벤트가 없습니다."]}
 
-        row_number = current_event["row_number"]
-
-        # 날짜가 없으면 캘린더 등록 생략
-        if not current_event.get("date"):
-            warning_msg = f"⚠️  행 {row_number}: 날짜 정보가 없어 캘린더 등록을 건너뜁니다."
-            print(f"\n{warning_msg}")
-            return {
-                "current_event": {
-                    **current_event,
-                    "status": "완료 (날짜 없음)"
-                },
-                "messages": [warning_msg],
-            }
-
-        print(f"\n📅 [Calendar Agent] 행 {row_number} 캘린더 등록 중...")
-
-        event_info = {
-            "title": current_event.get("title", ""),
-            "date": current_event.get("date", ""),
-            "time": current_event.get("time", ""),
-            "location": current_event.get("location", ""),
-            "description": current_event.get("description", ""),
-            "notes": current_event.get("notes", ""),
-        }
+        updated, messages, errors = self._register([current_event])
+        result = {"current_event": updated[0], "messages": messages}
+        if errors:
+            result["errors"] = errors
+        return result
 
+    def create_calendar_events(self, state: dict) -> dict:
+        """
+        현재 배치의 이벤트들을 한 번의 배치 요청으로 캘린더에 등록합니다.
+
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        batch = state.get("current_batch") or []
+        if not batch:
+            return {"messages": ["⚠️  등록할 이벤트가 없습니다."]}
+
+        updated, messages, errors = self._register(batch)
+        result = {"current_batch": updated, "messages": messages}
+        if errors:
+            result["errors"] = errors
+        return result
+
+    def _register(self, events: list) -> tuple:
+        """
+        행들의 일정을 캘린더에 등록하고 행마다 결과 상태를 정합니다.
+
+        날짜가 없는 일정은 건너뛰고, 이미 등록된 일정(중복)은 원본 이벤트 ID를 사용합니다.
+        등록할 일정이 하나면 단건 요청, 여러 개면 배치 요청 한 번으로 보냅니다.
+
+        Returns:
+            tuple: (갱신된 이벤트 리스트, 메시지 리스트, 에러 리스트)
+        """
+        updated = list(events)
+        messages = []
+        outcomes = {}  # 이벤트 인덱스 → [(일정 정보, event_id, 오류, 원본 행), ...]
+        pending = []   # 등록할 (이벤트 인덱스, 일정 정보)
+
+        for index, event in enumerate(events):
+            infos = [info for info in self._event_infos(event) if info["date"]]
+
+            # 날짜가 없으면 캘린더 등록 생략 (파싱에 실패해 날짜가 없으면 다시 처리되도록 실패로 남김)
+            if not infos:
+                status = failed_status("파싱 실패") if event.get("error") else skipped_status("날짜 없음")
+                updated[index] = {**event, "status": status}
+                warning_msg = f"⚠️  행 {event['row_number']}: 날짜 정보가 없어 캘린더 등록을 건너뜁니다."
+                messages.append(warning_msg)
+                emit("calendar", "warning", warning_msg, row=event["row_number"])
+                continue
+
+            outcomes[index] = []
+            for info in infos:
+                claimed = self._claim(info)
+                if claimed is not None:
+                    outcomes[index].append((info, claimed[1], None, claimed[0]))
+                else:
+                    pending.append((index, info))
+
+        if len(events) == 1 and pending:
+            emit("calendar", "started", f"📅 [Calendar Agent] 행 {events[0]['row_number']} 캘린더 등록 중...",
+                 row=events[0]["row_number"])
+        elif pending:
+            emit("calendar", "started", f"📅 [Calendar Agent] {len(pending)}개 일정 일괄 등록 중...",
+                 rows=sorted({events[index]["row_number"] for index, _ in pending}))
+
+        for (index, info), (event_id, error) in zip(pending, self._insert([info for _, info in pending])):
+            if not event_id:
+                dedup_index.release_event(info["source_text"], info["part"])
+            outcomes[index].append((info, event_id, error, None))
+
+        errors = []
+        for index, results in outcomes.items():
+            updated[index], message, error = self._settle(events[index], results)
+            messages.append(message)
+            if error:
+                errors.append(error)
+        return updated, messages, errors
+
+    def _insert(self, event_infos: list) -> list:
+        """
+        일정들을 등록하고 입력 순서대로 (event_id, error) 리스트 반환
+
+        이전 실행(재개/재처리)에서 이미 등록한 일정은 요청하지 않고 기록된 이벤트 ID를 사용합니다.
+        """
+        registered = event_registry.registered([info["event_id"] for info in event_infos])
+        sent = iter(self._send([info for info in event_infos if info["event_id"] not in registered]))
+        return [
+            (info["event_id"], None) if info["event_id"] in registered else next(sent)
+            for info in event_infos
+        ]
+
+    def _send(self, event_infos: list) -> list:
+        """일정들을 캘린더 API로 등록하고 성공한 이벤트 ID를 등록 기록에 남김"""
+        if not event_infos:
+            return []
         try:
-            event_id = self.handler.create_event(event_info)
-
-            if event_id:
-                success_msg = f"✅ 행 {row_number} 캘린더 등록 완료: {event_info['title']}"
-                print(success_msg)
-
-                return {
-                    "current_event": {
-                        **current_event,
-                        "status": "캘린더 등록 완료",
-                        "calendar_event_id": event_id
-                    },
-                    "messages": [success_msg],
-                    "success_count": 1,
-                }
+            if len(event_infos) == 1:
+                results = [(self.handler.create_event(event_infos[0]), None)]
             else:
-                warning_msg = f"⚠️  행 {row_number} 캘린더 등록 실패 (event_id 없음)"
-                print(warning_msg)
+                results = self.handler.create_events(event_infos)
+        except Exception as e:
+            # 요청 자체가 실패하면 대상 일정 모두 오류 처리
+            return [("", str(e))] * len(event_infos)
 
-                return {
-                    "current_event": {
-                        **current_event,
-                        "status": "완료 (캘린더 등록 실패)"
-                    },
-                    "messages": [warning_msg],
-                }
+        event_registry.record([event_id for event_id, error in results if not error])
+        return results
 
-        except Exception as e:
-            error_msg = f"❌ 캘린더 등록 실패 (행 {row_number}): {str(e)}"
-            print(error_msg)
-
-            return {
-                "current_event": {
-                    **current_event,
-                    "status": "오류",
-                    "error": str(e)
-                },
-                "messages": [error_msg],
-                "errors": [{"agent": "calendar", "row": row_number, "error": str(e)}],
-                "failed_count": 1,
-            }
+    @staticmethod
+    def _settle(event: dict, results: list) -> tuple:
+        """
+        행 하나의 일정별 등록 결과로 행 상태 결정
+
+        일정 하나라도 실패하면 행 전체를 실패로 남겨 다시 처리되게 합니다
+        (이미 등록된 일정은 결정적 ID라 다시 등록해도 중복되지 않음).
+
+        Returns:
+            tuple: (갱신된 이벤트, 메시지, 에러 또는 None)
+        """
+        row_number = event["row_number"]
+        results = sorted(results, key=lambda result: result[0]["part"])
+        failures = [error for _, event_id, error, _ in results if error]
+
+        if failures:
+            error = failures[0] if len(results) == 1 else (
+                f"일정 {len(results)}개 중 {len(failures)}개 등록 실패: {failures[0]}"
+            )
+            message = f"❌ 캘린더 등록 실패 (행 {row_number}): {error}"
+            emit("calendar", "error", message, row=row_number, error=error)
+            return ({**event, "status": failed_status("캘린더 등록 실패"), "error": error}, message,
+                    {"agent": "calendar", "row": row_number, "error": error})
+
+        if not all(event_id for _, event_id, _, _ in results):
+            message = f"⚠️  행 {row_number} 캘린더 등록 실패 (event_id 없음)"
+            emit("calendar", "warning", message, row=row_number)
+            return {**event, "status": failed_status("캘린더 등록 실패")}, message, None
+
+        event_ids = [event_id for _, event_id, _, _ in results]
+        updated = {**event, "calendar_event_id": event_ids[0]}
+        if len(event_ids) > 1:
+            updated["calendar_event_ids"] = event_ids
+
+        originals = [original for _, _, _, original in results]
+        if all(original is not None for original in originals):
+            # 모든 일정이 이미 등록된 일정과 같으면 원본 행을 가리키는 중복 상태
+            updated["status"] = duplicate_status(originals[0])
+            return updated, f"🔁 행 {row_number} 중복 일정: {updated['status']}", None
+
+        updated["status"] = STATUS_SYNCED
+        count = f" 외 {len(results) - 1}건" if len(results) > 1 else ""
+        message = f"✅ 행 {row_number} 캘린더 등록 완료: {event.get('title', '')}{count}"
+        emit("calendar", "done", message, row=row_number, event_id=event_ids[0], event_ids=event_ids)
+        return updated, message, None
@@ -6,18 +6,29 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# LangGraph 프로젝트 내부의 event_parser 사용
+# LangGraph 프로젝트 내부의 파서 백엔드 사용
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from event_parser import EventParser
+from parser_backends import create_backend
+from condenser import condense
+from metrics import metrics
+from progress import emit
 
 load_dotenv()
 
+# 일정 하나를 이루는 필드
+EVENT_FIELDS = ("title", "date", "time", "location", "description", "notes")
+
 
 class ParserAgent:
     """LLM 기반 텍스트 파싱 전담 에이전트"""
 
-    def __init__(self):
-        self.parser = EventParser()
+    def __init__(self, backend: str = None):
+        """
+        Args:
+            backend: 파서 백엔드 설정 ("openai", "openai:gpt-4o", "rules", "replay:경로")
+                     기본값은 환경 변수 PARSER_BACKEND (PARSER_ROUTES가 있으면 행 종류별로 나눔)
+        """
+        self.parser = create_backend(backend)
 
     def parse_event_text(self, state: dict) -> dict:
         """
@@ -33,50 +44,192 @@ class ParserAgent:
         if not current_event:
             return {"messages": ["⚠️  파싱할 이벤트가 없습니다."]}
 
-        row_number = current_event["row_number"]
-        text = current_event["original_text"]
-
-        print(f"\n🤖 [Parser Agent] 행 {row_number} 텍스트 파싱 중...")
-        print(f"텍스트 미리보기: {text[:50]}...")
+        self._log_start(current_event)
 
         try:
             # LLM으로 파싱
-            event_info = self.parser.parse_event_text(text)
+            event_info = self.parser.parse_event_text(self._prompt_text(current_event))
+            return self._parsed_update(current_event, event_info)
 
-            # 현재 이벤트 업데이트
-            updated_event = {
-                **current_event,
-                "title": event_info.get("title", ""),
-                "date": event_info.get("date", ""),
-                "time": event_info.get("time", ""),
-                "location": event_info.get("location", ""),
-                "description": event_info.get("description", ""),
-                "notes": event_info.get("notes", ""),
-            }
+        except Exception as e:
+            return self._error_update(current_event, e)
 
-            # 파싱 결과 로그
-            print(f"  📌 제목: {event_info.get('title', 'N/A')}")
-            print(f"  📅 날짜: {event_info.get('date', 'N/A')}")
-            print(f"  🕐 시간: {event_info.get('time', 'N/A')}")
-            print(f"  📍 장소: {event_info.get('location', 'N/A')[:30]}...")
+    async def aparse_event_text(self, state: dict) -> dict:
+        """
+        parse_event_text의 비동기 버전 (비동기 워크플로우용)
 
-            return {
-                "current_event": updated_event,
-                "messages": [f"✅ 행 {row_number} 파싱 완료: {event_info.get('title', 'N/A')}"],
-            }
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        current_event = state.get("current_event")
+        if not current_event:
+            return {"messages": ["⚠️  파싱할 이벤트가 없습니다."]}
+
+        self._log_start(current_event)
+
+        try:
+            # LLM으로 파싱 (AsyncOpenAI)
+            event_info = await self.parser.aparse_event_text(self._prompt_text(current_event))
+            return self._parsed_update(current_event, event_info)
 
         except Exception as e:
-            error_msg = f"❌ 파싱 실패 (행 {row_number}): {str(e)}"
-            print(error_msg)
+            return self._error_update(current_event, e)
 
-            return {
-                "current_event": {
-                    **current_event,
-                    "error": str(e)
-                },
-                "messages": [error_msg],
-                "errors": [{"agent": "parser", "row": row_number, "error": str(e)}]
-            }
+    def parse_batch(self, state: dict) -> dict:
+        """
+        현재 배치의 텍스트들을 묶음 요청(parse_many)으로 파싱합니다.
+
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        batch = state.get("current_batch") or []
+        if not batch:
+            return {"messages": ["⚠️  파싱할 이벤트가 없습니다."]}
+
+        for event in batch:
+            self._log_start(event)
+
+        try:
+            # LLM으로 파싱 (여러 텍스트를 한 요청에 묶음)
+            event_infos = self.parser.parse_many([self._prompt_text(event) for event in batch])
+            results = [
+                self._parsed_update(event, event_info)
+                for event, event_info in zip(batch, event_infos)
+            ]
+
+        except Exception as e:
+            results = [self._error_update(event, e) for event in batch]
+
+        return self._merge_batch_results(batch, results)
+
+    def validate_batch(self, state: dict) -> dict:
+        """
+        현재 배치의 파싱 결과를 모두 검증합니다.
+
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        batch = state.get("current_batch") or []
+        if not batch:
+            return {"messages": ["⚠️  검증할 이벤트가 없습니다."]}
+
+        results = [self.validate_parsed_data({"current_event": event}) for event in batch]
+        return self._merge_batch_results(batch, results)
+
+    @staticmethod
+    def _merge_batch_results(batch: list, results: list) -> dict:
+        """행 단위 결과들을 배치 상태 업데이트 하나로 합치기"""
+        merged = {
+            "current_batch": [
+                result.get("current_event", event) for event, result in zip(batch, results)
+            ],
+            "messages": [message for result in results for message in result.get("messages", [])],
+        }
+        errors = [error for result in results for error in result.get("errors", [])]
+        if errors:
+            merged["errors"] = errors
+        return merged
+
+    @staticmethod
+    def _log_start(current_event: dict):
+        """파싱 시작 이벤트"""
+        emit(
+            "parse", "started",
+            f"🤖 [Parser Agent] 행 {current_event['row_number']} 텍스트 파싱 중...\n"
+            f"텍스트 미리보기: {current_event['original_text'][:50]}...",
+            row=current_event["row_number"]
+        )
+
+    @staticmethod
+    def _prompt_text(current_event: dict) -> str:
+        """원문에서 상투 문구를 걷어내고 토큰 예산에 맞춘 파싱용 텍스트"""
+        row_number = current_event["row_number"]
+        text, stats = condense(current_event["original_text"])
+        metrics.count_condensed(stats["tokens_before"], stats["tokens_after"], stats["guarded"])
+
+        saved = stats["tokens_before"] - stats["tokens_after"]
+        emit(
+            "condense", "done",
+            f"  ✂️  입력 축약: {stats['tokens_before']} → {stats['tokens_after']} 토큰 ({saved}개 절약)"
+            + (" - 축약 시 일정 정보가 달라져 원문 사용" if stats["guarded"] else ""),
+            row=row_number,
+            tokens_saved=saved,
+            **stats
+        )
+        return text
+
+    @staticmethod
+    def _parsed_update(current_event: dict, event_info: dict) -> dict:
+        """파싱 결과로 현재 이벤트를 업데이트"""
+        row_number = current_event["row_number"]
+
+        # 현재 이벤트 업데이트
+        updated_event = {
+            **current_event,
+            "title": event_info.get("title", ""),
+            "date": event_info.get("date", ""),
+            "time": event_info.get("time", ""),
+            "location": event_info.get("location", ""),
+            "description": event_info.get("description", ""),
+            "notes": event_info.get("notes", ""),
+        }
+
+        # 한 문자에 일정이 여러 개면 전체 목록을 함께 보관 (캘린더 단계에서 일정마다 등록)
+        events = event_info.get("events") or []
+        if len(events) > 1:
+            updated_event["events"] = [
+                {field: event.get(field, "") for field in EVENT_FIELDS} for event in events
+            ]
+        count = f" 외 {len(events) - 1}건" if len(events) > 1 else ""
+
+        # 파서가 오류를 빈 결과로 돌려준 경우 행을 다시 처리할 수 있도록 오류를 보관
+        if event_info.get("error"):
+            updated_event["error"] = event_info["error"]
+
+        # 파싱 결과 이벤트
+        emit(
+            "parse", "done",
+            f"  📌 제목: {event_info.get('title', 'N/A')}{count}\n"
+            f"  📅 날짜: {event_info.get('date', 'N/A')}\n"
+            f"  🕐 시간: {event_info.get('time', 'N/A')}\n"
+            f"  📍 장소: {event_info.get('location', 'N/A')[:30]}...",
+            row=row_number,
+            title=updated_event["title"],
+            date=updated_event["date"],
+            time=updated_event["time"],
+            location=updated_event["location"],
+            events=max(len(events), 1),
+        )
+
+        return {
+            "current_event": updated_event,
+            "messages": [f"✅ 행 {row_number} 파싱 완료: {event_info.get('title', 'N/A')}{count}"],
+        }
+
+    @staticmethod
+    def _error_update(current_event: dict, e: Exception) -> dict:
+        """파싱 실패 시 상태 업데이트"""
+        row_number = current_event["row_number"]
+        error_msg = f"❌ 파싱 실패 (행 {row_number}): {str(e)}"
+        emit("parse", "error", error_msg, row=row_number, error=str(e))
+
+        return {
+            "current_event": {
+                **current_event,
+                "error": str(e)
+            },
+            "messages": [error_msg],
+            "errors": [{"agent": "parser", "row": row_number, "error": str(e)}]
+        }
 
     def validate_parsed_data(self, state: dict) -> dict:
         """
@@ -94,38 +247,47 @@ class ParserAgent:
 
         row_number = current_event["row_number"]
 
-        print(f"\n✓ [Parser Agent] 행 {row_number} 데이터 검증 중...")
+        # 일정이 여러 개면 일정마다 검증하고 경고에 일정 번호 표시
+        events = current_event.get("events") or [current_event]
+        issues = []
+        for index, event in enumerate(events, start=1):
+            prefix = f"일정 {index} " if len(events) > 1 else ""
+            issues.extend(prefix + issue for issue in self._event_issues(event))
 
+        if issues:
+            warning_msg = f"⚠️  행 {row_number} 검증 경고: {', '.join(issues)}"
+            emit("validate", "warning", warning_msg, row=row_number, issues=issues)
+            return {
+                "messages": [warning_msg],
+            }
+        else:
+            emit("validate", "done", f"✓ [Parser Agent] 행 {row_number} 검증 통과", row=row_number)
+            return {
+                "messages": [f"✅ 행 {row_number} 데이터 검증 완료"],
+            }
+
+    def _event_issues(self, event: dict) -> list:
+        """일정 하나의 필수 필드와 날짜/시간 형식 검증"""
         # 필수 필드 확인
         issues = []
 
-        if not current_event.get("title"):
+        if not event.get("title"):
             issues.append("제목 누락")
 
-        if not current_event.get("date"):
+        if not event.get("date"):
             issues.append("날짜 누락")
 
         # 날짜 형식 검증 (YYYY-MM-DD)
-        date = current_event.get("date", "")
+        date = event.get("date", "")
         if date and not self._is_valid_date_format(date):
             issues.append(f"날짜 형식 오류: {date}")
 
         # 시간 형식 검증 (HH:MM)
-        time = current_event.get("time", "")
+        time = event.get("time", "")
         if time and not self._is_valid_time_format(time):
             issues.append(f"시간 형식 오류: {time}")
 
-        if issues:
-            warning_msg = f"⚠️  행 {row_number} 검증 경고: {', '.join(issues)}"
-            print(warning_msg)
-            return {
-                "messages": [warning_msg],
-            }
-        else:
-            print(f"  ✅ 검증 통과")
-            return {
-                "messages": [f"✅ 행 {row_number} 데이터 검증 완료"],
-            }
+        return issues
 
     @staticmethod
     def _is_valid_date_format(date_str: str) -> bool:
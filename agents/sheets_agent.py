@@ -8,7 +8,11 @@ from dotenv import load_dotenv
 
 # LangGraph 프로젝트 내부의 google_sheets_handler 사용
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from google_sheets_handler import GoogleSheetsHandler
+from google_sheets_handler import GoogleSheetsHandler, SHEETS_PAGE_ROWS
+from work_queue import work_queue
+from dedup import dedup_index, duplicate_status, is_duplicate_status
+from row_status import STATUS_PARSED, SYNCED, PENDING, state_of
+from progress import emit
 
 load_dotenv()
 
@@ -29,24 +33,139 @@ class SheetsAgent:
         Returns:
             업데이트된 상태
         """
-        print("\n📊 [Sheets Agent] 구글 시트에서 미처리 이벤트 읽기...")
+        emit("fetch", "started", "📊 [Sheets Agent] 구글 시트에서 미처리 이벤트 읽기...")
 
         try:
             events = self.handler.read_unprocessed_events()
+            emit("fetch", "done", f"✅ 구글 시트에서 {len(events)}개 이벤트 로드", total=len(events))
+            messages = [f"✅ 구글 시트에서 {len(events)}개 이벤트 로드"]
+
+            events, duplicates = self._drop_duplicates(events)
+            if duplicates:
+                dedup_msg = f"🔁 중복 문자 {len(duplicates)}개는 파싱하지 않고 상태만 기록"
+                emit("dedup", "done", dedup_msg, rows=sorted(duplicates))
+                messages.append(dedup_msg)
 
             return {
-                "unprocessed_events": events,
+                "queue_id": work_queue.put(events),
+                "cursor": 0,
                 "total_events": len(events),
-                "messages": [f"✅ 구글 시트에서 {len(events)}개 이벤트 로드"],
+                "messages": messages,
             }
 
         except Exception as e:
             error_msg = f"❌ 시트 읽기 실패: {str(e)}"
+            emit("fetch", "error", error_msg, error=str(e))
             return {
                 "messages": [error_msg],
                 "errors": [{"agent": "sheets", "action": "fetch", "error": str(e)}]
             }
 
+    def iter_unprocessed_events(self, page_size: int = SHEETS_PAGE_ROWS):
+        """
+        미처리 이벤트를 page_size행 범위씩 읽어 페이지마다 상태 업데이트로 내보냅니다. (청크 모드용)
+
+        전체 목록을 작업 큐에 담는 fetch_unprocessed_events와 달리 페이지를 읽는 대로 내보내므로,
+        첫 페이지를 처리하는 동안 다음 페이지를 읽습니다.
+
+        Yields:
+            dict: {"events": [(row_number, text), ...], "messages": [...]} (읽기에 실패하면 "errors" 포함)
+        """
+        emit("fetch", "started", f"📊 [Sheets Agent] 구글 시트에서 미처리 이벤트를 {page_size}행씩 읽기...")
+
+        total = 0
+        try:
+            for page in self.handler.iter_unprocessed_events(page_size):
+                total += len(page)
+                load_msg = f"✅ 구글 시트에서 {len(page)}개 이벤트 로드 (누적 {total}개)"
+                emit("fetch", "done", load_msg, total=total)
+                messages = [load_msg]
+
+                events, duplicates = self._drop_duplicates(page)
+                if duplicates:
+                    dedup_msg = f"🔁 중복 문자 {len(duplicates)}개는 파싱하지 않고 상태만 기록"
+                    emit("dedup", "done", dedup_msg, rows=sorted(duplicates))
+                    messages.append(dedup_msg)
+
+                yield {"events": events, "messages": messages}
+
+        except Exception as e:
+            error_msg = f"❌ 시트 읽기 실패: {str(e)}"
+            emit("fetch", "error", error_msg, error=str(e))
+            yield {
+                "events": [],
+                "messages": [error_msg],
+                "errors": [{"agent": "sheets", "action": "fetch", "error": str(e)}]
+            }
+
+    def _drop_duplicates(self, events: list) -> tuple:
+        """
+        이미 등록된 행(이번 실행의 앞선 행 포함)과 같은 문자를 작업 목록에서 빼고
+        H열에 "중복 (행 N)"을 한 번에 기록합니다.
+
+        Returns:
+            tuple: (남은 이벤트 리스트, {중복 행 번호: 처리 상태})
+        """
+        remaining = []
+        duplicates = {}
+        texts = dict(events)
+        for row_number, text in events:
+            original = dedup_index.claim_text(row_number, text, row_text=lambda row: self._row_text(texts, row))
+            if original is None:
+                remaining.append((row_number, text))
+            else:
+                duplicates[row_number] = duplicate_status(original)
+
+        try:
+            self.handler.mark_statuses(duplicates)
+        except Exception as e:
+            # 기록하지 못한 중복 행은 다음 실행에서 다시 감지되어 기록됨
+            emit("dedup", "error", f"⚠️  중복 상태 기록 실패: {e}", error=str(e))
+        return remaining, duplicates
+
+    def _row_text(self, texts: dict, row_number: int):
+        """
+        중복 원본 행의 현재 A열 텍스트 (이번에 읽은 행이면 다시 읽지 않음)
+
+        행 삽입/삭제로 원본이 옮겨졌는지 확인할 때 사용하며, 읽기에 실패하면 None을 반환해
+        인덱스의 기록을 그대로 믿습니다.
+        """
+        if row_number in texts:
+            return texts[row_number]
+        try:
+            texts[row_number] = self.handler.read_row_text(row_number)
+        except Exception as e:
+            emit("dedup", "warning", f"⚠️  행 {row_number} 원본 확인 실패: {e}", row=row_number, error=str(e))
+            return None
+        return texts[row_number]
+
+    @staticmethod
+    def _sheet_fields(event: dict) -> dict:
+        """
+        B~G열에 작성할 파싱 결과
+
+        한 문자에 일정이 여러 개면 첫 일정을 쓰고, 제목에 "외 N건"을 붙이고
+        메모 끝에 나머지 일정의 날짜/시간/제목을 한 줄씩 덧붙입니다.
+        """
+        fields = {
+            "title": event.get("title", ""),
+            "date": event.get("date", ""),
+            "time": event.get("time", ""),
+            "location": event.get("location", ""),
+            "description": event.get("description", ""),
+            "notes": event.get("notes", ""),
+        }
+
+        others = (event.get("events") or [])[1:]
+        if others:
+            fields["title"] = f"{fields['title']} 외 {len(others)}건"
+            lines = [
+                "• " + " ".join(value for value in (other.get("date"), other.get("time"), other.get("title")) if value)
+                for other in others
+            ]
+            fields["notes"] = "\n".join(filter(None, [fields["notes"], "추가 일정:", *lines]))
+        return fields
+
     def write_parsed_result(self, state: dict) -> dict:
         """
         파싱 결과를 구글 시트에 작성합니다.
@@ -62,27 +181,23 @@ class SheetsAgent:
             return {"messages": ["⚠️  작성할 이벤트가 없습니다."]}
 
         row_number = current_event["row_number"]
-        event_info = {
-            "title": current_event.get("title", ""),
-            "date": current_event.get("date", ""),
-            "time": current_event.get("time", ""),
-            "location": current_event.get("location", ""),
-            "description": current_event.get("description", ""),
-            "notes": current_event.get("notes", ""),
-        }
+        event_info = self._sheet_fields(current_event)
 
-        print(f"\n📝 [Sheets Agent] 행 {row_number}에 파싱 결과 작성 중...")
+        emit("write", "started", f"📝 [Sheets Agent] 행 {row_number}에 파싱 결과 작성 중...", row=row_number)
 
         try:
             self.handler.write_parsed_event(row_number, event_info)
             self.handler.mark_as_processed(row_number)
 
+            success_msg = f"✅ 행 {row_number}에 파싱 결과 작성 완료"
+            emit("write", "done", success_msg, row=row_number)
             return {
-                "messages": [f"✅ 행 {row_number}에 파싱 결과 작성 완료"],
+                "messages": [success_msg],
             }
 
         except Exception as e:
             error_msg = f"❌ 시트 작성 실패 (행 {row_number}): {str(e)}"
+            emit("write", "error", error_msg, row=row_number, error=str(e))
             return {
                 "messages": [error_msg],
                 "errors": [{"agent": "sheets", "action": "write", "error": str(e)}]
@@ -90,7 +205,7 @@ class SheetsAgent:
 
     def mark_calendar_synced(self, state: dict) -> dict:
         """
-        캘린더 동기화 완료 표시를 구글 시트에 작성합니다.
+        캘린더 등록 결과 상태(등록 완료/중복/건너뜀/오류)를 구글 시트에 작성합니다.
 
         Args:
             state: 현재 워크플로우 상태
@@ -103,19 +218,108 @@ class SheetsAgent:
             return {"messages": ["⚠️  업데이트할 이벤트가 없습니다."]}
 
         row_number = current_event["row_number"]
-
-        print(f"\n✅ [Sheets Agent] 행 {row_number} 캘린더 등록 완료 표시...")
+        status = current_event.get("status", "")
+        if state_of(status) == PENDING:
+            # 캘린더 단계를 거치지 않은 행은 "파싱 완료"로 남겨 다음 실행에서 이어서 처리
+            return {"messages": []}
 
         try:
-            self.handler.mark_as_calendar_synced(row_number)
-
+            if state_of(status) == SYNCED:
+                self.handler.mark_as_calendar_synced(row_number)
+                success_msg = f"✅ 행 {row_number} 캘린더 등록 완료 표시"
+            else:
+                # 중복은 원본 행을, 건너뜀/오류는 이유를 함께 표시
+                self.handler.mark_statuses({row_number: status})
+                icon = "🔁" if is_duplicate_status(status) else "📝"
+                success_msg = f"{icon} 행 {row_number} {status} 표시"
+            emit("mark_synced", "done", success_msg, row=row_number)
             return {
-                "messages": [f"✅ 행 {row_number} 캘린더 등록 완료 표시"],
+                "messages": [success_msg],
             }
 
         except Exception as e:
             error_msg = f"❌ 상태 업데이트 실패 (행 {row_number}): {str(e)}"
+            emit("mark_synced", "error", error_msg, row=row_number, error=str(e))
             return {
                 "messages": [error_msg],
                 "errors": [{"agent": "sheets", "action": "mark_synced", "error": str(e)}]
             }
+
+    def write_parsed_batch(self, state: dict) -> dict:
+        """
+        현재 배치의 파싱 결과를 한 번의 batchUpdate로 작성합니다.
+
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        batch = state.get("current_batch") or []
+        if not batch:
+            return {"messages": ["⚠️  작성할 이벤트가 없습니다."]}
+
+        rows = [event["row_number"] for event in batch]
+        items = [(event["row_number"], self._sheet_fields(event)) for event in batch]
+
+        emit("write", "started", f"📝 [Sheets Agent] 행 {rows[0]}~{rows[-1]} ({len(rows)}개) 파싱 결과 일괄 작성 중...", rows=rows)
+
+        try:
+            self.handler.write_parsed_events(items, status=STATUS_PARSED)
+
+            success_msg = f"✅ {len(rows)}개 행에 파싱 결과 작성 완료"
+            emit("write", "done", success_msg, rows=rows)
+            return {
+                "messages": [success_msg],
+            }
+
+        except Exception as e:
+            error_msg = f"❌ 시트 일괄 작성 실패 (행 {rows[0]}~{rows[-1]}): {str(e)}"
+            emit("write", "error", error_msg, rows=rows, error=str(e))
+            return {
+                "messages": [error_msg],
+                "errors": [{"agent": "sheets", "action": "write_batch", "rows": rows, "error": str(e)}]
+            }
+
+    def mark_batch_synced(self, state: dict) -> dict:
+        """
+        현재 배치 행들의 캘린더 등록 결과 상태(등록 완료/중복/건너뜀/오류)를 한 번에 표시합니다.
+
+        Args:
+            state: 현재 워크플로우 상태
+
+        Returns:
+            업데이트된 상태
+        """
+        batch = state.get("current_batch") or []
+        statuses = {
+            event["row_number"]: event["status"]
+            for event in batch
+            if state_of(event.get("status")) != PENDING
+        }
+        rows = list(statuses)
+        if not rows:
+            return {"messages": ["⚠️  업데이트할 이벤트가 없습니다."]}
+
+        try:
+            # 등록 완료, 중복(원본 행 표시), 건너뜀/오류 상태를 한 번의 batchUpdate로 작성
+            self.handler.mark_statuses(statuses)
+
+            synced = sum(1 for status in statuses.values() if state_of(status) == SYNCED)
+            duplicates = sum(1 for status in statuses.values() if is_duplicate_status(status))
+            others = len(rows) - synced - duplicates
+            success_msg = f"✅ {synced}개 행 캘린더 등록 완료 표시" + (
+                f" (중복 {duplicates}개)" if duplicates else ""
+            ) + (f" (건너뜀/오류 {others}개)" if others else "")
+            emit("mark_synced", "done", success_msg, rows=rows)
+            return {
+                "messages": [success_msg],
+            }
+
+        except Exception as e:
+            error_msg = f"❌ 상태 일괄 업데이트 실패 (행 {rows[0]}~{rows[-1]}): {str(e)}"
+            emit("mark_synced", "error", error_msg, rows=rows, error=str(e))
+            return {
+                "messages": [error_msg],
+                "errors": [{"agent": "sheets", "action": "mark_batch_synced", "rows": rows, "error": str(e)}]
+            }
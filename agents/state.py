@@ -2,9 +2,53 @@
 LangGraph State 정의
 멀티에이전트 워크플로우의 상태를 관리합니다.
 """
-from typing import TypedDict, Annotated, List, Optional
+import os
+import json
+from typing import TypedDict, Annotated, List, Optional, get_type_hints
 from operator import add
 
+# 상태에 보관할 최대 항목 수 (0 이하면 제한 없음)
+STATE_MAX_MESSAGES = int(os.getenv("STATE_MAX_MESSAGES", "200"))
+STATE_MAX_PROCESSED_EVENTS = int(os.getenv("STATE_MAX_PROCESSED_EVENTS", "100"))
+STATE_MAX_ERRORS = int(os.getenv("STATE_MAX_ERRORS", "50"))
+
+# 처리된 이벤트 전체를 기록할 JSONL 파일 (빈 문자열이면 기록하지 않음)
+PROCESSED_EVENTS_LOG = os.getenv("PROCESSED_EVENTS_LOG", ".cache/processed_events.jsonl")
+
+
+def keep_last(limit: int):
+    """
+    최근 limit개 항목만 유지하는 링 버퍼 리듀서
+
+    리스트 전체가 아니라 최대 limit + 새 항목 수만큼만 복사하므로
+    실행 시간이 길어져도 리듀서 비용과 메모리가 일정합니다.
+    """
+    if limit <= 0:
+        return add
+
+    def reducer(left: list, right: list) -> list:
+        return (list(left[-limit:]) + list(right))[-limit:]
+
+    return reducer
+
+
+def log_processed_events(items: list, path: str = None):
+    """
+    처리된 이벤트를 JSONL 파일(기본값 PROCESSED_EVENTS_LOG)에 한 줄씩 추가 기록합니다.
+    (경로가 빈 문자열이면 기록하지 않음)
+
+    리듀서는 체크포인트 재개/재시도 때 다시 실행될 수 있으므로 이 함수는 리듀서가 아니라
+    처리 결과를 만드는 노드(mark_synced, mark_batch)가 작업을 마친 뒤 호출합니다.
+    결과가 체크포인트에 기록된 노드는 재개해도 다시 실행되지 않으므로 한 번만 기록됩니다.
+    """
+    path = PROCESSED_EVENTS_LOG if path is None else path
+    if not path or not items:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+
 
 class EventInfo(TypedDict):
     """개별 이벤트 정보"""
@@ -26,23 +70,83 @@ class AgentState(TypedDict):
 
     각 에이전트가 이 상태를 읽고 업데이트합니다.
     """
-    # 입력 데이터
-    unprocessed_events: List[tuple]  # [(row_num, text), ...]
+    # 입력 데이터: 미처리 이벤트 [(row_num, text), ...]는 work_queue에 불변으로 보관하고
+    # 상태에는 큐 ID와 다음에 처리할 위치(커서)만 저장
+    queue_id: Optional[str]
+    cursor: int
 
     # 현재 처리 중인 이벤트
     current_event: Optional[dict]
 
-    # 처리된 이벤트들
-    processed_events: Annotated[List[EventInfo], add]
+    # 현재 처리 중인 배치 (배치 모드 전용)
+    current_batch: Optional[List[dict]]
 
-    # 에이전트 간 메시지/로그
-    messages: Annotated[List[str], add]
+    # 처리된 이벤트들 (최근 항목만 유지, 전체는 PROCESSED_EVENTS_LOG에 기록)
+    processed_events: Annotated[List[EventInfo], keep_last(STATE_MAX_PROCESSED_EVENTS)]
 
-    # 에러 정보
-    errors: Annotated[List[dict], add]
+    # 에이전트 간 메시지/로그 (최근 항목만 유지)
+    messages: Annotated[List[str], keep_last(STATE_MAX_MESSAGES)]
+
+    # 에러 정보 (샘플만 유지, 전체 개수는 error_count)
+    errors: Annotated[List[dict], keep_last(STATE_MAX_ERRORS)]
+    error_count: Annotated[int, add]
 
-    # 진행 상황
+    # 진행 상황 (병렬 처리 시에도 합산되도록 증분값을 누적)
     total_events: int
-    processed_count: int
-    success_count: int
-    failed_count: int
+    processed_count: Annotated[int, add]
+    success_count: Annotated[int, add]
+    failed_count: Annotated[int, add]
+
+
+class RowState(TypedDict):
+    """
+    행 단위 서브그래프 상태
+
+    병렬 처리 모드에서 행마다 독립적으로 사용되며,
+    처리 결과(이벤트, 메시지, 에러, 카운트)만 전역 상태로 합쳐집니다.
+    """
+    current_event: Optional[dict]
+    processed_events: Annotated[List[EventInfo], add]
+    messages: Annotated[List[str], add]
+    errors: Annotated[List[dict], add]
+    error_count: Annotated[int, add]
+    processed_count: Annotated[int, add]
+    success_count: Annotated[int, add]
+    failed_count: Annotated[int, add]
+
+
+def with_error_count(update: dict) -> dict:
+    """
+    노드 결과에 에러 개수(error_count)를 추가합니다.
+
+    errors 필드는 샘플만 유지되므로 전체 에러 수는 별도 카운터로 누적합니다.
+    이미 error_count가 있는 결과(행 단위 서브그래프 결과 등)는 그대로 둡니다.
+    """
+    if update and update.get("errors") and "error_count" not in update:
+        return {**update, "error_count": len(update["errors"])}
+    return update
+
+
+def apply_update(state: dict, update: dict, schema: type = AgentState) -> dict:
+    """
+    그래프 밖에서 노드 결과를 상태에 합칩니다.
+
+    LangGraph와 같은 규칙을 따릅니다: 리듀서가 지정된 필드(Annotated)는
+    리듀서로 합치고, 나머지 필드는 새 값으로 덮어씁니다.
+
+    Args:
+        state: 갱신할 상태 (직접 수정됨)
+        update: 노드가 반환한 부분 상태
+        schema: 리듀서 정보를 읽을 상태 스키마
+
+    Returns:
+        갱신된 상태
+    """
+    hints = get_type_hints(schema, include_extras=True)
+    for key, value in update.items():
+        metadata = getattr(hints.get(key), "__metadata__", ())
+        if metadata and key in state:
+            state[key] = metadata[0](state[key], value)
+        else:
+            state[key] = value
+    return state
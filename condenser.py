@@ -0,0 +1,186 @@
+"""
+입력 축약 모듈
+LLM에 보내기 전에 문자/메일 본문에서 일정과 무관한 상투 문구를 걷어내고,
+길면 날짜/시간이 있는 줄 주변만 남겨 행마다 토큰 상한을 지킵니다.
+
+축약 전후로 규칙 추출기의 제목/날짜/시간/장소 결과가 달라지면 원문을 그대로 사용합니다.
+"""
+import os
+import re
+from rule_extractor import AD_MARK, extract_event, mentions_schedule, is_location_line
+
+# 행마다 LLM에 보낼 최대 입력 토큰 추정치 (0 이하면 축약 사용 안 함)
+CONDENSE_MAX_TOKENS = int(os.getenv("CONDENSE_MAX_TOKENS", "800"))
+
+# 예산을 넘을 때 날짜/시간 줄 앞뒤로 남길 줄 수와 항상 남길 머리 줄 수
+_WINDOW = 2
+_HEADER_LINES = 3
+
+# 예산을 넘을 때 날짜/시간이 없는 줄은 이 글자 수까지만 남김
+_MAX_LINE_CHARS = 120
+
+# 줄 전체를 지울 상투 문구
+_BOILERPLATE_LINE = re.compile(
+    r"^\s*(?:"
+    r"\[?\s*(?:Web발신|국외발신|국제발신)\s*\]?"
+    r"|.*(?:수신\s*거부|무료\s*거부|수신거부\s*:).*"
+    r"|(?:문의|고객센터|대표번호|상담|Tel|TEL|전화)\s*[:：]?\s*[\d\-()\s]+(?:감사합니다\.?)?"
+    r"|.*(?:오시는\s*길|약도를?\s*보실|아래\s*링크).*"
+    r"|감사합니다\.?"
+    r"|[-=_]{3,}"
+    r")\s*$"
+)
+
+# 축약 전후로 같아야 하는 규칙 추출 필드 (제목은 첫 내용 줄이 남았는지 확인)
+_GUARDED_FIELDS = ("title", "date", "time", "location")
+
+# 줄 안에서 지울 조각 (URL)
+_URL = re.compile(r"(?:https?://|www\.)\S+|\b[\w-]+\.(?:ly|kr|com|net|co\.kr)/\S*")
+
+# 생략 표시
+_GAP = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    입력 토큰 수 추정치
+
+    한글은 대략 글자당 1토큰(UTF-8 3바이트), 영문은 4글자당 1토큰 정도이므로
+    UTF-8 바이트 수의 1/3로 넉넉하게 추정합니다.
+    """
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def condense(text: str, max_tokens: int = CONDENSE_MAX_TOKENS) -> tuple:
+    """
+    텍스트를 축약합니다.
+
+    1. 상투 문구 줄([Web발신], 문의 전화, 수신거부, 약도 링크 등), 첫 줄의 "(광고)" 표시와 URL 제거
+    2. 같은 줄이 반복되면 한 번만 남기고 빈 줄 정리
+    3. 토큰 예산을 넘으면 머리 줄, 장소 줄, 날짜/시간 줄 앞뒤만 남기고 긴 줄은 자름
+    4. 그래도 넘으면 예산에 맞춰 뒤를 자름
+
+    Args:
+        text: 원문
+        max_tokens: 토큰 예산 (0 이하면 축약하지 않음)
+
+    Returns:
+        tuple: (LLM에 보낼 텍스트, {"tokens_before", "tokens_after", "guarded"})
+            guarded가 True이면 축약 결과가 추출 결과를 바꿔 원문을 사용한 것
+    """
+    before = estimate_tokens(text)
+    if max_tokens <= 0:
+        return text, {"tokens_before": before, "tokens_after": before, "guarded": False}
+
+    lines = _strip_boilerplate(text.splitlines())
+    if estimate_tokens("\n".join(lines)) > max_tokens:
+        lines = _keep_schedule_windows(lines)
+    condensed = _truncate("\n".join(lines), max_tokens)
+
+    # 정확도 보호: 축약 때문에 제목/날짜/시간/장소가 달라지면 원문 사용
+    guarded = not _same_schedule(text, condensed)
+    if guarded:
+        condensed = text
+
+    return condensed, {
+        "tokens_before": before,
+        "tokens_after": estimate_tokens(condensed),
+        "guarded": guarded,
+    }
+
+
+def _strip_boilerplate(lines: list) -> list:
+    """상투 문구/URL 제거, 반복 줄과 연속 빈 줄 정리"""
+    kept, seen = [], set()
+    for line in lines:
+        if _BOILERPLATE_LINE.match(line):
+            continue
+        line = _URL.sub("", AD_MARK.sub("", line)).rstrip()
+        key = line.strip()
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        elif not kept or not kept[-1].strip():
+            continue
+        kept.append(line)
+
+    while kept and not kept[-1].strip():
+        kept.pop()
+    return kept
+
+
+def _keep_schedule_windows(lines: list) -> list:
+    """
+    머리 줄, 장소 줄, 날짜/시간 줄과 그 앞뒤 _WINDOW줄만 남기고 나머지는 생략 표시
+
+    날짜/시간이 없는 긴 줄(홍보 문단 등)은 _MAX_LINE_CHARS 글자까지만 남깁니다.
+    """
+    keep = set(range(min(_HEADER_LINES, len(lines))))
+    for index, line in enumerate(lines):
+        if is_location_line(line):
+            keep.add(index)
+        if mentions_schedule(line):
+            keep.update(range(max(0, index - _WINDOW), min(len(lines), index + _WINDOW + 1)))
+
+    result = []
+    for index, line in enumerate(lines):
+        if index in keep:
+            if len(line) > _MAX_LINE_CHARS and not mentions_schedule(line):
+                line = line[:_MAX_LINE_CHARS] + _GAP
+            result.append(line)
+        elif result and result[-1] != _GAP:
+            result.append(_GAP)
+    return result
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """토큰 예산에 맞춰 뒤를 자름"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    encoded = text.encode("utf-8")[:max_tokens * 3]
+    return encoded.decode("utf-8", errors="ignore") + _GAP
+
+
+def _same_schedule(original: str, condensed: str) -> bool:
+    """규칙 추출기로 본 제목/날짜/시간/장소가 축약 전후 같은지"""
+    before, _ = extract_event(original)
+    after, _ = extract_event(condensed)
+    return all(before[field] == after[field] for field in _GUARDED_FIELDS)
+
+
+if __name__ == "__main__":
+    # 정답 세트(golden_set.py)로 축약률과 축약한 입력의 제목/날짜/시간/장소 정확도 확인
+    import sys
+    from golden_set import GOLDEN_TODAY, load_golden_set, field_accuracy, mismatches
+
+    max_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else CONDENSE_MAX_TOKENS
+    golden = load_golden_set()
+
+    total_before = total_after = lost = 0
+    before_results, after_results = [], []
+    for index, (sample, answer) in enumerate(golden, start=1):
+        condensed, stats = condense(sample, max_tokens)
+        total_before += stats["tokens_before"]
+        total_after += stats["tokens_after"]
+        before, _ = extract_event(sample, GOLDEN_TODAY)
+        after, _ = extract_event(condensed, GOLDEN_TODAY)
+        before_results.append(before)
+        after_results.append(after)
+        # 원문에서는 맞던 필드가 축약 후 틀리면 정답을 잃은 것
+        lost_fields = set(mismatches(after, answer)) - set(mismatches(before, answer))
+        lost += bool(lost_fields)
+        saved = stats["tokens_before"] - stats["tokens_after"]
+        print(f"[{index}] {stats['tokens_before']} → {stats['tokens_after']} 토큰 "
+              f"({saved}개 절약){' (원문 사용)' if stats['guarded'] else ''}"
+              f"{' 정답 잃음: ' + ', '.join(sorted(lost_fields)) if lost_fields else ''}")
+
+    answers = [answer for _, answer in golden]
+    accuracy_before = field_accuracy(before_results, answers)
+    accuracy_after = field_accuracy(after_results, answers)
+    print(f"\n합계: {total_before} → {total_after} 토큰 (예산 {max_tokens})")
+    print("정확도 (원문 → 축약): " + ", ".join(
+        f"{field} {accuracy_before[field]:.0%} → {accuracy_after[field]:.0%}" for field in accuracy_after
+    ))
+
+    assert lost == 0, f"축약 후 정답을 잃은 샘플 {lost}개"
@@ -0,0 +1,350 @@
+"""
+중복 문자 감지 모듈
+같은 문자가 전달/재발송으로 시트에 여러 번 들어와도 한 번만 파싱하고 캘린더에 한 번만 등록합니다.
+
+- 원본 텍스트: 정규화한 텍스트의 3글자 shingle로 MinHash 서명을 만들고, 추정한 자카드
+  유사도가 DEDUP_MIN_SIMILARITY 이상이면서 날짜/시간 목록이 같으면 중복
+  (날짜만 바뀐 정기 안내 문자는 서로 다른 일정이므로 중복이 아님)
+- 파싱 결과: 날짜와 시간이 같고 제목의 2글자 shingle 자카드 유사도가
+  DEDUP_TITLE_SIMILARITY 이상이면 중복
+
+MinHash 서명은 밴드(LSH)로 나눠 인덱싱하므로 전체를 서로 비교하지 않고 밴드가 하나라도
+같은 후보만 확인합니다 (유사도 0.8이면 후보가 될 확률 99.9% 이상).
+짧은 문자는 몇 글자만 달라도 SimHash 비트가 크게 바뀌어 MinHash를 사용합니다.
+이전 실행의 기록도 SQLite에 남으므로 이번 실행 안과 과거 행 모두와 비교하며,
+먼저 등록한(작은) 행이 원본이 됩니다.
+
+기록은 시트(GOOGLE_SHEET_ID, GOOGLE_SHEET_NAME)별로 나누고 문자는 행 번호가 아닌 정규화한 텍스트의
+해시로 구분하므로, 여러 시트가 같은 파일을 써도 섞이지 않고 행 삽입/삭제로 행 번호가 바뀌어도
+자기 자신을 중복으로 보지 않습니다. 행 번호는 "중복 (행 N)"에 적을 원본 위치로만 기록합니다.
+"""
+import os
+import re
+import struct
+import sqlite3
+import hashlib
+import threading
+from metrics import metrics
+from parse_cache import normalize_text
+from rule_extractor import dates_in, times_in
+
+# 인덱스 파일 경로 (빈 문자열이면 중복 감지 사용 안 함)
+DEDUP_DB = os.getenv("DEDUP_DB", ".cache/dedup.sqlite3")
+
+# 같은 문자로 볼 최소 텍스트 유사도 (0~1, MinHash로 추정한 shingle 자카드 유사도)
+DEDUP_MIN_SIMILARITY = float(os.getenv("DEDUP_MIN_SIMILARITY", "0.8"))
+
+# 같은 일정으로 볼 최소 제목 유사도 (0~1)
+DEDUP_TITLE_SIMILARITY = float(os.getenv("DEDUP_TITLE_SIMILARITY", "0.5"))
+
+# 중복 행의 처리 상태 접두어 (H열에 "중복 (행 N)"으로 기록)
+DUPLICATE_STATUS = "중복"
+
+# MinHash 서명 길이와 밴드당 값 수 (16개 밴드 x 4개)
+_NUM_HASHES = 64
+_BAND_SIZE = 4
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def duplicate_status(original_row: int) -> str:
+    """원본 행을 가리키는 중복 처리 상태"""
+    return f"{DUPLICATE_STATUS} (행 {original_row})"
+
+
+def is_duplicate_status(status: str) -> bool:
+    """중복으로 처리된 행의 상태이면 True"""
+    return (status or "").startswith(DUPLICATE_STATUS)
+
+
+def shingles(text: str, size: int) -> set:
+    """길이 size의 글자 shingle 집합 (텍스트가 더 짧으면 텍스트 자체)"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def minhash(text: str) -> tuple:
+    """
+    정규화한 텍스트의 3글자 shingle로 만든 MinHash 서명 (_NUM_HASHES개 값)
+
+    shingle마다 SHAKE-128 출력을 _NUM_HASHES개의 32비트 해시로 나눠 쓰고, 해시 함수별 최솟값을 모읍니다.
+    """
+    hashes = [
+        struct.unpack(f">{_NUM_HASHES}I", hashlib.shake_128(shingle.encode("utf-8")).digest(_NUM_HASHES * 4))
+        for shingle in shingles(normalize_text(text).lower(), 3)
+    ]
+    if not hashes:
+        return (0,) * _NUM_HASHES
+    return tuple(map(min, zip(*hashes)))
+
+
+def estimate_similarity(a: tuple, b: tuple) -> float:
+    """두 MinHash 서명으로 추정한 자카드 유사도"""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def schedule_of(text: str) -> str:
+    """텍스트에 적힌 날짜/시간 목록 (중복 제거, 등장 순서)"""
+    dates = dict.fromkeys(dates_in(text))
+    times = dict.fromkeys(times_in(text))
+    return ",".join(dates) + "|" + ",".join(times)
+
+
+def title_similarity(a: str, b: str) -> float:
+    """기호/공백을 지운 제목의 2글자 shingle 자카드 유사도"""
+    a = shingles(_NON_WORD.sub("", normalize_text(a).lower()), 2)
+    b = shingles(_NON_WORD.sub("", normalize_text(b).lower()), 2)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def sheet_key() -> str:
+    """인덱스를 나누는 시트 키 (GOOGLE_SHEET_ID와 GOOGLE_SHEET_NAME)"""
+    return f"{os.getenv('GOOGLE_SHEET_ID', '')}\x1f{os.getenv('GOOGLE_SHEET_NAME', 'Sheet1')}"
+
+
+def text_fingerprint(text: str) -> str:
+    """원본 문자를 구분하는 정규화한 텍스트의 해시 (행 번호가 바뀌어도 그대로)"""
+    return hashlib.sha1(normalize_text(text or "").encode("utf-8")).hexdigest()[:16]
+
+
+class DedupIndex:
+    """원본 텍스트 MinHash 밴드와 (날짜, 시간, 제목) 인덱스 (스레드 안전)"""
+
+    def __init__(self, path: str = DEDUP_DB,
+                 min_similarity: float = DEDUP_MIN_SIMILARITY,
+                 title_similarity: float = DEDUP_TITLE_SIMILARITY,
+                 sheet: str = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (빈 문자열이면 중복 감지 사용 안 함)
+            min_similarity: 같은 문자로 볼 최소 텍스트 유사도
+            title_similarity: 같은 일정으로 볼 최소 제목 유사도
+            sheet: 시트 키 (없으면 호출할 때의 sheet_key())
+        """
+        self.path = path
+        self.min_similarity = min_similarity
+        self.title_similarity = title_similarity
+        self.sheet = sheet
+        self.text_duplicates = 0
+        self.event_duplicates = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def claim_text(self, row: int, text: str, row_text=None):
+        """
+        원본 텍스트를 인덱스에 등록하고, 이미 등록된 다른 문자와 중복이면 그 문자의 행 번호를 반환합니다.
+
+        문자는 텍스트 해시로 구분하고 행 번호는 상태에 적을 위치로만 기록하므로, 같은 문자를 다시
+        등록하면(재처리) 자기 자신과는 비교하지 않고 행 번호만 갱신합니다. 중복이면 등록하지 않으므로
+        이후 사본도 같은 원본 행을 가리킵니다.
+
+        행 삽입/삭제로 원본이 다른 행으로 옮겨졌을 수 있으므로, row_text가 있으면 원본 행의 현재
+        텍스트를 확인해 다른 문자가 들어 있으면 그 기록을 지우고 중복으로 보지 않습니다.
+
+        Args:
+            row: 행 번호
+            text: 원본 텍스트
+            row_text: 행 번호 → 현재 A열 텍스트 (None이면 확인하지 못한 것으로 보고 기록을 믿음)
+
+        Returns:
+            int 또는 None: 원본 행 번호 (중복이 아니면 None)
+        """
+        if not self.enabled:
+            return None
+
+        sheet = self.sheet or sheet_key()
+        key = text_fingerprint(text)
+        signature = minhash(text)
+        schedule = schedule_of(text)
+        bands = list(enumerate(_band_values(signature)))
+
+        with self._lock:
+            matches = self._text_matches(self._connect(), sheet, key, row, signature, schedule, bands)
+
+        for original_key, original_row in matches:
+            current = row_text(original_row) if row_text is not None else None
+            if current is not None and text_fingerprint(current) != original_key:
+                # 원본이 다른 행으로 옮겨짐: 가리킬 행을 알 수 없으므로 기록을 지움
+                self._forget(sheet, original_key)
+                continue
+            self.text_duplicates += 1
+            metrics.incr("dedup.text")
+            return original_row
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM text_bands WHERE sheet = ? AND fingerprint = ?", (sheet, key))
+            conn.execute(
+                "INSERT OR REPLACE INTO texts (sheet, fingerprint, row, signature, schedule) VALUES (?, ?, ?, ?, ?)",
+                (sheet, key, row, struct.pack(f">{_NUM_HASHES}I", *signature), schedule)
+            )
+            conn.executemany(
+                "INSERT INTO text_bands (sheet, band, value, fingerprint) VALUES (?, ?, ?, ?)",
+                [(sheet, band, value, key) for band, value in bands]
+            )
+            # 같은 문자의 일정도 옮겨진 행 번호를 가리키도록 갱신
+            conn.execute("UPDATE events SET row = ? WHERE sheet = ? AND fingerprint = ?", (row, sheet, key))
+            conn.execute("COMMIT")
+        return None
+
+    def _text_matches(self, conn, sheet: str, key: str, row: int, signature: tuple,
+                      schedule: str, bands: list) -> list:
+        """
+        텍스트가 비슷하고 날짜/시간 목록이 같은 다른 문자의 (텍스트 해시, 행 번호) 목록 (행 번호 순)
+
+        같은 텍스트(해시가 같은 문자)도 다른 행에 있으면 사본 후보입니다. (잠금 안에서 호출)
+        """
+        candidates = set()
+        for band, value in bands:
+            candidates.update(key_ for (key_,) in conn.execute(
+                "SELECT fingerprint FROM text_bands WHERE sheet = ? AND band = ? AND value = ?",
+                (sheet, band, value)
+            ))
+
+        matches = []
+        for candidate in candidates:
+            stored_row, stored, stored_schedule = conn.execute(
+                "SELECT row, signature, schedule FROM texts WHERE sheet = ? AND fingerprint = ?",
+                (sheet, candidate)
+            ).fetchone()
+            if candidate == key and stored_row == row:
+                continue
+            similar = estimate_similarity(_unpack(stored), signature) >= self.min_similarity
+            if similar and stored_schedule == schedule:
+                matches.append((candidate, stored_row))
+        return sorted(matches, key=lambda match: match[1])
+
+    def _forget(self, sheet: str, key: str):
+        """원본 위치를 잃은 문자의 텍스트 기록 삭제"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM text_bands WHERE sheet = ? AND fingerprint = ?", (sheet, key))
+            conn.execute("DELETE FROM texts WHERE sheet = ? AND fingerprint = ?", (sheet, key))
+            conn.execute("COMMIT")
+
+    def claim_event(self, row: int, text: str, title: str, event_date: str, event_time: str,
+                    event_id: str = "", part: int = 0):
+        """
+        파싱된 일정을 인덱스에 등록하고, 이미 등록된 다른 문자의 일정과 중복이면 그 행을 반환합니다.
+
+        캘린더 등록 직전에 호출하며, 등록에 실패하면 release_event로 되돌립니다.
+        일정은 원본 텍스트의 해시와 일정 번호(part)로 구분하며, 같은 문자의 일정끼리는 비교하지 않습니다.
+
+        Returns:
+            tuple 또는 None: (원본 행 번호, 원본 캘린더 이벤트 ID) (중복이 아니면 None)
+        """
+        if not self.enabled:
+            return None
+
+        sheet = self.sheet or sheet_key()
+        key = text_fingerprint(text)
+        with self._lock:
+            conn = self._connect()
+            candidates = conn.execute(
+                "SELECT row, title, event_id FROM events "
+                "WHERE sheet = ? AND date = ? AND time = ? AND fingerprint != ? ORDER BY row, part",
+                (sheet, event_date, event_time or "", key)
+            ).fetchall()
+
+            for candidate, stored_title, stored_event_id in candidates:
+                if title_similarity(title, stored_title) >= self.title_similarity:
+                    self.event_duplicates += 1
+                    metrics.incr("dedup.event")
+                    return candidate, stored_event_id
+
+            conn.execute(
+                "INSERT OR REPLACE INTO events (sheet, fingerprint, part, row, date, time, title, event_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sheet, key, part, row, event_date, event_time or "", title, event_id)
+            )
+            return None
+
+    def release_event(self, text: str, part: int = None):
+        """캘린더 등록에 실패한 문자의 일정 등록 취소 (part가 없으면 그 문자의 모든 일정)"""
+        if not self.enabled:
+            return
+        sheet = self.sheet or sheet_key()
+        key = text_fingerprint(text)
+        with self._lock:
+            if part is None:
+                self._connect().execute("DELETE FROM events WHERE sheet = ? AND fingerprint = ?", (sheet, key))
+            else:
+                self._connect().execute(
+                    "DELETE FROM events WHERE sheet = ? AND fingerprint = ? AND part = ?", (sheet, key, part)
+                )
+
+    def stats(self) -> dict:
+        """이번 실행의 중복 감지 수와 인덱스 크기 (현재 시트 기준)"""
+        texts = events = 0
+        if self.enabled:
+            sheet = self.sheet or sheet_key()
+            with self._lock:
+                conn = self._connect()
+                texts = conn.execute("SELECT COUNT(*) FROM texts WHERE sheet = ?", (sheet,)).fetchone()[0]
+                events = conn.execute("SELECT COUNT(*) FROM events WHERE sheet = ?", (sheet,)).fetchone()[0]
+        return {
+            "text_duplicates": self.text_duplicates,
+            "event_duplicates": self.event_duplicates,
+            "texts": texts,
+            "events": events,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 연결을 열고 테이블 생성 (잠금 안에서 호출)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # 행 번호로만 구분하던 이전 형식의 인덱스는 다시 만듦
+            for table in ("texts", "text_bands", "events"):
+                columns = [column[1] for column in conn.execute(f"PRAGMA table_info({table})")]
+                if columns and "fingerprint" not in columns:
+                    conn.execute(f"DROP TABLE {table}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts ("
+                "sheet TEXT NOT NULL, fingerprint TEXT NOT NULL, row INTEGER NOT NULL, "
+                "signature BLOB NOT NULL, schedule TEXT NOT NULL, PRIMARY KEY (sheet, fingerprint))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS text_bands ("
+                "sheet TEXT NOT NULL, band INTEGER NOT NULL, value INTEGER NOT NULL, fingerprint TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS text_bands_value ON text_bands (sheet, band, value)")
+            conn.execute("CREATE INDEX IF NOT EXISTS text_bands_text ON text_bands (sheet, fingerprint)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "sheet TEXT NOT NULL, fingerprint TEXT NOT NULL, part INTEGER NOT NULL DEFAULT 0, "
+                "row INTEGER NOT NULL, date TEXT NOT NULL, time TEXT NOT NULL, title TEXT NOT NULL, "
+                "event_id TEXT NOT NULL, PRIMARY KEY (sheet, fingerprint, part))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS events_schedule ON events (sheet, date, time)")
+            self._conn = conn
+        return self._conn
+
+
+def _band_values(signature: tuple) -> list:
+    """밴드마다 _BAND_SIZE개 값을 합쳐 해시한 값 (SQLite 정수 범위의 63비트)"""
+    return [
+        int.from_bytes(hashlib.blake2b(
+            struct.pack(f">{_BAND_SIZE}I", *signature[start:start + _BAND_SIZE]), digest_size=8
+        ).digest(), "big") >> 1
+        for start in range(0, _NUM_HASHES, _BAND_SIZE)
+    ]
+
+
+def _unpack(blob: bytes) -> tuple:
+    return struct.unpack(f">{_NUM_HASHES}I", blob)
+
+
+# 프로세스 전역 중복 인덱스
+dedup_index = DedupIndex()
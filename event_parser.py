@@ -4,16 +4,74 @@ OpenAI GPT-4o-mini를 사용하여 텍스트에서 일정 정보를 파싱합니
 """
 import os
 import json
-from datetime import datetime
-from openai import OpenAI
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from metrics import metrics
+from progress import emit
+from parse_cache import parse_cache
+from condenser import estimate_tokens
+from rate_limiter import openai_limiter
+from sender_templates import template_store
+from rule_extractor import extract_event, is_confident, has_explicit_year, nearest_future
 
 load_dotenv()
 
+# 파싱에 사용할 기본 OpenAI 모델
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+# 규칙 추출 결과를 LLM 없이 사용할 최소 신뢰도 (1보다 크면 항상 LLM 사용)
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8"))
+
+# parse_many에서 요청 하나에 묶을 최대 텍스트 수와 입력 토큰 추정치 상한
+PARSE_BATCH_MAX_ITEMS = int(os.getenv("PARSE_BATCH_MAX_ITEMS", "10"))
+PARSE_BATCH_MAX_TOKENS = int(os.getenv("PARSE_BATCH_MAX_TOKENS", "6000"))
+
+# 분당 토큰 할당량 계산용 일정 하나당 출력 토큰 추정치
+_OUTPUT_TOKENS_PER_EVENT = 300
+
+_WEEKDAYS = "월화수목금토일"
+
+# 시스템 프롬프트는 날짜와 무관한 고정 문자열로 유지하여 제공자 쪽 프롬프트 캐시가
+# 날짜가 바뀌어도 적중하도록 함 (기준 날짜는 사용자 메시지 끝에 붙임)
+SYSTEM_PROMPT = """당신은 텍스트에서 이벤트 일정 정보를 추출하는 전문가입니다.
+
+주어진 텍스트에서 다음 정보를 추출해주세요:
+
+1. title: 이벤트의 간단한 제목 (예: "한신메디피아 건강검진")
+2. date: 날짜를 YYYY-MM-DD 형식으로
+   - 연도가 명시된 경우: 그대로 사용
+   - 연도가 명시되지 않은 경우: 메시지 끝에 주어진 기준 날짜(오늘) 이후 가장 가까운 날짜로 추정
+     * 기준 날짜가 속한 연도의 해당 날짜가 오늘 또는 미래라면 그 연도 사용
+     * 그 날짜가 과거라면 다음 연도 사용
+   - 중요: "11월 22일"처럼 과거 월이어도, 아직 오지 않은 가장 가까운 날짜를 찾아야 함
+   - "내일", "다음 주 화요일"처럼 상대적인 표현은 기준 날짜로 계산
+3. time: 시간을 HH:MM 형식으로 (24시간 형식)
+4. location: 장소 또는 주소
+5. description: 이벤트에 대한 간단한 설명
+6. notes: 주의사항, 준비물, 기타 중요한 정보
+
+JSON 형식으로만 응답하세요. 정보가 없으면 빈 문자열("")을 사용하세요.
+
+텍스트에 서로 다른 일정이 여러 개 있으면(왕복 항공권의 가는 편/오는 편, 여러 날짜의 진료 예약 등)
+{"events": [일정1, 일정2, ...]} 형식으로 각 일정을 위 필드로 나눠 날짜순으로 응답하세요.
+같은 일정의 안내/변경/주의사항은 일정 하나로 봅니다.
+"""
+
 class EventParser:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = "gpt-4o-mini"
+    def __init__(self, model: str = None):
+        """
+        Args:
+            model: 사용할 OpenAI 모델 (기본값: 환경 변수 OPENAI_MODEL 또는 gpt-4o-mini)
+        """
+        # 재시도는 openai_limiter가 할당량을 보며 처리하므로 SDK 자체 재시도는 끔
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+        self.async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
+        self.model = model or OPENAI_MODEL
+        self.cache = parse_cache
+        self.templates = template_store
 
     def parse_event_text(self, text: str) -> dict:
         """
@@ -30,74 +88,318 @@ class EventParser:
                 - location: 장소
                 - description: 상세 설명
                 - notes: 주의사항 및 기타 메모
+                - events: (일정이 여러 개인 경우) 위 필드를 가진 일정 목록, 첫 일정이 최상위 필드와 같음
         """
-        # 현재 날짜 정보 가져오기
-        current_date = datetime.now()
-        current_year = current_date.year
-        current_month = current_date.month
+        # 정형화된 문자는 규칙으로 추출하고, 이미 파싱한 텍스트는 캐시,
+        # 학습된 발신자 템플릿과 맞는 문자는 템플릿 규칙 사용
+        fast = self._fast_path(text)
+        if fast is not None:
+            return fast
 
-        system_prompt = f"""당신은 텍스트에서 이벤트 일정 정보를 추출하는 전문가입니다.
-오늘 날짜는 {current_date.strftime('%Y년 %m월 %d일')}입니다.
+        key = self.cache.key(text, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _resolve_cached(cached, text)
 
-주어진 텍스트에서 다음 정보를 추출해주세요:
+        local = self.templates.apply(text)
+        if local is not None and not local[2]:
+            return local[0]
 
-1. title: 이벤트의 간단한 제목 (예: "한신메디피아 건강검진")
-2. date: 날짜를 YYYY-MM-DD 형식으로
-   - 연도가 명시된 경우: 그대로 사용
-   - 연도가 명시되지 않은 경우: 가장 가까운 미래 날짜로 추정
-     * 우선 올해({current_year}년)의 해당 날짜와 비교
-     * 그 날짜가 오늘 또는 미래라면: {current_year}년 사용
-     * 그 날짜가 과거라면: {current_year + 1}년 사용
-   - 중요: "11월 22일"처럼 과거 월이어도, 아직 오지 않은 가장 가까운 날짜를 찾아야 함
-   - 예시 (오늘: {current_year}년 {current_month}월 {current_date.day}일 기준):
-     * "12월 15일" → {current_year}-12-15 (아직 안 지났으면) 또는 {current_year + 1}-12-15 (지났으면)
-     * "11월 22일" → {current_year}-11-22 (아직 안 지났으면) 또는 {current_year + 1}-11-22 (지났으면)
-3. time: 시간을 HH:MM 형식으로 (24시간 형식)
-4. location: 장소 또는 주소
-5. description: 이벤트에 대한 간단한 설명
-6. notes: 주의사항, 준비물, 기타 중요한 정보
+        result = self._complete(text)
+        self._remember(key, text, result, local)
+        return result
 
-JSON 형식으로만 응답하세요. 정보가 없으면 빈 문자열("")을 사용하세요.
-"""
+    async def aparse_event_text(self, text: str) -> dict:
+        """
+        parse_event_text의 비동기 버전 (AsyncOpenAI 사용)
+
+        Args:
+            text: 파싱할 텍스트 (문자, 메일 등)
+
+        Returns:
+            dict: 추출된 일정 정보 (parse_event_text와 동일한 형식)
+        """
+        fast = self._fast_path(text)
+        if fast is not None:
+            return fast
+
+        key = self.cache.key(text, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return _resolve_cached(cached, text)
+
+        local = self.templates.apply(text)
+        if local is not None and not local[2]:
+            return local[0]
+
+        try:
+            response = await self._achat("openai.chat", self._build_messages(text))
+            result = self._parse_response(response, text)
+
+        except Exception as e:
+            return self._error_result(e)
+
+        self._remember(key, text, result, local)
+        return result
+
+    def parse_many(self, texts: list) -> list:
+        """
+        여러 텍스트를 적은 수의 요청으로 묶어 파싱합니다.
+
+        규칙 추출/캐시/발신자 템플릿으로 처리되지 않은 텍스트만 PARSE_BATCH_MAX_ITEMS개,
+        입력 토큰 추정치 PARSE_BATCH_MAX_TOKENS 이내로 묶어 JSON 배열을 요청하고,
+        묶음끼리는 동시에 요청합니다. 응답 배열이 입력과 맞지 않으면
+        해당 묶음은 텍스트마다 개별 요청으로 다시 파싱합니다.
+
+        Args:
+            texts: 파싱할 텍스트 리스트
+
+        Returns:
+            list: 입력 순서대로 parse_event_text와 같은 형식의 dict
+        """
+        results = [None] * len(texts)
+        pending = []
+        duplicates = []
+        seen = {}
+        checks = {}  # LLM으로 검증할 템플릿 결과 (인덱스 → apply 반환값)
+
+        for index, text in enumerate(texts):
+            fast = self._fast_path(text)
+            if fast is not None:
+                results[index] = fast
+                continue
+
+            key = self.cache.key(text, self.model)
+            if key in seen:
+                # 같은 배치에 같은 텍스트가 여러 번 있으면 한 번만 요청
+                duplicates.append((index, seen[key]))
+                continue
+
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = _resolve_cached(cached, text)
+                continue
+
+            local = self.templates.apply(text)
+            if local is not None and not local[2]:
+                results[index] = local[0]
+                continue
+            if local is not None:
+                checks[index] = local
+            seen[key] = index
+            pending.append((index, text, key))
+
+        packs = self._pack(pending)
+        if packs:
+            # 진행 이벤트가 같은 스트림으로 가도록 묶음마다 현재 컨텍스트를 복사해 실행
+            contexts = [contextvars.copy_context() for _ in packs]
+            with ThreadPoolExecutor(max_workers=len(packs)) as executor:
+                parsed_packs = executor.map(lambda context, pack: context.run(self._parse_pack, pack), contexts, packs)
+                for pack, parsed in zip(packs, parsed_packs):
+                    for (index, text, key), result in zip(pack, parsed):
+                        results[index] = result
+                        self._remember(key, text, result, checks.get(index))
 
+        for index, original in duplicates:
+            results[index] = dict(results[original])
+        return results
+
+    def _remember(self, key: str, text: str, result: dict, local=None):
+        """
+        LLM 결과를 캐시에 저장하고 발신자 템플릿 검증/학습에 사용 (오류 결과는 제외)
+
+        Args:
+            local: 같은 텍스트에 대한 templates.apply 반환값 (검증이 필요한 경우)
+        """
+        if "error" in result:
+            return
+        self.cache.put(key, result)
+        if local is not None:
+            self.templates.verify(local[1], local[0], result)
+        self.templates.learn(text, result)
+
+    @staticmethod
+    def _pack(pending: list) -> list:
+        """[(index, text, key), ...]를 항목 수/토큰 추정치 상한에 맞춰 묶음으로 나누기"""
+        packs, pack, pack_tokens = [], [], 0
+        for item in pending:
+            tokens = estimate_tokens(item[1])
+            if pack and (len(pack) >= PARSE_BATCH_MAX_ITEMS or pack_tokens + tokens > PARSE_BATCH_MAX_TOKENS):
+                packs.append(pack)
+                pack, pack_tokens = [], 0
+            pack.append(item)
+            pack_tokens += tokens
+        if pack:
+            packs.append(pack)
+        return packs
+
+    def _parse_pack(self, pack: list) -> list:
+        """묶음 하나를 한 번의 요청으로 파싱 (실패/불일치 시 개별 요청)"""
+        texts = [text for _, text, _ in pack]
+        if len(texts) == 1:
+            return [self._complete(texts[0])]
+
+        try:
+            response = self._chat("openai.chat_batch", self._build_batch_messages(texts), events=len(texts))
+            parsed = self._parse_batch_response(response, texts)
+        except Exception as e:
+            emit("parse", "warning", f"묶음 파싱 오류: {e}", error=str(e), count=len(texts))
+            parsed = None
+
+        if parsed is not None:
+            return parsed
+
+        emit("parse", "warning", f"묶음 응답이 입력 {len(texts)}개와 맞지 않아 개별 요청으로 다시 파싱합니다.",
+             count=len(texts))
+        # 진행 이벤트가 같은 스트림으로 가도록 요청마다 현재 컨텍스트를 복사해 실행
+        contexts = [contextvars.copy_context() for _ in texts]
+        with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+            return list(executor.map(lambda context, text: context.run(self._complete, text), contexts, texts))
+
+    def _complete(self, text: str) -> dict:
+        """텍스트 하나를 LLM으로 파싱 (실패 시 오류 결과)"""
+        try:
+            response = self._chat("openai.chat", self._build_messages(text))
+            return self._parse_response(response, text)
+
+        except Exception as e:
+            return self._error_result(e)
+
+    def _chat(self, name: str, messages: list, events: int = 1):
+        """
+        속도 제한/재시도를 적용한 JSON 모드 채팅 요청 (지연 시간과 토큰 사용량 기록)
+
+        Args:
+            name: 지표용 호출 이름
+            messages: 프롬프트 메시지
+            events: 응답에 담길 일정 수 (출력 토큰 추정용)
+        """
+        def create():
+            with metrics.timer("call", name):
+                return self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.3
+                )
+
+        response = openai_limiter.call(create, tokens=_request_tokens(messages, events))
+        _count_usage(name, response)
+        return response
+
+    async def _achat(self, name: str, messages: list, events: int = 1):
+        """_chat의 비동기 버전 (AsyncOpenAI 사용)"""
+        async def create():
+            with metrics.timer("call", name):
+                return await self.async_client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=0.3
+                )
+
+        response = await openai_limiter.acall(create, tokens=_request_tokens(messages, events))
+        _count_usage(name, response)
+        return response
+
+    @staticmethod
+    def _fast_path(text: str):
+        """
+        규칙 기반 추출 결과가 충분히 확실하면 반환
+
+        Returns:
+            dict 또는 None (신뢰도가 낮거나 필수 필드가 없어 LLM이 필요한 경우)
+        """
+        with metrics.timer("call", "rules.extract"):
+            result, confidence = extract_event(text)
+        if is_confident(result, confidence, FAST_PATH_MIN_CONFIDENCE):
+            return result
+        return None
+
+    @staticmethod
+    def _build_messages(text: str) -> list:
+        """프롬프트 메시지 구성"""
         user_prompt = f"""다음 텍스트에서 일정 정보를 추출해주세요:
 
 {text}
 
-JSON 형식으로 응답해주세요."""
+JSON 형식으로 응답해주세요.
+{_date_context()}"""
 
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    @staticmethod
+    def _build_batch_messages(texts: list) -> list:
+        """여러 텍스트를 한 요청으로 묶은 프롬프트 메시지 구성"""
+        sections = "\n\n".join(
+            f"### 텍스트 {index}\n{text}" for index, text in enumerate(texts, start=1)
+        )
+        user_prompt = f"""다음 {len(texts)}개 텍스트에서 각각 일정 정보를 추출해주세요.
+텍스트마다 항목 하나씩, 텍스트 번호를 index로 하여 입력 순서대로 응답하세요.
+한 텍스트에 일정이 여러 개면 그 항목에 {{"index": 번호, "events": [일정1, 일정2, ...]}}로 응답하세요.
+
+{sections}
+
+{{"events": [{{"index": 1, "title": ..., "date": ..., "time": ..., "location": ..., "description": ..., "notes": ...}}, ...]}}
+형식의 JSON으로 응답해주세요. events 배열의 길이는 반드시 {len(texts)}이어야 합니다.
+{_date_context()}"""
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+
+    @staticmethod
+    def _parse_response(response, text: str) -> dict:
+        """응답 JSON 파싱, 필수 필드 기본값 설정 및 연도 보정"""
+        return _to_result(json.loads(response.choices[0].message.content), text)
+
+    @staticmethod
+    def _parse_batch_response(response, texts: list):
+        """
+        묶음 응답의 events 배열 파싱
+
+        Returns:
+            입력 순서대로 정렬한 결과 리스트, 배열이 입력과 맞지 않으면 None
+        """
+        count = len(texts)
+        events = json.loads(response.choices[0].message.content).get("events")
+        if not isinstance(events, list) or len(events) != count:
+            return None
+        if not all(isinstance(event, dict) for event in events):
+            return None
+
+        # index가 있으면 그 순서로 정렬 (일부만 있거나 1~count가 아니면 불일치)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.3
-            )
-
-            result = json.loads(response.choices[0].message.content)
-
-            # 필수 필드 확인 및 기본값 설정
-            required_fields = ["title", "date", "time", "location", "description", "notes"]
-            for field in required_fields:
-                if field not in result:
-                    result[field] = ""
+            indexes = [int(event.get("index") or 0) for event in events]
+        except (TypeError, ValueError):
+            return None
+        if any(indexes):
+            if sorted(indexes) != list(range(1, count + 1)):
+                return None
+            events = [event for _, event in sorted(zip(indexes, events), key=lambda pair: pair[0])]
 
-            return result
+        return [
+            _to_result({key: value for key, value in event.items() if key != "index"}, text)
+            for event, text in zip(events, texts)
+        ]
 
-        except Exception as e:
-            print(f"파싱 중 오류 발생: {e}")
-            return {
-                "title": "",
-                "date": "",
-                "time": "",
-                "location": "",
-                "description": "",
-                "notes": "",
-                "error": str(e)
-            }
+    @staticmethod
+    def _error_result(e: Exception) -> dict:
+        """파싱 실패 시 빈 결과"""
+        emit("parse", "error", f"파싱 중 오류 발생: {e}", error=str(e))
+        return {
+            "title": "",
+            "date": "",
+            "time": "",
+            "location": "",
+            "description": "",
+            "notes": "",
+            "error": str(e)
+        }
 
     def format_for_display(self, event_info: dict) -> str:
         """
@@ -124,6 +426,90 @@ JSON 형식으로 응답해주세요."""
         return formatted
 
 
+def _to_result(data: dict, text: str) -> dict:
+    """
+    응답 객체 하나를 파싱 결과로 변환
+
+    일정이 여러 개({"events": [...]})면 첫 일정의 필드를 최상위에 두고 전체 목록을
+    "events"에 담습니다. 일정이 하나면 기존과 같은 형식(events 없음)입니다.
+    """
+    events = data.get("events")
+    if isinstance(events, list) and events and all(isinstance(event, dict) for event in events):
+        events = [_resolve_year(_with_required_fields(dict(event)), text) for event in events]
+    else:
+        events = [_resolve_year(_with_required_fields(data), text)]
+
+    result = dict(events[0])
+    if len(events) > 1:
+        result["events"] = events
+    return result
+
+
+def _with_required_fields(result: dict) -> dict:
+    """필수 필드 확인 및 기본값 설정"""
+    required_fields = ["title", "date", "time", "location", "description", "notes"]
+    for field in required_fields:
+        if field not in result:
+            result[field] = ""
+    return result
+
+
+def _date_context() -> str:
+    """사용자 메시지 끝에 붙이는 기준 날짜 (프롬프트에서 유일하게 날짜에 따라 바뀌는 부분)"""
+    today = date.today()
+    return f"기준 날짜(오늘): {today.isoformat()} ({_WEEKDAYS[today.weekday()]})"
+
+
+def _resolve_year(result: dict, text: str) -> dict:
+    """
+    연도가 명시되지 않은 텍스트의 날짜가 과거로 추정된 경우 코드로 보정
+
+    프롬프트와 같은 규칙(오늘 이후 가장 가까운 날짜)을 결정적으로 적용합니다.
+    """
+    if has_explicit_year(text):
+        return result
+    try:
+        parsed = date.fromisoformat(result.get("date", ""))
+        today = date.today()
+        if parsed < today:
+            result["date"] = nearest_future(parsed.month, parsed.day, today).isoformat()
+    except ValueError:
+        pass
+    return result
+
+
+def _resolve_cached(result: dict, text: str) -> dict:
+    """
+    캐시에서 꺼낸 결과의 연도를 오늘 기준으로 다시 보정
+
+    캐시 키에 실행 날짜가 없으므로, 예전에 저장한 "12월 6일"이 이미 지난 날짜가 되었으면
+    새로 파싱한 것과 같이 다음 해로 옮깁니다.
+    """
+    for event in result.get("events") or []:
+        _resolve_year(event, text)
+    return _resolve_year(result, text)
+
+
+def _request_tokens(messages: list, events: int) -> int:
+    """분당 토큰 할당량에서 예약할 요청 하나의 입력+출력 토큰 추정치"""
+    prompt = sum(estimate_tokens(message["content"]) for message in messages)
+    return prompt + _OUTPUT_TOKENS_PER_EVENT * events
+
+
+def _count_usage(name: str, response):
+    """응답의 토큰 사용량(입력/출력/프롬프트 캐시 적중)을 지표에 누적"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    metrics.count_tokens(
+        name,
+        prompt=getattr(usage, "prompt_tokens", 0) or 0,
+        completion=getattr(usage, "completion_tokens", 0) or 0,
+        cached=getattr(details, "cached_tokens", 0) or 0,
+    )
+
+
 if __name__ == "__main__":
     # 테스트 코드
     sample_text = """[한신메디피아] 강수혁님 검진일
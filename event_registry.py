@@ -0,0 +1,72 @@
+"""
+캘린더 등록 기록
+events.insert가 성공한 이벤트 ID를 SQLite에 보관해, 중단된 실행을 재개하거나 행을 다시
+처리할 때 이미 등록한 일정을 캘린더에 다시 보내지 않습니다.
+
+이벤트 ID는 시트/행/원문으로 만든 결정적인 값이라 다시 보내도 409(이미 존재)로 끝나지만,
+체크포인트에 결과가 남기 전에 중단된 행(비동기/병렬 모드에서 동시에 진행 중이던 행 등)은
+재개할 때 등록 요청부터 다시 실행됩니다. 등록 직후 같은 스레드에서 기록하므로
+노드 결과가 체크포인트에 남지 않아도 등록 사실은 남습니다.
+"""
+import os
+import sqlite3
+import threading
+
+# 기록 파일 경로 (빈 문자열이면 사용 안 함)
+EVENT_REGISTRY_DB = os.getenv("EVENT_REGISTRY_DB", ".cache/event_registry.sqlite3")
+
+
+class EventRegistry:
+    """등록에 성공한 캘린더 이벤트 ID 집합 (스레드 안전)"""
+
+    def __init__(self, path: str = EVENT_REGISTRY_DB):
+        """
+        Args:
+            path: SQLite 파일 경로 (빈 문자열이면 사용 안 함)
+        """
+        self.path = path
+        self.skipped = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def registered(self, event_ids: list) -> set:
+        """event_ids 중 이미 등록된 이벤트 ID 집합"""
+        if not self.enabled or not event_ids:
+            return set()
+        with self._lock:
+            conn = self._connect()
+            found = {
+                event_id for event_id in event_ids
+                if conn.execute("SELECT 1 FROM events WHERE event_id = ?", (event_id,)).fetchone()
+            }
+            self.skipped += len(found)
+            return found
+
+    def record(self, event_ids: list):
+        """등록에 성공한 이벤트 ID 기록"""
+        event_ids = [event_id for event_id in event_ids if event_id]
+        if not self.enabled or not event_ids:
+            return
+        with self._lock:
+            self._connect().executemany(
+                "INSERT OR IGNORE INTO events (event_id) VALUES (?)", [(event_id,) for event_id in event_ids]
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 연결을 열고 테이블 생성 (잠금 안에서 호출)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS events (event_id TEXT PRIMARY KEY)")
+            self._conn = conn
+        return self._conn
+
+
+# 프로세스 전역 등록 기록
+event_registry = EventRegistry()
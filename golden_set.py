@@ -0,0 +1,93 @@
+"""
+일정 추출 정답 세트
+test_messages.txt의 샘플과 상투 문구가 섞인 짧은 안내 문자에 사람이 확인한 제목/날짜/시간/장소를 붙여,
+규칙 추출기와 입력 축약의 정확도를 같은 기준으로 측정합니다.
+
+연도가 없는 날짜("12월6일", "12/18(수)")는 GOLDEN_TODAY 기준으로 가장 가까운 미래 날짜가 정답입니다.
+제목은 규칙 추출기의 형식("[보낸 곳] 내용" → "보낸 곳 내용", 끝의 완료/확인/안내 제외)을 따르며,
+축약이 첫 내용 줄(보낸 곳과 행사명)을 지우지 않았는지 확인하는 용도입니다.
+"""
+import os
+import re
+from datetime import date
+
+# 연도 없는 날짜를 추정할 기준 날짜
+GOLDEN_TODAY = date(2025, 11, 1)
+
+# 정확도를 재는 필드
+GOLDEN_FIELDS = ("title", "date", "time", "location")
+
+# 필드별 최소 정확도 (규칙 추출기 회귀 확인용)
+MIN_ACCURACY = {"title": 1.0, "date": 1.0, "time": 0.85, "location": 0.85}
+
+# LLM을 생략한(신뢰도가 충분한) 결과에서 반드시 맞아야 하는 필드
+REQUIRED_CORRECT = ("date", "time")
+
+# test_messages.txt 샘플 순서대로의 정답
+_MESSAGE_ANSWERS = [
+    {"title": "연세자연애치과", "date": "2025-12-06", "time": "12:00",
+     "location": "서울특별시 서초구 헌릉로 176 (내곡동) 3층"},
+    {"title": "대한항공 항공권 예약", "date": "2025-12-20", "time": "12:20", "location": "인천국제공항(ICN)"},
+    {"title": "인터파크 예매", "date": "2026-01-04", "time": "15:00", "location": "샤롯데씨어터 (잠실)"},
+    {"title": "준오헤어 예약", "date": "2025-12-18", "time": "15:00", "location": "서울 강남구 강남대로 지하 1층"},
+    {"title": "AI 기반 공급망 혁신으로 리스크 관리 및 지속가능성 확보", "date": "2025-12-09", "time": "14:00",
+     "location": ""},
+]
+
+# 상투 문구(발신 표시, 링크, 문의 전화, 수신거부)가 섞인 안내 문자와 정답
+_EXTRA = [
+    (
+        "[Web발신]\n"
+        "[서울내과] 건강검진 안내\n"
+        "검진일은 2025-12-15 10:00입니다.\n"
+        "장소: 서울내과 본관 2층 검진센터\n"
+        "전날 밤 9시 이후 금식해 주세요.\n"
+        "https://bit.ly/seoul-map\n"
+        "문의: 02-123-4567\n"
+        "무료수신거부 080-000-0000",
+        {"title": "서울내과 건강검진", "date": "2025-12-15", "time": "10:00", "location": "서울내과 본관 2층 검진센터"},
+    ),
+    (
+        "(광고)[한빛학원] 학부모 설명회 안내\n"
+        "일시: 2026년 2월 7일(토) 오전 10시 30분\n"
+        "장소: 한빛학원 본원 3층 세미나실\n"
+        "자세한 내용: https://bit.ly/hanbit\n"
+        "무료수신거부 080-111-2222",
+        {"title": "한빛학원 학부모 설명회", "date": "2026-02-07", "time": "10:30", "location": "한빛학원 본원 3층 세미나실"},
+    ),
+    (
+        "[동네도서관] 3월 독서 모임\n"
+        "3월 14일(토) 오후 2시\n"
+        "위치: 동네도서관 2층 강의실\n"
+        "다음 모임은 4월 11일(토)입니다.\n"
+        "감사합니다.",
+        {"title": "동네도서관 3월 독서 모임", "date": "2026-03-14", "time": "14:00", "location": "동네도서관 2층 강의실"},
+    ),
+]
+
+
+def load_golden_set() -> list:
+    """[(원문, {"title", "date", "time", "location"}), ...]"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_messages.txt")
+    with open(path, encoding="utf-8") as f:
+        samples = re.split(r"^## \d+\.[^\n]*\n", f.read(), flags=re.MULTILINE)[1:]
+    return list(zip(samples, _MESSAGE_ANSWERS)) + _EXTRA
+
+
+def field_accuracy(results: list, answers: list) -> dict:
+    """필드별 정답 비율 (앞뒤 공백은 무시)"""
+    return {
+        field: sum(
+            (result.get(field) or "").strip() == answer[field] for result, answer in zip(results, answers)
+        ) / len(answers)
+        for field in GOLDEN_FIELDS
+    }
+
+
+def mismatches(result: dict, answer: dict) -> dict:
+    """정답과 다른 필드 {필드: (결과, 정답)}"""
+    return {
+        field: ((result.get(field) or "").strip(), answer[field])
+        for field in GOLDEN_FIELDS
+        if (result.get(field) or "").strip() != answer[field]
+    }
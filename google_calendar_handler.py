@@ -3,15 +3,48 @@ Google Calendar 연동 모듈
 파싱된 이벤트 정보를 구글 캘린더에 등록합니다.
 """
 import os
+import base64
+import hashlib
+import time
+import threading
 from datetime import datetime, timedelta
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
 from google_auth_helper import get_credentials
+from rate_limiter import calendar_limiter, classify_error
+from progress import emit
 
 load_dotenv()
 
 
+def make_event_id(*parts) -> str:
+    """
+    원본 행 정보로부터 결정적인 캘린더 이벤트 ID를 생성합니다.
+
+    같은 행을 다시 등록하면 같은 ID로 요청하게 되어 Calendar API가
+    409(이미 존재)로 응답하므로, 재시도/재개 시 중복 이벤트가 생기지 않습니다.
+    ID는 Calendar API 규칙(base32hex 소문자 a-v, 0-9, 5~1024자)을 따릅니다.
+
+    Args:
+        parts: ID를 구성할 값들 (시트 ID, 행 번호, 원본 텍스트 등)
+
+    Returns:
+        str: 32자 이벤트 ID
+    """
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).digest()
+    return base64.b32hexencode(digest).decode("ascii").lower().rstrip("=")
+
+
+def _is_duplicate_error(error) -> bool:
+    """같은 ID의 이벤트가 이미 있을 때(409) 발생하는 오류인지 확인"""
+    return isinstance(error, HttpError) and error.resp.status == 409
+
+
 class GoogleCalendarHandler:
+    # Calendar API 배치 요청 한 번에 담을 수 있는 최대 요청 수
+    MAX_BATCH_SIZE = 50
+
     def __init__(self, use_oauth: bool = True, credentials_file: str = "oauth_credentials.json"):
         """
         Google Calendar API 초기화
@@ -22,6 +55,8 @@ class GoogleCalendarHandler:
                             또는 서비스 계정 JSON 파일 경로
         """
         self.calendar_id = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+        self._creds = None
+        self._local = threading.local()
 
         try:
             if use_oauth:
@@ -35,12 +70,154 @@ class GoogleCalendarHandler:
                     credentials_file, scopes=scopes
                 )
 
+            self._creds = creds
             self.service = build("calendar", "v3", credentials=creds)
+            self._local.service = self.service
             print("✅ Google Calendar 인증 성공")
         except Exception as e:
             print(f"❌ Google Calendar 인증 실패: {e}")
             self.service = None
 
+    def _get_service(self):
+        """
+        현재 스레드 전용 Calendar 서비스 객체를 반환합니다.
+
+        httplib2 기반 서비스 객체는 스레드 간에 공유할 수 없으므로
+        병렬 처리 시 스레드마다 별도로 생성합니다.
+        """
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = build("calendar", "v3", credentials=self._creds)
+            self._local.service = service
+        return service
+
+    @staticmethod
+    def _build_event_body(event_info: dict) -> dict:
+        """이벤트 정보로 Calendar API 요청 본문 구성"""
+        date_str = event_info.get("date", "")
+        time_str = event_info.get("time", "")
+
+        # 시작 시간 생성
+        if time_str:
+            start_datetime_str = f"{date_str}T{time_str}:00"
+            start_datetime = datetime.fromisoformat(start_datetime_str)
+        else:
+            # 시간 정보가 없으면 종일 이벤트로 처리
+            start_datetime = datetime.fromisoformat(f"{date_str}T09:00:00")
+
+        # 종료 시간 (1시간 후)
+        end_datetime = start_datetime + timedelta(hours=1)
+
+        # 이벤트 본문 구성
+        description_parts = []
+        if event_info.get("description"):
+            description_parts.append(event_info.get("description"))
+        if event_info.get("notes"):
+            description_parts.append(f"\n\n📝 주의사항:\n{event_info.get('notes')}")
+
+        description = "\n".join(description_parts)
+
+        # 이벤트 데이터 구성
+        event = {
+            "summary": event_info.get("title", "새 일정"),
+            "location": event_info.get("location", ""),
+            "description": description,
+            "start": {
+                "dateTime": start_datetime.isoformat(),
+                "timeZone": "Asia/Seoul",
+            },
+            "end": {
+                "dateTime": end_datetime.isoformat(),
+                "timeZone": "Asia/Seoul",
+            },
+            "reminders": {
+                "useDefault": False,
+                "overrides": [
+                    {"method": "popup", "minutes": 24 * 60},  # 1일 전
+                    {"method": "popup", "minutes": 60},  # 1시간 전
+                ],
+            },
+        }
+
+        if event_info.get("event_id"):
+            event["id"] = event_info["event_id"]
+
+        # 원본 시트 행과 문자 안의 일정 번호 (문자 하나에서 여러 일정을 등록한 경우 추적용)
+        if event_info.get("source_row") is not None:
+            event["extendedProperties"] = {"private": {
+                "sourceRow": str(event_info["source_row"]),
+                "part": str(event_info.get("part", 0)),
+            }}
+
+        return event
+
+    def create_events(self, event_infos: list) -> list:
+        """
+        여러 이벤트를 배치 요청으로 한 번에 생성합니다.
+
+        Args:
+            event_infos: 이벤트 정보 딕셔너리 리스트 (create_event와 같은 형식)
+
+        Returns:
+            list: 입력 순서대로 (event_id, error) 튜플 리스트
+                  성공 시 error는 None, 실패 시 event_id는 빈 문자열
+        """
+        if not self.service:
+            raise Exception("Google Calendar 서비스가 초기화되지 않았습니다.")
+
+        results = [("", None)] * len(event_infos)
+        throttled = []  # 배치 안에서 제한 응답(429/403 rateLimitExceeded/5xx)을 받은 (인덱스, Retry-After)
+
+        def callback(request_id, response, exception):
+            index = int(request_id)
+            if _is_duplicate_error(exception):
+                # 이전 실행에서 이미 등록된 이벤트
+                results[index] = (event_infos[index]["event_id"], None)
+            elif exception is not None:
+                results[index] = ("", str(exception))
+                retryable, retry_after = classify_error(exception)
+                if retryable:
+                    throttled.append((index, retry_after))
+            else:
+                results[index] = (response.get("id", ""), None)
+
+        bodies = {}
+        for index, event_info in enumerate(event_infos):
+            try:
+                bodies[index] = self._build_event_body(event_info)
+            except Exception as e:
+                # 날짜/시간 형식 오류는 해당 이벤트만 실패 처리
+                results[index] = ("", str(e))
+
+        # 제한된 요청만 모아 다시 보냄 (결정적 ID라 이미 등록된 이벤트는 409로 성공 처리)
+        service = self._get_service()
+        pending = sorted(bodies)
+        for attempt in range(calendar_limiter.max_retries + 1):
+            throttled.clear()
+            for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+                chunk = pending[start:start + self.MAX_BATCH_SIZE]
+                batch = service.new_batch_http_request(callback=callback)
+                for index in chunk:
+                    batch.add(
+                        service.events().insert(calendarId=self.calendar_id, body=bodies[index]),
+                        request_id=str(index)
+                    )
+                calendar_limiter.timed_call("calendar.batch_insert", batch.execute, cost=len(chunk))
+
+            if not throttled or attempt == calendar_limiter.max_retries:
+                break
+            retry_after = max((after for _, after in throttled if after is not None), default=None)
+            delay = calendar_limiter.backoff(attempt, retry_after)
+            emit("calendar", "warning", f"⏳ 캘린더 요청 {len(throttled)}개가 제한되어 {delay:.1f}초 후 다시 시도합니다.",
+                 count=len(throttled), delay=delay)
+            time.sleep(delay)
+            pending = sorted(index for index, _ in throttled)
+
+        succeeded = sum(1 for event_id, _ in results if event_id)
+        emit("calendar", "done", f"✅ 캘린더 배치 등록: {succeeded}/{len(event_infos)}개 성공",
+             succeeded=succeeded, total=len(event_infos))
+        return results
+
     def create_event(self, event_info: dict) -> str:
         """
         캘린더에 이벤트를 생성합니다.
@@ -53,6 +230,10 @@ class GoogleCalendarHandler:
                 - location: 장소
                 - description: 설명
                 - notes: 메모
+                - event_id: (선택) 지정할 이벤트 ID (make_event_id로 생성)
+                  이미 같은 ID의 이벤트가 있으면 새로 만들지 않고 그 ID를 반환
+                - source_row, part: (선택) 원본 시트 행 번호와 문자 안의 일정 번호
+                  (이벤트의 비공개 확장 속성에 기록)
 
         Returns:
             str: 생성된 이벤트 ID (실패 시 빈 문자열)
@@ -62,7 +243,6 @@ class GoogleCalendarHandler:
             return ""
 
         try:
-            # 날짜와 시간 파싱
             date_str = event_info.get("date", "")
             time_str = event_info.get("time", "")
 
@@ -70,66 +250,41 @@ class GoogleCalendarHandler:
                 print("날짜 정보가 없습니다.")
                 return ""
 
-            # 시작 시간 생성
-            if time_str:
-                start_datetime_str = f"{date_str}T{time_str}:00"
-                start_datetime = datetime.fromisoformat(start_datetime_str)
-            else:
-                # 시간 정보가 없으면 종일 이벤트로 처리
-                start_datetime = datetime.fromisoformat(f"{date_str}T09:00:00")
-
-            # 종료 시간 (1시간 후)
-            end_datetime = start_datetime + timedelta(hours=1)
-
-            # 이벤트 본문 구성
-            description_parts = []
-            if event_info.get("description"):
-                description_parts.append(event_info.get("description"))
-            if event_info.get("notes"):
-                description_parts.append(f"\n\n📝 주의사항:\n{event_info.get('notes')}")
-
-            description = "\n".join(description_parts)
-
-            # 이벤트 데이터 구성
-            event = {
-                "summary": event_info.get("title", "새 일정"),
-                "location": event_info.get("location", ""),
-                "description": description,
-                "start": {
-                    "dateTime": start_datetime.isoformat(),
-                    "timeZone": "Asia/Seoul",
-                },
-                "end": {
-                    "dateTime": end_datetime.isoformat(),
-                    "timeZone": "Asia/Seoul",
-                },
-                "reminders": {
-                    "useDefault": False,
-                    "overrides": [
-                        {"method": "popup", "minutes": 24 * 60},  # 1일 전
-                        {"method": "popup", "minutes": 60},  # 1시간 전
-                    ],
-                },
-            }
+            event = self._build_event_body(event_info)
 
             # 캘린더에 이벤트 추가
-            created_event = self.service.events().insert(
-                calendarId=self.calendar_id,
-                body=event
-            ).execute()
+            created_event = calendar_limiter.timed_call(
+                "calendar.insert",
+                self._get_service().events().insert(
+                    calendarId=self.calendar_id,
+                    body=event
+                ).execute
+            )
 
             event_id = created_event.get("id")
             event_link = created_event.get("htmlLink")
 
-            print(f"✅ 캘린더에 이벤트 등록 완료!")
-            print(f"   제목: {event_info.get('title')}")
-            print(f"   일시: {date_str} {time_str}")
-            print(f"   링크: {event_link}")
+            emit(
+                "calendar", "done",
+                f"✅ 캘린더에 이벤트 등록 완료!\n"
+                f"   제목: {event_info.get('title')}\n"
+                f"   일시: {date_str} {time_str}\n"
+                f"   링크: {event_link}",
+                row=event_info.get("source_row"), event_id=event_id, link=event_link
+            )
 
             return event_id
 
+        except HttpError as e:
+            if _is_duplicate_error(e):
+                emit("calendar", "done", f"ℹ️  이미 등록된 이벤트입니다: {event_info['event_id']}",
+                     row=event_info.get("source_row"), event_id=event_info["event_id"])
+                return event_info["event_id"]
+            emit("calendar", "error", f"❌ 이벤트 생성 실패: {e}", row=event_info.get("source_row"), error=str(e))
+            return ""
+
         except Exception as e:
-            print(f"❌ 이벤트 생성 실패: {e}")
+            emit("calendar", "error", f"❌ 이벤트 생성 실패: {e}", row=event_info.get("source_row"), error=str(e))
             return ""
 
     def get_upcoming_events(self, max_results: int = 10):
@@ -148,13 +303,16 @@ class GoogleCalendarHandler:
 
         try:
             now = datetime.utcnow().isoformat() + "Z"
-            events_result = self.service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=now,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime"
-            ).execute()
+            events_result = calendar_limiter.timed_call(
+                "calendar.list",
+                self._get_service().events().list(
+                    calendarId=self.calendar_id,
+                    timeMin=now,
+                    maxResults=max_results,
+                    singleEvents=True,
+                    orderBy="startTime"
+                ).execute
+            )
 
             events = events_result.get("items", [])
 
@@ -3,12 +3,431 @@ Google Sheets 연동 모듈
 구글 시트에서 텍스트를 읽고, 파싱 결과를 다시 시트에 작성합니다.
 """
 import os
+import json
+import time
+import queue
+import atexit
+import hashlib
+import threading
+import contextvars
 import gspread
+from gspread.utils import rowcol_to_a1
 from dotenv import load_dotenv
 from google_auth_helper import get_credentials
+from rate_limiter import sheets_limiter
+from metrics import metrics
+from progress import emit
+from row_status import STATUS_PARSED, STATUS_SYNCED, needs_work, migrate_status, count_failures
 
 load_dotenv()
 
+# 쓰기 버퍼를 비우는 기준: 대기 중인 행 수, 첫 쓰기 후 경과 시간(ms)
+SHEETS_FLUSH_ROWS = int(os.getenv("SHEETS_FLUSH_ROWS", "20"))
+SHEETS_FLUSH_MS = float(os.getenv("SHEETS_FLUSH_MS", "2000"))
+
+# 아직 시트에 반영하지 않은 쓰기를 기록하는 저널 디렉터리 (빈 문자열이면 저널 사용 안 함)
+SHEETS_JOURNAL_DIR = os.getenv("SHEETS_JOURNAL_DIR", ".cache/sheets_journal")
+
+# 캐시한 워크시트 객체를 다시 여는 주기(초, 0 이하면 매번 새로 열기)
+SHEETS_HANDLE_TTL = float(os.getenv("SHEETS_HANDLE_TTL", "600"))
+
+# 이미 처리한 행 위치(high-water mark)를 저장하는 파일 (빈 문자열이면 매번 처음부터 읽기)
+SHEETS_CURSOR_FILE = os.getenv("SHEETS_CURSOR_FILE", ".cache/sheet_cursor.json")
+
+# 읽기 시작 행의 위치 확인에 쓰는 행 수 (그 행과 바로 위 행들의 텍스트를 함께 비교)
+SHEETS_CURSOR_WINDOW = max(int(os.getenv("SHEETS_CURSOR_WINDOW", "5")), 1)
+
+# 페이지 단위로 읽을 때 한 번에 읽는 행 범위 크기
+SHEETS_PAGE_ROWS = int(os.getenv("SHEETS_PAGE_ROWS", "500"))
+
+# 열 번호 (A=1)
+_COLUMNS = {"title": 2, "date": 3, "time": 4, "location": 5, "description": 6, "notes": 7}
+STATUS_COLUMN = 8
+
+
+def is_pending(text: str, status: str) -> bool:
+    """A열에 텍스트가 있고, H열이 아직 할 일이 남은 상태(대기/파싱 완료/오류)이면 미처리 행"""
+    return bool(text.strip()) and needs_work(status)
+
+
+def _is_stale(error: Exception) -> bool:
+    """캐시한 워크시트가 더 이상 맞지 않아 생긴 오류이면 True (시트 삭제/이름 변경, 격자 크기 변경)"""
+    if isinstance(error, (gspread.exceptions.WorksheetNotFound, gspread.exceptions.SpreadsheetNotFound)):
+        return True
+    if isinstance(error, gspread.exceptions.APIError):
+        status = error.code
+        message = str(error.error.get("message", ""))
+        return status == 404 or (status == 400 and (
+            "exceeds grid limits" in message or "Unable to parse range" in message
+        ))
+    return False
+
+
+class SheetHandle:
+    """
+    워크시트 객체 캐시 (스레드 안전)
+
+    open_by_key와 worksheet 메타데이터 조회는 처음 한 번만 하고, SHEETS_HANDLE_TTL이 지나거나
+    호출이 시트 없음/격자 변경 오류로 실패하면 다시 엽니다.
+    여러 스레드가 동시에 만료를 만나도 메타데이터는 한 번만 다시 조회합니다.
+    """
+
+    def __init__(self, open_worksheet, ttl: float = SHEETS_HANDLE_TTL):
+        """
+        Args:
+            open_worksheet: 시트를 열어 워크시트 객체를 반환하는 함수
+            ttl: 워크시트 객체를 다시 여는 주기(초)
+        """
+        self.open_worksheet = open_worksheet
+        self.ttl = ttl
+        self._worksheet = None
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """캐시한 워크시트 객체 (없거나 만료되면 새로 열기)"""
+        with self._lock:
+            expired = time.monotonic() - self._opened_at >= self.ttl
+            if self._worksheet is None or expired:
+                metrics.incr("sheets.handle_opens")
+                # open_by_key와 worksheet가 각각 메타데이터를 한 번씩 요청
+                self._worksheet = sheets_limiter.timed_call("sheets.open", self.open_worksheet, cost=2)
+                self._opened_at = time.monotonic()
+            return self._worksheet
+
+    def invalidate(self, worksheet=None):
+        """
+        캐시한 워크시트 객체 버리기
+
+        worksheet를 주면 그 객체가 아직 캐시에 있을 때만 버려, 같은 오류를 만난
+        다른 스레드가 이미 새로 연 객체를 다시 버리지 않게 합니다.
+        """
+        with self._lock:
+            if worksheet is None or worksheet is self._worksheet:
+                self._worksheet = None
+
+    def call(self, name: str, method: str, *args, **kwargs):
+        """
+        캐시한 워크시트의 메서드를 속도 제한을 거쳐 호출
+
+        시트 없음/격자 변경 오류이면 워크시트를 다시 열어 한 번 더 시도합니다.
+
+        Args:
+            name: 지연 시간 지표 이름 (예: "sheets.read")
+            method: 워크시트 메서드 이름 (예: "get_all_values")
+        """
+        worksheet = self.get()
+        try:
+            return sheets_limiter.timed_call(name, getattr(worksheet, method), *args, **kwargs)
+        except Exception as e:
+            if not _is_stale(e):
+                raise
+            metrics.incr("sheets.handle_refreshes")
+            emit("sheets", "warning", f"♻️  시트 정보가 바뀌어 다시 엽니다: {e}", error=str(e))
+            self.invalidate(worksheet)
+            return sheets_limiter.timed_call(name, getattr(self.get(), method), *args, **kwargs)
+
+
+class WriteBuffer:
+    """
+    시트 쓰기 지연(write-behind) 버퍼 (스레드 안전)
+
+    행마다 대기 중인 셀 값을 {열 번호: 값}으로 합쳐 같은 셀은 마지막 값만 남기고,
+    대기 행이 SHEETS_FLUSH_ROWS개가 되거나 첫 쓰기 후 SHEETS_FLUSH_MS가 지나면
+    한 번의 values.batchUpdate로 반영합니다.
+    버퍼에 넣은 쓰기는 저널(JSONL)에도 기록하고 반영 후 지우므로, 반영 전에 프로세스가
+    종료되어도 다음 실행에서 같은 시트의 버퍼를 만들 때 저널을 읽어 다시 반영합니다.
+    """
+
+    def __init__(self, key: str, sheet: SheetHandle, max_rows: int = SHEETS_FLUSH_ROWS,
+                 max_delay_ms: float = SHEETS_FLUSH_MS, journal_dir: str = SHEETS_JOURNAL_DIR):
+        """
+        Args:
+            key: 시트 식별자 (저널 파일 이름에 사용)
+            sheet: 반영할 시트의 워크시트 캐시
+            max_rows: 이 수만큼 행이 대기하면 즉시 반영
+            max_delay_ms: 첫 쓰기 후 이 시간이 지나면 반영
+            journal_dir: 저널 디렉터리 (빈 문자열이면 저널 사용 안 함)
+        """
+        self.sheet = sheet
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.journal_path = ""
+        if journal_dir:
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+            self.journal_path = os.path.join(journal_dir, f"{digest}.jsonl")
+
+        self._pending = {}  # 행 번호 → {열 번호: 값}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._recover()
+
+    def stage(self, updates: dict):
+        """
+        셀 쓰기를 버퍼에 추가 (기준을 넘으면 바로 반영)
+
+        Args:
+            updates: {행 번호: {열 번호: 값}}
+        """
+        if not updates:
+            return
+
+        with self._lock:
+            for row_number, cells in updates.items():
+                self._pending.setdefault(row_number, {}).update(cells)
+            self._append_journal(updates)
+            metrics.incr("sheets.staged_rows", len(updates))
+            full = len(self._pending) >= self.max_rows
+            if not full and self._timer is None and self.max_delay > 0:
+                self._timer = threading.Timer(self.max_delay, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full or self.max_delay <= 0:
+            self.flush()
+
+    def flush(self):
+        """대기 중인 쓰기를 한 번의 batchUpdate로 반영 (실패하면 버퍼에 되돌리고 예외 전달)"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return
+
+            try:
+                self.sheet.call("sheets.write", "batch_update", _to_ranges(pending))
+            except Exception:
+                with self._lock:
+                    # 반영 중에 들어온 더 새로운 값은 유지
+                    for row_number, cells in pending.items():
+                        self._pending[row_number] = {**cells, **self._pending.get(row_number, {})}
+                raise
+
+            metrics.incr("sheets.flushes")
+            with self._lock:
+                self._rewrite_journal()
+            emit("sheets", "done", f"📝 시트 쓰기 반영: {len(pending)}개 행", count=len(pending))
+
+    def pending_rows(self) -> int:
+        """반영 대기 중인 행 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception as e:
+            emit("sheets", "error", f"⚠️  시트 쓰기 반영 실패 (다음 반영 때 다시 시도): {e}", error=str(e))
+
+    def _recover(self):
+        """이전 실행에서 반영하지 못한 저널의 쓰기를 버퍼로 읽기"""
+        if not self.journal_path or not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    updates = json.loads(line)
+                except ValueError:
+                    continue  # 기록 도중 종료된 마지막 줄
+                for row_number, cells in updates.items():
+                    self._pending.setdefault(int(row_number), {}).update(
+                        {int(column): value for column, value in cells.items()}
+                    )
+        if self._pending:
+            emit("sheets", "done", f"♻️  반영되지 않은 시트 쓰기 {len(self._pending)}개 행을 저널에서 복구",
+                 count=len(self._pending))
+
+    def _append_journal(self, updates: dict):
+        """버퍼에 넣은 쓰기를 저널에 추가 (잠금 안에서 호출)"""
+        if not self.journal_path:
+            return
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(updates, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite_journal(self):
+        """저널을 아직 반영하지 않은 쓰기만 남도록 다시 작성 (잠금 안에서 호출)"""
+        if not self.journal_path:
+            return
+        if not self._pending:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            return
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self._pending, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+
+
+def _prefetch(items):
+    """
+    다음 항목을 백그라운드 스레드에서 미리 만들어 두는 제너레이터
+
+    한 번에 하나만 미리 만들어 두고, 만드는 중에 생긴 예외는 받는 쪽에서 다시 발생시킵니다.
+    받는 쪽이 중간에 멈추면 미리 만들기도 멈춥니다.
+    """
+    ready = queue.Queue(maxsize=1)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(("item", item)):
+                    return
+            put(("done", None))
+        except Exception as e:
+            put(("error", e))
+        finally:
+            items.close()
+
+    # 읽는 중에 낸 진행 이벤트가 받는 쪽의 스트림/수신자로 가도록 현재 컨텍스트를 복사해 실행
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(produce,), daemon=True).start()
+    try:
+        while True:
+            kind, payload = ready.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise payload
+            yield payload
+    finally:
+        stopped.set()
+
+
+def _to_ranges(pending: dict) -> list:
+    """{행: {열: 값}}을 행마다 연속한 열 구간의 batchUpdate 범위 목록으로 변환"""
+    ranges = []
+    for row_number in sorted(pending):
+        cells = pending[row_number]
+        columns = sorted(cells)
+        start = columns[0]
+        for index, column in enumerate(columns):
+            last = index == len(columns) - 1
+            if last or columns[index + 1] != column + 1:
+                ranges.append({
+                    "range": rowcol_to_a1(row_number, start) + (
+                        f":{rowcol_to_a1(row_number, column)}" if column != start else ""
+                    ),
+                    "values": [[cells[col] for col in range(start, column + 1)]],
+                })
+                if not last:
+                    start = columns[index + 1]
+    return ranges
+
+
+class ReadCursor:
+    """
+    시트별 읽기 시작 행(high-water mark) 저장소 (스레드 안전)
+
+    시트마다 그 행까지는 모두 처리가 끝난 마지막 행 번호와, 그 행에서 끝나는 몇 행(창)의 A열 텍스트 해시를
+    JSON 파일에 기록합니다. 다음 읽기는 창의 첫 행부터 시작하고, 창의 텍스트가 기록과 다르면(위쪽에 행이
+    삽입/삭제됨) 처음부터 다시 읽습니다. 한 행만 비교하면 같은 문자가 연달아 있을 때 밀린 행을 놓치므로
+    여러 행을 함께 비교합니다.
+    """
+
+    def __init__(self, path: str = SHEETS_CURSOR_FILE):
+        """
+        Args:
+            path: JSON 파일 경로 (빈 문자열이면 저장하지 않음)
+        """
+        self.path = path
+        self._marks = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple:
+        """
+        (읽기 시작 행, 창의 행 수, 창 텍스트의 해시) (기록이 없으면 (1, 0, None))
+
+        창을 기록하지 않은 이전 형식은 그 행 하나를 창으로 봅니다.
+        """
+        with self._lock:
+            mark = self._load().get(key)
+        return (mark["row"], mark.get("window", 1), mark["fingerprint"]) if mark else (1, 0, None)
+
+    def set(self, key: str, row: int, texts: list):
+        """
+        행 row까지 모두 처리되었음을 기록
+
+        Args:
+            row: 모두 처리가 끝난 마지막 행
+            texts: row에서 끝나는 창의 A열 텍스트 (위에서부터)
+        """
+        if not self.path:
+            return
+        with self._lock:
+            marks = self._load()
+            mark = {"row": row, "window": len(texts), "fingerprint": fingerprint("\x1f".join(texts))}
+            if marks.get(key) == mark:
+                return
+            marks[key] = mark
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(marks, f, ensure_ascii=False, indent=2)
+            os.replace(self.path + ".tmp", self.path)
+
+    def _load(self) -> dict:
+        """처음 사용할 때 파일 읽기 (잠금 안에서 호출)"""
+        if self._marks is None:
+            self._marks = {}
+            if self.path and os.path.exists(self.path):
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        self._marks = json.load(f)
+                except ValueError:
+                    pass  # 손상된 파일이면 처음부터 읽기
+        return self._marks
+
+
+def fingerprint(text: str) -> str:
+    """행 위치 확인용 텍스트 해시"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+# 프로세스 전역 읽기 위치 저장소
+read_cursor = ReadCursor()
+
+
+# 시트별 공용 워크시트 캐시와 쓰기 버퍼 (같은 시트의 핸들러들이 하나의 캐시, 버퍼와 저널을 공유)
+_handles = {}
+_buffers = {}
+_read_statuses = {}  # 시트별 {행 번호: 미처리 행을 읽을 때의 상태} (오류 횟수 계산용)
+_buffers_lock = threading.Lock()
+
+
+def flush_all():
+    """모든 시트의 대기 중인 쓰기 반영 (실행 종료 시 호출)"""
+    with _buffers_lock:
+        buffers = list(_buffers.values())
+    for buffer in buffers:
+        try:
+            buffer.flush()
+        except Exception as e:
+            emit("sheets", "error", f"⚠️  시트 쓰기 반영 실패 (저널에 남아 다음 실행에서 다시 시도): {e}",
+                 error=str(e))
+
+
+atexit.register(flush_all)
+
 
 class GoogleSheetsHandler:
     def __init__(self, use_oauth: bool = True, credentials_file: str = "oauth_credentials.json"):
@@ -44,14 +463,27 @@ class GoogleSheetsHandler:
             print(f"❌ Google Sheets 인증 실패: {e}")
             self.client = None
 
-    def get_sheet(self):
-        """워크시트 객체 가져오기"""
+        # 같은 시트의 핸들러끼리 워크시트 캐시와 쓰기 버퍼를 공유
+        key = f"{self.sheet_id}\x1f{self.sheet_name}"
+        with _buffers_lock:
+            if key not in _handles:
+                _handles[key] = SheetHandle(self._open_worksheet)
+            self.sheet = _handles[key]
+            if key not in _buffers:
+                _buffers[key] = WriteBuffer(key, self.sheet)
+            self.writes = _buffers[key]
+            self.read_statuses = _read_statuses.setdefault(key, {})
+        self.cursor_key = key
+
+    def _open_worksheet(self):
+        """시트를 열어 워크시트 객체 반환 (SheetHandle이 만료 시에만 호출)"""
         if not self.client:
             raise Exception("Google Sheets 클라이언트가 초기화되지 않았습니다.")
+        return self.client.open_by_key(self.sheet_id).worksheet(self.sheet_name)
 
-        spreadsheet = self.client.open_by_key(self.sheet_id)
-        worksheet = spreadsheet.worksheet(self.sheet_name)
-        return worksheet
+    def get_sheet(self):
+        """워크시트 객체 가져오기 (프로세스 전역 캐시 사용)"""
+        return self.sheet.get()
 
     def read_unprocessed_events(self) -> list:
         """
@@ -71,107 +503,244 @@ class GoogleSheetsHandler:
             list: [(row_number, text), ...] 형태의 리스트
         """
         try:
-            worksheet = self.get_sheet()
-            all_values = worksheet.get_all_values()
+            unprocessed = [(row_number, text) for row_number, text, _ in self._read_pending("sheets.read")]
+            emit("sheets", "done", f"처리 대기 중인 이벤트: {len(unprocessed)}개", count=len(unprocessed))
+            return unprocessed
 
-            unprocessed = []
-            for idx, row in enumerate(all_values[1:], start=2):  # 헤더 제외, 행 번호는 2부터
-                if len(row) == 0:  # 빈 행
-                    continue
+        except Exception as e:
+            emit("sheets", "error", f"시트 읽기 오류: {e}", error=str(e))
+            return []
 
-                text = row[0] if len(row) > 0 else ""
-                status = row[7] if len(row) > 7 else ""
+    def get_change_token(self) -> tuple:
+        """
+        미처리 행 목록의 변경 여부를 싸게 확인하기 위한 토큰을 계산합니다.
 
-                # A열에 텍스트가 있고, H열이 비어있거나 "완료"가 아닌 경우
-                if text.strip() and status != "완료":
-                    unprocessed.append((idx, text))
+        read_unprocessed_events와 같은 방식으로 고른 미처리 행의
+        (행 번호, 텍스트, 상태)를 해시합니다.
 
-            print(f"처리 대기 중인 이벤트: {len(unprocessed)}개")
-            return unprocessed
+        Returns:
+            tuple: (토큰, 미처리 행 수)
+        """
+        digest = hashlib.sha1()
+        pending = self._read_pending("sheets.poll")
+        for row_number, text, status in pending:
+            digest.update(f"{row_number}\x1f{text}\x1f{status}\n".encode("utf-8"))
+        return digest.hexdigest(), len(pending)
 
-        except Exception as e:
-            print(f"시트 읽기 오류: {e}")
-            return []
+    def iter_unprocessed_events(self, page_size: int = SHEETS_PAGE_ROWS):
+        """
+        처리되지 않은 이벤트를 page_size행 범위씩 읽어 페이지마다 [(row_number, text), ...]로 내보냅니다.
+
+        다음 페이지는 백그라운드 스레드에서 미리 읽으므로 호출한 쪽이 현재 페이지를 처리하는 동안
+        다음 페이지 읽기가 함께 진행되고, 메모리에는 전체 미처리 행 대신 몇 페이지만 남습니다.
+        미처리 행이 없는 페이지는 내보내지 않습니다.
+
+        Args:
+            page_size: 한 번에 읽을 행 범위 크기
+        """
+        pages = (
+            [(row_number, text) for row_number, text, _ in page]
+            for page in self._pending_pages("sheets.read", page_size)
+        )
+        yield from _prefetch(pages)
+
+    def _read_pending(self, metric: str) -> list:
+        """미처리 행 전체를 한 번의 batchGet으로 읽어 [(row_number, text, status), ...] 반환"""
+        return [row for page in self._pending_pages(metric) for row in page]
+
+    def _pending_pages(self, metric: str, page_size: int = 0):
+        """
+        미처리 행을 페이지마다 [(row_number, text, status), ...]로 내보내고 읽기 시작 행을 갱신합니다.
+
+        전체 시트 대신 A열(원본 텍스트)과 H열(처리 상태)만, 이미 처리가 끝난 마지막 행의 창(바로 위
+        SHEETS_CURSOR_WINDOW행)부터 page_size행씩(0이면 끝까지 한 번에) batchGet으로 읽습니다.
+        창의 텍스트가 기록과 다르면 위쪽에 행이 삽입/삭제된 것이므로 처음부터 다시 읽습니다.
+        """
+        # 버퍼에 남은 상태를 먼저 반영해야 방금 처리한 행을 다시 읽지 않음
+        self.writes.flush()
+
+        mark, window, expected = read_cursor.get(self.cursor_key)
+        start = max(mark - window + 1, 1) if mark > 1 else 1
+        rows, last = self._read_page(metric, start, page_size)
+        if mark > 1:
+            texts = [text for row_number, text, _ in rows if row_number <= mark]
+            if len(texts) != window or fingerprint("\x1f".join(texts)) != expected:
+                metrics.incr("sheets.full_scans")
+                emit("sheets", "warning", f"♻️  행 {mark} 위쪽이 바뀌어 시트를 처음부터 다시 읽습니다.", start=mark)
+                start = 1
+                rows, last = self._read_page(metric, start, page_size)
+
+        all_done = True  # 지금까지 읽은 행이 모두 처리가 끝났는지
+        tail = []        # 직전 페이지 끝의 행 (페이지 경계에 걸친 창 계산용)
+        while True:
+            metrics.incr("sheets.rows_read", len(rows))
+            pending = [row for row in rows if row[0] > 1 and is_pending(row[1], row[2])]
+            self.read_statuses.update({row_number: status for row_number, _, status in pending})
+
+            # 첫 미처리 행 바로 위(없으면 마지막 행)까지는 모두 처리가 끝남
+            if all_done:
+                done = [row for row in rows if not pending or row[0] < pending[0][0]]
+                if done:
+                    end = done[-1][0]
+                    texts = [
+                        text for row_number, text, _ in tail + rows if end - SHEETS_CURSOR_WINDOW < row_number <= end
+                    ]
+                    read_cursor.set(self.cursor_key, end, texts)
+                all_done = not pending
+
+            if pending:
+                yield pending
+            if last:
+                return
+            tail = (tail + rows)[-SHEETS_CURSOR_WINDOW:]
+            start += page_size
+            rows, last = self._read_page(metric, start, page_size)
+
+    def _read_page(self, metric: str, start: int, page_size: int = 0) -> tuple:
+        """
+        start행부터 page_size행(0이면 끝까지)의 A열과 H열을 읽습니다.
+
+        범위를 시트 격자 밖으로 지정하면 요청이 실패하므로 격자 안의 페이지만 끝 행을 지정하고,
+        격자의 마지막 페이지는 끝을 열어 두어(A{start}:A) 캐시한 격자 행 수(SHEETS_HANDLE_TTL 동안 유지)
+        이후에 추가된 행까지 읽습니다. start가 캐시한 격자 밖이면 시트를 다시 열어 격자 행 수를 확인합니다.
+
+        Returns:
+            tuple: ([(row_number, text, status), ...], 마지막 페이지 여부)
+        """
+        end = ""
+        if page_size:
+            grid_rows = self.sheet.get().row_count
+            if start > grid_rows:
+                self.sheet.invalidate()
+                grid_rows = self.sheet.get().row_count
+                if start > grid_rows:
+                    return [], True
+            if start + page_size - 1 < grid_rows:
+                end = start + page_size - 1
+
+        texts, statuses = self.sheet.call(metric, "batch_get", [f"A{start}:A{end}", f"H{start}:H{end}"])
+        rows = []
+        for offset in range(max(len(texts), len(statuses))):
+            text_row = texts[offset] if offset < len(texts) else []
+            status_row = statuses[offset] if offset < len(statuses) else []
+            rows.append((start + offset, text_row[0] if text_row else "", status_row[0] if status_row else ""))
+        return rows, end == ""
+
+    def read_row_text(self, row_number: int) -> str:
+        """row_number행의 A열(원본 텍스트) 값 (빈 칸이면 빈 문자열)"""
+        values = self.sheet.call("sheets.read", "batch_get", [f"A{row_number}"])[0]
+        return values[0][0] if values and values[0] else ""
 
     def write_parsed_event(self, row_number: int, event_info: dict):
         """
-        파싱된 이벤트 정보를 시트에 작성합니다.
+        파싱된 이벤트 정보를 시트에 작성합니다. (쓰기 버퍼를 거쳐 반영)
 
         Args:
             row_number: 작성할 행 번호
             event_info: 파싱된 이벤트 정보 딕셔너리
         """
         try:
-            worksheet = self.get_sheet()
-
             # B~G열에 파싱 결과 작성
-            updates = [
-                {
-                    "range": f"B{row_number}",
-                    "values": [[event_info.get("title", "")]]
-                },
-                {
-                    "range": f"C{row_number}",
-                    "values": [[event_info.get("date", "")]]
-                },
-                {
-                    "range": f"D{row_number}",
-                    "values": [[event_info.get("time", "")]]
-                },
-                {
-                    "range": f"E{row_number}",
-                    "values": [[event_info.get("location", "")]]
-                },
-                {
-                    "range": f"F{row_number}",
-                    "values": [[event_info.get("description", "")]]
-                },
-                {
-                    "range": f"G{row_number}",
-                    "values": [[event_info.get("notes", "")]]
-                }
-            ]
-
-            worksheet.batch_update(updates)
-            print(f"행 {row_number}에 파싱 결과 작성 완료")
+            self.writes.stage({row_number: _result_cells(event_info)})
+            emit("sheets", "done", f"행 {row_number}에 파싱 결과 작성 예약", row=row_number)
 
         except Exception as e:
-            print(f"시트 작성 오류: {e}")
+            emit("sheets", "error", f"시트 작성 오류: {e}", row=row_number, error=str(e))
+
+    def write_parsed_events(self, items: list, status: str = STATUS_PARSED):
+        """
+        여러 행의 파싱 결과와 처리 상태를 작성합니다. (쓰기 버퍼를 거쳐 batchUpdate 한 번으로 반영)
+
+        Args:
+            items: [(row_number, event_info), ...] 형태의 리스트
+            status: H열에 함께 기록할 처리 상태
+        """
+        # 행마다 B~H열 작성
+        self.writes.stage({
+            row_number: {**_result_cells(event_info), STATUS_COLUMN: status}
+            for row_number, event_info in items
+        })
+        if items:
+            emit("sheets", "done", f"{len(items)}개 행에 파싱 결과 작성 예약", count=len(items))
+
+    def mark_rows(self, row_numbers: list, status: str):
+        """
+        여러 행의 처리 상태(H열)를 작성합니다. (쓰기 버퍼를 거쳐 반영)
+
+        Args:
+            row_numbers: 행 번호 리스트
+            status: 기록할 처리 상태
+        """
+        self.mark_statuses({row_number: status for row_number in row_numbers})
+
+    def mark_statuses(self, statuses: dict):
+        """
+        행마다 다른 처리 상태(H열)를 작성합니다. (쓰기 버퍼를 거쳐 반영)
+
+        오류 상태에는 행을 읽을 때의 상태를 기준으로 실패 횟수를 붙이고, 최대 횟수째 실패이면
+        끝난 행(건너뜀)으로 기록합니다(row_status.count_failures).
+
+        Args:
+            statuses: {row_number: status} 형태의 딕셔너리
+        """
+        previous = {row_number: self.read_statuses.get(row_number, "") for row_number in statuses}
+        statuses = count_failures(statuses, previous)
+        self.writes.stage({
+            row_number: {STATUS_COLUMN: status} for row_number, status in statuses.items()
+        })
 
     def mark_as_processed(self, row_number: int):
         """
-        처리 완료 표시 (H열에 "완료" 작성)
+        파싱 완료 표시 (H열에 "파싱 완료" 작성, 쓰기 버퍼를 거쳐 반영)
 
         Args:
             row_number: 행 번호
         """
         try:
-            worksheet = self.get_sheet()
-            worksheet.update_cell(row_number, 8, "완료")
-            print(f"행 {row_number} 처리 완료 표시")
+            self.writes.stage({row_number: {STATUS_COLUMN: STATUS_PARSED}})
         except Exception as e:
-            print(f"상태 업데이트 오류: {e}")
+            emit("sheets", "error", f"상태 업데이트 오류: {e}", row=row_number, error=str(e))
 
     def mark_as_calendar_synced(self, row_number: int):
         """
-        캘린더 동기화 완료 표시 (H열에 "캘린더 등록 완료" 작성)
+        캘린더 동기화 완료 표시 (H열에 "캘린더 등록 완료" 작성, 쓰기 버퍼를 거쳐 반영)
+
+        반영 전이면 같은 행의 "파싱 완료"를 덮어써 H열은 한 번만 작성됩니다.
 
         Args:
             row_number: 행 번호
         """
         try:
-            worksheet = self.get_sheet()
-            worksheet.update_cell(row_number, 8, "캘린더 등록 완료")
-            print(f"행 {row_number} 캘린더 등록 완료 표시")
+            self.writes.stage({row_number: {STATUS_COLUMN: STATUS_SYNCED}})
         except Exception as e:
-            print(f"상태 업데이트 오류: {e}")
+            emit("sheets", "error", f"상태 업데이트 오류: {e}", row=row_number, error=str(e))
+
+    def migrate_statuses(self) -> int:
+        """
+        이전 버전의 처리 상태("완료" 등)를 새 상태 문구로 바꿉니다. (시트 전체의 A/H열을 한 번 읽음)
+
+        Returns:
+            int: 바꾼 행 수
+        """
+        statuses = {}
+        rows, _ = self._read_page("sheets.read", 2)
+        for row_number, _, status in rows:
+            migrated = migrate_status(status)
+            if migrated:
+                statuses[row_number] = migrated
+        self.mark_statuses(statuses)
+        self.writes.flush()
+        return len(statuses)
+
+    def flush(self):
+        """쓰기 버퍼에 대기 중인 쓰기를 바로 반영"""
+        self.writes.flush()
 
     def setup_sheet_headers(self):
         """
         시트의 헤더를 설정합니다. (최초 1회 실행)
         """
         try:
-            worksheet = self.get_sheet()
             headers = [
                 "원본 텍스트",
                 "제목",
@@ -182,12 +751,17 @@ class GoogleSheetsHandler:
                 "메모",
                 "처리 상태"
             ]
-            worksheet.update("A1:H1", [headers])
+            self.sheet.call("sheets.write", "update", "A1:H1", [headers])
             print("시트 헤더 설정 완료")
         except Exception as e:
             print(f"헤더 설정 오류: {e}")
 
 
+def _result_cells(event_info: dict) -> dict:
+    """파싱 결과를 B~G열 {열 번호: 값}으로 변환"""
+    return {column: event_info.get(field, "") for field, column in _COLUMNS.items()}
+
+
 if __name__ == "__main__":
     # 테스트 코드
     handler = GoogleSheetsHandler()
@@ -2,11 +2,53 @@
 LangGraph 멀티에이전트 이벤트 처리 - 메인 실행 스크립트
 """
 import os
-from workflow import create_event_processing_workflow
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from workflow import (
+    create_event_processing_workflow,
+    create_parallel_workflow,
+    create_async_workflow,
+    create_batched_workflow,
+    ChunkedWorkflowRunner,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_IO_WORKERS,
+    recursion_limit_for,
+)
+from google_sheets_handler import GoogleSheetsHandler, flush_all
+from progress import stream_run, astream_run
+from work_queue import work_queue
+from metrics import metrics
+from parse_cache import parse_cache
+from sender_templates import template_store
+from dedup import dedup_index
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# 실행 체크포인트 저장 파일 (--resume으로 재개할 때 사용)
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", ".cache/checkpoints.sqlite3")
+
+# 실행 지표 출력 파일 (Prometheus textfile은 지정한 경우에만 작성)
+METRICS_JSON = os.getenv("METRICS_JSON", ".cache/metrics.json")
+PROMETHEUS_TEXTFILE = os.getenv("PROMETHEUS_TEXTFILE", "")
+
+# 데몬 모드에서 시트 변경을 확인하는 간격 (초)
+DAEMON_INTERVAL = int(os.getenv("DAEMON_INTERVAL", "60"))
+
+# 데몬 모드에서 실패한 행을 다시 처리하기까지의 최대 대기 시간 (초)
+DAEMON_RETRY_MAX = int(os.getenv("DAEMON_RETRY_MAX", "3600"))
+
 # LangSmith 설정 (선택사항 - 디버깅 및 모니터링용)
 if os.getenv("LANGCHAIN_TRACING_V2") == "true":
     print("🔍 LangSmith 추적 활성화됨")
@@ -14,65 +56,456 @@ if os.getenv("LANGCHAIN_TRACING_V2") == "true":
     print(f"   추적 URL: https://smith.langchain.com/\n")
 
 
-def main():
-    """메인 실행 함수"""
-    print("="*60)
-    print("🤖 LangGraph 멀티에이전트 이벤트 처리 시작")
-    print("="*60)
+def parse_args(argv=None):
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="LangGraph 멀티에이전트 이벤트 처리")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--parallel", action="store_true",
+        help="행 단위 병렬(map-reduce) 모드로 실행"
+    )
+    mode.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="비동기 병렬 모드로 실행 (AsyncOpenAI + 스레드 풀)"
+    )
+    mode.add_argument(
+        "--batched", action="store_true",
+        help="단계별 배치 모드로 실행 (파싱/시트 작성/캘린더 등록을 K개씩 일괄 처리)"
+    )
+    mode.add_argument(
+        "--chunked", action="store_true",
+        help="행 단위 서브그래프를 청크로 반복 실행 (행 수 제한 없음)"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+        help=f"병렬/비동기/청크 모드에서 동시에 처리할 최대 행 수 (기본값: {DEFAULT_MAX_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"배치 모드에서 단계마다 처리할 행 수 (기본값: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help=f"청크 모드에서 한 번에 처리할 행 수 (기본값: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+        help=f"청크 모드에서 시트를 한 번에 읽는 행 범위 크기 (기본값: {DEFAULT_PAGE_SIZE})"
+    )
+    parser.add_argument(
+        "--metrics-json", default=METRICS_JSON,
+        help=f"노드/외부 호출 지연 시간 요약 JSON 경로 (기본값: {METRICS_JSON})"
+    )
+    parser.add_argument(
+        "--prometheus-textfile", default=PROMETHEUS_TEXTFILE,
+        help="node exporter textfile collector용 .prom 파일 경로"
+    )
+    parser.add_argument(
+        "--json-events", action="store_true",
+        help="진행 이벤트를 한 줄에 하나씩 JSON으로 출력 (다른 프로그램에서 읽을 때 사용)"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="종료하지 않고 시트를 주기적으로 확인하며 새 행이 있을 때만 처리"
+    )
+    parser.add_argument(
+        "--interval", type=int, default=DAEMON_INTERVAL,
+        help=f"데몬 모드에서 시트 변경을 확인하는 간격(초) (기본값: {DAEMON_INTERVAL})"
+    )
+    parser.add_argument(
+        "--migrate-statuses", action="store_true",
+        help="시트의 이전 버전 처리 상태(\"완료\" 등)를 새 상태 문구로 바꾸고 종료"
+    )
+    parser.add_argument(
+        "--resume", metavar="THREAD_ID",
+        help="중단된 실행을 마지막 체크포인트부터 재개 (처음 실행과 같은 모드 옵션 지정)"
+    )
+    return parser.parse_args(argv)
+
+
+def create_app(args, checkpointer=None, executor=None):
+    """실행 모드에 맞는 워크플로우 생성 (executor: 비동기 모드의 블로킹 호출용 스레드 풀)"""
+    if args.parallel:
+        print(f"⚡ 병렬 모드 (최대 동시 처리: {args.max_concurrency}개)")
+        return create_parallel_workflow(checkpointer=checkpointer)
+    elif args.use_async:
+        print(f"⚡ 비동기 모드 (최대 동시 처리: {args.max_concurrency}개)")
+        return create_async_workflow(checkpointer=checkpointer, executor=executor)
+    elif args.batched:
+        print(f"📦 배치 모드 (배치 크기: {args.batch_size}개)")
+        return create_batched_workflow(batch_size=args.batch_size, checkpointer=checkpointer)
+    elif args.chunked:
+        print(f"📦 청크 모드 (청크 크기: {args.chunk_size}개, 읽기 페이지: {args.page_size}행)")
+        return ChunkedWorkflowRunner(chunk_size=args.chunk_size, page_size=args.page_size)
+    else:
+        return create_event_processing_workflow(checkpointer=checkpointer)
+
+
+def print_event(event: dict):
+    """진행 이벤트를 콘솔에 출력"""
+    if event.get("status") == "started":
+        print()
+    print(event["message"])
+
+
+def print_json_event(event: dict, stream=None):
+    """진행 이벤트를 JSON 한 줄로 출력 (stream: 출력할 스트림, 기본값 표준 출력)"""
+    print(json.dumps(event, ensure_ascii=False, default=str), file=stream or sys.stdout, flush=True)
+
+
+def _consume(stream, on_event) -> dict:
+    """스트림의 진행 이벤트를 on_event로 넘기고 최종 상태를 반환"""
+    result = None
+    for kind, payload in stream:
+        if kind == "progress":
+            on_event(payload)
+        else:
+            result = payload
+    return result
+
+
+@contextmanager
+def open_runner(args):
+    """
+    워크플로우를 한 번 컴파일하고, 여러 번 실행할 수 있는 함수를 제공합니다.
+
+    SQLite 체크포인터와 워크플로우(에이전트의 API 클라이언트 포함)를 with 블록
+    동안 유지하므로, 데몬 모드에서 실행할 때마다 인증과 컴파일을 반복하지 않습니다.
+
+    Yields:
+        run(initial_state, config, on_event) -> 최종 상태
+    """
+    if args.chunked:
+        # 청크 모드는 그래프 밖 드라이버이므로 체크포인트를 사용하지 않음
+        runner = create_app(args)
+        yield lambda initial_state, config, on_event: _consume(
+            runner.stream(initial_state, config=config), on_event
+        )
+        return
 
-    # 워크플로우 생성
-    app = create_event_processing_workflow()
+    os.makedirs(os.path.dirname(CHECKPOINT_DB) or ".", exist_ok=True)
 
-    # 초기 상태
-    initial_state = {
-        "unprocessed_events": [],
+    if args.use_async:
+        # 체크포인터 연결이 이벤트 루프에 묶이므로 실행 간에 같은 루프를 유지
+        loop = asyncio.new_event_loop()
+        saver = AsyncSqliteSaver.from_conn_string(CHECKPOINT_DB)
+        checkpointer = loop.run_until_complete(saver.__aenter__())
+        # 시트/캘린더 호출용 스레드 풀도 러너와 함께 열고 닫음
+        executor = ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS, thread_name_prefix="io")
+        try:
+            app = create_app(args, checkpointer, executor)
+
+            async def run(initial_state, config, on_event):
+                result = None
+                async for kind, payload in astream_run(app, initial_state, config, durability="sync"):
+                    if kind == "progress":
+                        on_event(payload)
+                    else:
+                        result = payload
+                return result
+
+            yield lambda initial_state, config, on_event: loop.run_until_complete(
+                run(initial_state, config, on_event)
+            )
+        finally:
+            executor.shutdown(wait=True)
+            loop.run_until_complete(saver.__aexit__(None, None, None))
+            loop.close()
+        return
+
+    with SqliteSaver.from_conn_string(CHECKPOINT_DB) as checkpointer:
+        app = create_app(args, checkpointer)
+        yield lambda initial_state, config, on_event: _consume(
+            stream_run(app, initial_state, config, durability="sync"), on_event
+        )
+
+
+def run_workflow(args, initial_state, config: dict, on_event=print_event) -> dict:
+    """
+    SQLite 체크포인터와 함께 워크플로우를 스트리밍 모드로 실행합니다.
+
+    노드가 끝날 때마다 체크포인트가 동기적으로 기록되므로, 중간에 종료되어도
+    같은 thread_id로 재개하면 마지막으로 완료된 노드 다음부터 이어서 처리합니다.
+    (initial_state가 None이면 재개)
+    진행 이벤트는 발생하는 즉시 on_event로 전달됩니다.
+    """
+    with open_runner(args) as run:
+        return run(initial_state, config, on_event)
+
+
+def new_initial_state() -> dict:
+    """새 실행의 초기 상태"""
+    return {
+        "queue_id": None,
+        "cursor": 0,
         "current_event": None,
         "processed_events": [],
         "messages": [],
         "errors": [],
+        "error_count": 0,
         "total_events": 0,
         "processed_count": 0,
         "success_count": 0,
         "failed_count": 0,
     }
 
+
+def make_config(args, thread_id: str, pending: int = 0) -> dict:
+    """
+    실행 설정 (recursion_limit, 동시 처리 수, 체크포인트 thread_id)
+
+    순차/배치 모드는 그래프 깊이가 행(배치) 수에 비례하므로 recursion_limit을
+    미처리 행 수(pending)에 맞춰 정합니다.
+    """
+    batch_size = args.batch_size if args.batched else 1
+    return {
+        "recursion_limit": recursion_limit_for(pending, batch_size),
+        "max_concurrency": args.max_concurrency,
+        "configurable": {"thread_id": thread_id},
+    }
+
+
+def count_pending(args) -> int:
+    """
+    recursion_limit을 정하기 위한 미처리 행 수 (그래프 깊이가 행 수에 비례하는 순차/배치 모드만)
+
+    재개할 때도 남은 작업 큐의 행은 시트에서 아직 미처리 상태이므로 시트의 미처리 행 수가 상한이 됩니다.
+    """
+    if args.parallel or args.use_async or args.chunked:
+        return 0
+    try:
+        _, pending = GoogleSheetsHandler().get_change_token()
+        return pending
+    except Exception as e:
+        print(f"⚠️  미처리 행 수 확인 실패 (기본 recursion_limit 사용): {e}")
+        return 0
+
+
+def print_summary(result: dict):
+    """처리 결과 출력"""
+    print("\n" + "="*60)
+    print("✅ 전체 처리 완료!")
+    print("="*60)
+
+    total = result.get('processed_count', 0)
+    success = result.get('success_count', 0)
+    failed = result.get('failed_count', 0)
+
+    print(f"\n📊 처리 결과:")
+    print(f"  - 총 처리: {total}개")
+    print(f"  - 성공: {success}개")
+    print(f"  - 실패: {failed}개")
+
+    if parse_cache.enabled:
+        cache_stats = parse_cache.stats()
+        print(f"  - 파싱 캐시: 적중 {cache_stats['hits']}개, 미스 {cache_stats['misses']}개 "
+              f"(저장 {cache_stats['entries']}개)")
+
+    if template_store.enabled:
+        template_stats = template_store.stats()
+        print(f"  - 발신자 템플릿: 로컬 파싱 {template_stats['hits']}개, "
+              f"LLM 검증 {template_stats['checks']}회 (불일치 {template_stats['mismatches']}회), "
+              f"규칙 {template_stats['compiled']}/{template_stats['templates']}개")
+
+    if dedup_index.enabled:
+        dedup_stats = dedup_index.stats()
+        if dedup_stats["text_duplicates"] or dedup_stats["event_duplicates"]:
+            print(f"  - 중복: 문자 {dedup_stats['text_duplicates']}개 (파싱 생략), "
+                  f"일정 {dedup_stats['event_duplicates']}개 (캘린더 등록 생략)")
+
+    run_metrics = metrics.summary()
+    tokens = run_metrics["tokens"].values()
+    if tokens:
+        prompt = sum(counts["prompt"] for counts in tokens)
+        cached = sum(counts["cached"] for counts in tokens)
+        completion = sum(counts["completion"] for counts in tokens)
+        print(f"  - LLM 토큰: 입력 {prompt}개 (프롬프트 캐시 적중 {cached}개), 출력 {completion}개")
+
+    condensed = run_metrics["condensed"]
+    if condensed["rows"]:
+        print(f"  - 입력 축약: {condensed['tokens_before']} → {condensed['tokens_after']} 토큰 "
+              f"({condensed['tokens_before'] - condensed['tokens_after']}개 절약)")
+
+    counters = run_metrics["counters"]
+    if counters.get("sheets.flushes"):
+        print(f"  - 시트 쓰기: {int(counters.get('sheets.staged_rows', 0))}건을 "
+              f"batchUpdate {int(counters['sheets.flushes'])}회로 반영")
+    for api in ("openai", "sheets", "calendar"):
+        retries = counters.get(f"ratelimit.{api}.retries", 0)
+        waited = counters.get(f"ratelimit.{api}.wait_seconds", 0)
+        if retries or waited:
+            print(f"  - {api} 속도 제한: 재시도 {int(retries)}회, 대기 {waited:.1f}초")
+
+    # 에러 로그
+    errors = result.get('errors', [])
+    error_count = result.get('error_count', len(errors))
+    if error_count:
+        print(f"\n❌ 에러 {error_count}개 (최근 {len(errors)}개 표시):")
+        for error in errors:
+            print(f"  - {error.get('agent', 'Unknown')}: {error.get('error', 'Unknown error')}")
+
+    # 메시지 로그
+    messages = result.get('messages', [])
+    if messages:
+        print(f"\n📝 메시지 로그:")
+        for msg in messages[-10:]:  # 마지막 10개만 출력
+            print(f"  {msg}")
+
+
+def run_daemon(args, on_event):
+    """
+    시트를 주기적으로 확인하며 새 작업이 있을 때만 워크플로우를 실행합니다.
+
+    워크플로우와 API 클라이언트는 한 번만 만들어 재사용하고, 매 주기에는
+    A/H열만 읽어 계산한 변경 토큰(get_change_token)을 직전 실행 후의 값과
+    비교합니다. 실행이 끝난 뒤 다시 처리할 행(오류 상태 등)이 남지 않았을 때만 새 토큰을
+    기준값으로 삼으므로, 오류/등록 실패로 남은 행은 시트가 바뀌지 않아도 다시 처리합니다.
+    건너뜀/중복으로 끝난 행은 다시 처리할 행이 아니므로 실패로 보지 않습니다.
+    같은 행이 계속 실패하면 재시도 간격을 확인 간격의 2배씩 늘립니다
+    (최대 DAEMON_RETRY_MAX초, 시트가 바뀌면 바로 실행).
+    """
+    print(f"🔁 데몬 모드 (확인 간격: {args.interval}초, 종료: Ctrl+C)")
+    handler = GoogleSheetsHandler()
+    last_token = None    # 오류 없이 끝난 실행 직후의 토큰
+    failed_token = None  # 오류가 남은 실행 직후의 토큰
+    failures = 0
+    retry_at = 0.0
+
+    with open_runner(args) as run:
+        while True:
+            try:
+                token, pending = handler.get_change_token()
+            except Exception as e:
+                print(f"⚠️  시트 변경 확인 실패: {e}")
+                token, pending = last_token, 0
+
+            # 실패한 행만 남은 그대로이면 재시도 시각까지 기다림
+            due = token != failed_token or time.monotonic() >= retry_at
+            if pending and token != last_token and due:
+                thread_id = uuid.uuid4().hex
+                print(f"\n🆕 미처리 행 {pending}개 감지 (thread_id={thread_id})")
+                metrics.reset()
+                result = {}
+                succeeded = False
+                try:
+                    result = run(new_initial_state(), make_config(args, thread_id, pending), on_event)
+                    work_queue.release(result.get("queue_id"))
+                    flush_all()
+                    print_summary(result)
+                    succeeded = True
+                except Exception as e:
+                    print(f"\n❌ 워크플로우 실행 중 오류 발생: {e}")
+                finally:
+                    export_metrics(args, result.get("processed_count", 0))
+
+                # 처리하며 바뀐 H열 기준의 토큰 (건너뜀/중복으로 끝난 행은 빠지므로
+                # 남은 행은 오류 상태이거나 오류로 처리하지 못한 행)
+                try:
+                    token, remaining = handler.get_change_token()
+                    succeeded = succeeded and not remaining
+                except Exception as e:
+                    print(f"⚠️  시트 변경 확인 실패: {e}")
+                    token, succeeded = None, False
+
+                if succeeded:
+                    last_token, failed_token, failures = token, None, 0
+                else:
+                    failures += 1
+                    failed_token = token
+                    delay = min(args.interval * 2 ** (failures - 1), DAEMON_RETRY_MAX)
+                    retry_at = time.monotonic() + delay
+                    print(f"🔁 실패한 행은 {delay}초 뒤 다시 처리합니다 (연속 실패 {failures}회)")
+
+            time.sleep(args.interval)
+
+
+def main(argv=None):
+    """메인 실행 함수"""
+    args = parse_args(argv)
+
+    if args.json_events:
+        # 표준 출력에는 진행 이벤트 JSON만 쓰고, 사람이 읽는 출력(요약, 인증/재시도 안내 등)은 표준 오류로 보냄
+        json_out = sys.stdout
+        with redirect_stdout(sys.stderr):
+            run_main(args, lambda event: print_json_event(event, json_out))
+    else:
+        run_main(args, print_event)
+
+
+def run_main(args, on_event):
+    """실행 모드에 맞게 워크플로우(또는 데몬/상태 변환)를 실행"""
+    print("="*60)
+    print("🤖 LangGraph 멀티에이전트 이벤트 처리 시작")
+    print("="*60)
+
+    if args.resume and args.chunked:
+        print("❌ 청크 모드는 --resume을 지원하지 않습니다.")
+        return
+
+    if args.migrate_statuses:
+        migrated = GoogleSheetsHandler().migrate_statuses()
+        print(f"✅ 처리 상태 {migrated}개 행을 새 상태 문구로 변경")
+        return
+
+    if args.daemon:
+        if args.resume:
+            print("❌ 데몬 모드는 --resume을 지원하지 않습니다.")
+            return
+        try:
+            run_daemon(args, on_event)
+        except KeyboardInterrupt:
+            print("\n🛑 데몬 종료")
+        return
+
+    # 초기 상태 (재개 시에는 체크포인트의 상태를 사용)
+    if args.resume:
+        thread_id = args.resume
+        initial_state = None
+        print(f"⏯️  실행 재개: thread_id={thread_id}")
+    else:
+        thread_id = uuid.uuid4().hex
+        initial_state = new_initial_state()
+        if not args.chunked:
+            print(f"🧾 thread_id={thread_id} (중단 시 --resume {thread_id} 로 재개)")
+
+    result = {}
+    metrics.reset()
+
     try:
         # 워크플로우 실행 (recursion_limit 설정)
-        result = app.invoke(initial_state, config={"recursion_limit": 100})
+        config = make_config(args, thread_id, count_pending(args))
+        result = run_workflow(args, initial_state, config, on_event)
+
+        # 처리가 끝난 작업 큐 정리
+        work_queue.release(result.get("queue_id"))
+
+        # 쓰기 버퍼에 남은 시트 쓰기 반영
+        flush_all()
 
         # 결과 출력
-        print("\n" + "="*60)
-        print("✅ 전체 처리 완료!")
-        print("="*60)
-
-        total = len(result.get('processed_events', []))
-        success = result.get('success_count', 0)
-        failed = result.get('failed_count', 0)
-
-        print(f"\n📊 처리 결과:")
-        print(f"  - 총 처리: {total}개")
-        print(f"  - 성공: {success}개")
-        print(f"  - 실패: {failed}개")
-
-        # 에러 로그
-        errors = result.get('errors', [])
-        if errors:
-            print(f"\n❌ 에러 {len(errors)}개:")
-            for error in errors:
-                print(f"  - {error.get('agent', 'Unknown')}: {error.get('error', 'Unknown error')}")
-
-        # 메시지 로그
-        messages = result.get('messages', [])
-        if messages:
-            print(f"\n📝 메시지 로그:")
-            for msg in messages[-10:]:  # 마지막 10개만 출력
-                print(f"  {msg}")
+        print_summary(result)
 
     except Exception as e:
         print(f"\n❌ 워크플로우 실행 중 오류 발생: {e}")
         import traceback
         traceback.print_exc()
 
+    finally:
+        export_metrics(args, result.get("processed_count", 0))
+
+
+def export_metrics(args, rows: int):
+    """실행 지표를 JSON 요약과 Prometheus textfile로 내보내기"""
+    try:
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json, rows=rows)
+            print(f"\n⏱️  실행 지표: {args.metrics_json}")
+        if args.prometheus_textfile:
+            metrics.write_prometheus(args.prometheus_textfile, rows=rows)
+            print(f"⏱️  Prometheus 지표: {args.prometheus_textfile}")
+    except Exception as e:
+        print(f"⚠️  실행 지표 저장 실패: {e}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,255 @@
+"""
+실행 지표 수집 모듈
+노드별/외부 API 호출별 지연 시간, 처리량, 동시 실행 수, LLM 토큰 사용량, 누적 카운터를 기록하고
+JSON 요약과 Prometheus textfile 형식으로 내보냅니다.
+"""
+import os
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# 지표 키마다 보관할 최대 표본 수 (초과 시 저수지 표본 추출로 대체)
+MAX_SAMPLES = int(os.getenv("METRICS_MAX_SAMPLES", "10000"))
+
+# Prometheus 지표 이름 접두사
+PROMETHEUS_PREFIX = "event_agent"
+
+
+class _Series:
+    """한 지표 키의 지연 시간 표본과 누적값"""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+        # 저수지 표본 추출: 메모리는 MAX_SAMPLES로 제한하면서 분포는 유지
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.count)
+            if index < MAX_SAMPLES:
+                self.samples[index] = seconds
+
+    def quantiles(self) -> dict:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        def pick(q):
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99)}
+
+
+class Metrics:
+    """
+    지연 시간/동시 실행 수 수집기
+
+    kind는 "node"(그래프 노드) 또는 "call"(외부 API 호출)이고,
+    name은 노드 이름 또는 호출 이름입니다 (예: "openai.chat").
+    기록 비용은 perf_counter 두 번과 잠금 한 번 수준입니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = defaultdict(_Series)
+        self._inflight = defaultdict(int)
+        self._max_inflight = defaultdict(int)
+        self._tokens = defaultdict(_token_counts)
+        self._condensed = {"rows": 0, "tokens_before": 0, "tokens_after": 0, "guarded": 0}
+        self._counters = defaultdict(float)
+        self._started = time.perf_counter()
+
+    def reset(self):
+        """모든 지표 초기화"""
+        with self._lock:
+            self._series.clear()
+            self._inflight.clear()
+            self._max_inflight.clear()
+            self._tokens.clear()
+            for key in self._condensed:
+                self._condensed[key] = 0
+            self._counters.clear()
+            self._started = time.perf_counter()
+
+    def count_tokens(self, name: str, prompt: int, completion: int, cached: int = 0):
+        """
+        LLM 호출 한 번의 토큰 사용량 누적
+
+        Args:
+            name: 호출 이름 (예: "openai.chat")
+            prompt: 입력 토큰 수
+            completion: 출력 토큰 수
+            cached: 입력 중 제공자 프롬프트 캐시에서 처리된 토큰 수
+        """
+        with self._lock:
+            counts = self._tokens[name]
+            counts["calls"] += 1
+            counts["prompt"] += prompt
+            counts["completion"] += completion
+            counts["cached"] += cached
+
+    def incr(self, name: str, amount: float = 1):
+        """
+        누적 카운터 증가
+
+        Args:
+            name: 카운터 이름 (예: "ratelimit.openai.retries")
+            amount: 증가량
+        """
+        with self._lock:
+            self._counters[name] += amount
+
+    @contextmanager
+    def timer(self, kind: str, name: str):
+        """with 블록의 실행 시간을 기록하고 동시 실행 수를 추적"""
+        key = (kind, name)
+        with self._lock:
+            self._inflight[key] += 1
+            if self._inflight[key] > self._max_inflight[key]:
+                self._max_inflight[key] = self._inflight[key]
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._inflight[key] -= 1
+                self._series[key].add(elapsed)
+
+    def count_condensed(self, tokens_before: int, tokens_after: int, guarded: bool = False):
+        """
+        입력 축약 한 번의 결과 누적
+
+        Args:
+            tokens_before: 축약 전 토큰 추정치
+            tokens_after: 축약 후 토큰 추정치
+            guarded: 정확도 보호로 원문을 사용했는지
+        """
+        with self._lock:
+            self._condensed["rows"] += 1
+            self._condensed["tokens_before"] += tokens_before
+            self._condensed["tokens_after"] += tokens_after
+            self._condensed["guarded"] += int(guarded)
+
+    def summary(self, rows: int = 0) -> dict:
+        """
+        지표 요약
+
+        Args:
+            rows: 처리한 행 수 (처리량 계산용)
+
+        Returns:
+            dict: {"elapsed_seconds", "rows", "rows_per_second", "nodes", "calls", "tokens", "condensed", "counters"}
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self._started
+            result = {
+                "elapsed_seconds": round(elapsed, 3),
+                "rows": rows,
+                "rows_per_second": round(rows / elapsed, 3) if elapsed > 0 else 0.0,
+                "nodes": {},
+                "calls": {},
+                "tokens": {name: dict(counts) for name, counts in sorted(self._tokens.items())},
+                "condensed": dict(self._condensed),
+                "counters": {name: round(value, 6) for name, value in sorted(self._counters.items())},
+            }
+            for (kind, name), series in sorted(self._series.items()):
+                quantiles = series.quantiles()
+                result["nodes" if kind == "node" else "calls"][name] = {
+                    "count": series.count,
+                    "total_seconds": round(series.total, 6),
+                    "p50": round(quantiles["p50"], 6),
+                    "p95": round(quantiles["p95"], 6),
+                    "p99": round(quantiles["p99"], 6),
+                    "max": round(series.max, 6),
+                    "in_flight": self._inflight[(kind, name)],
+                    "max_in_flight": self._max_inflight[(kind, name)],
+                }
+        return result
+
+    def write_json(self, path: str, rows: int = 0):
+        """JSON 요약 파일 작성"""
+        _atomic_write(path, json.dumps(self.summary(rows), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path: str, rows: int = 0):
+        """
+        node exporter textfile collector용 Prometheus 텍스트 파일 작성
+
+        node exporter가 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        """
+        summary = self.summary(rows)
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_rows_total 처리한 행 수",
+            f"# TYPE {PROMETHEUS_PREFIX}_rows_total gauge",
+            f"{PROMETHEUS_PREFIX}_rows_total {summary['rows']}",
+            f"# HELP {PROMETHEUS_PREFIX}_rows_per_second 초당 처리 행 수",
+            f"# TYPE {PROMETHEUS_PREFIX}_rows_per_second gauge",
+            f"{PROMETHEUS_PREFIX}_rows_per_second {summary['rows_per_second']}",
+        ]
+
+        for section, label in (("nodes", "node"), ("calls", "call")):
+            metric = f"{PROMETHEUS_PREFIX}_{label}_duration_seconds"
+            inflight = f"{PROMETHEUS_PREFIX}_{label}_max_in_flight"
+            lines.append(f"# HELP {metric} {label} 실행 시간")
+            lines.append(f"# TYPE {metric} summary")
+            for name, stats in summary[section].items():
+                for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                    lines.append(f'{metric}{{{label}="{name}",quantile="{quantile}"}} {stats[key]}')
+                lines.append(f'{metric}_sum{{{label}="{name}"}} {stats["total_seconds"]}')
+                lines.append(f'{metric}_count{{{label}="{name}"}} {stats["count"]}')
+            lines.append(f"# HELP {inflight} {label} 최대 동시 실행 수")
+            lines.append(f"# TYPE {inflight} gauge")
+            for name, stats in summary[section].items():
+                lines.append(f'{inflight}{{{label}="{name}"}} {stats["max_in_flight"]}')
+
+        tokens = f"{PROMETHEUS_PREFIX}_llm_tokens_total"
+        lines.append(f"# HELP {tokens} LLM 토큰 사용량")
+        lines.append(f"# TYPE {tokens} counter")
+        for name, counts in summary["tokens"].items():
+            for kind in ("prompt", "completion", "cached"):
+                lines.append(f'{tokens}{{call="{name}",kind="{kind}"}} {counts[kind]}')
+
+        condensed = f"{PROMETHEUS_PREFIX}_condensed_tokens_total"
+        lines.append(f"# HELP {condensed} 입력 축약 전후 토큰 추정치")
+        lines.append(f"# TYPE {condensed} counter")
+        for kind in ("tokens_before", "tokens_after"):
+            lines.append(f'{condensed}{{kind="{kind[len("tokens_"):]}"}} {summary["condensed"][kind]}')
+
+        counters = f"{PROMETHEUS_PREFIX}_counter_total"
+        lines.append(f"# HELP {counters} 누적 카운터 (속도 제한 대기/재시도 등)")
+        lines.append(f"# TYPE {counters} counter")
+        for name, value in summary["counters"].items():
+            lines.append(f'{counters}{{name="{name}"}} {value}')
+
+        _atomic_write(path, "\n".join(lines) + "\n")
+
+
+def _token_counts() -> dict:
+    return {"calls": 0, "prompt": 0, "completion": 0, "cached": 0}
+
+
+def _atomic_write(path: str, content: str):
+    """임시 파일에 쓴 뒤 교체"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(path + ".tmp", path)
+
+
+# 프로세스 전역 지표 수집기
+metrics = Metrics()
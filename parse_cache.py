@@ -0,0 +1,160 @@
+"""
+파싱 결과 캐시
+같은 텍스트를 다시 파싱할 때 OpenAI를 호출하지 않도록 결과를 SQLite에 보관합니다.
+
+키는 정규화한 텍스트와 모델/프롬프트 버전을 합쳐 해시한 값입니다. 날짜는 키에 넣지 않으므로
+연도가 없는 텍스트는 캐시에서 꺼낼 때 EventParser가 오늘 기준으로 연도를 다시 보정합니다.
+오래 쓰지 않은 항목은 TTL과 최대 항목 수(LRU)로 제거합니다.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+# 캐시 파일 경로 (빈 문자열이면 캐시 사용 안 함)
+PARSE_CACHE_DB = os.getenv("PARSE_CACHE_DB", ".cache/parse_cache.sqlite3")
+
+# 항목 유지 기간(일)과 최대 항목 수 (0 이하면 제한 없음)
+PARSE_CACHE_TTL_DAYS = float(os.getenv("PARSE_CACHE_TTL_DAYS", "30"))
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "10000"))
+
+# 프롬프트를 바꾸면 올려서 이전 결과를 무효화
+PROMPT_VERSION = "3"
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 정규화(NFKC) 후 공백 연속을 하나로 줄인 텍스트"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+class ParseCache:
+    """텍스트 해시 → 파싱 결과 SQLite 캐시 (스레드 안전)"""
+
+    def __init__(self, path: str = PARSE_CACHE_DB,
+                 ttl_days: float = PARSE_CACHE_TTL_DAYS,
+                 max_entries: int = PARSE_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite 파일 경로 (빈 문자열이면 캐시 사용 안 함)
+            ttl_days: 마지막 사용 후 항목을 유지할 기간(일)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 제거)
+        """
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def key(self, text: str, model: str) -> str:
+        """정규화한 텍스트, 모델, 프롬프트 버전으로 만든 캐시 키 (실행 날짜와 무관)"""
+        material = "\x1f".join([PROMPT_VERSION, model, normalize_text(text)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """
+        캐시된 파싱 결과 조회
+
+        Returns:
+            dict 또는 None (없거나 만료된 경우)
+        """
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, last_used FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or self._expired(row[1], now):
+                if row is not None:
+                    conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                    self.evictions += 1
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE parse_cache SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, value: dict):
+        """
+        파싱 결과 저장 (오류 결과는 저장하지 않음)
+
+        저장은 API 호출 뒤에만 일어나므로 저장할 때마다 만료/초과 항목을 정리합니다.
+        """
+        if not self.enabled or "error" in value:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+            self._evict(conn)
+
+    def stats(self) -> dict:
+        """적중/미스/제거 횟수와 현재 항목 수"""
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                entries = self._connect().execute("SELECT COUNT(*) FROM parse_cache").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+        }
+
+    def _expired(self, last_used: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - last_used > self.ttl_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 연결을 열고 테이블 생성 및 정리 (잠금 안에서 호출)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS parse_cache_last_used ON parse_cache (last_used)"
+            )
+            self._evict(conn)
+            self._conn = conn
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection):
+        """만료된 항목과 최대 항목 수를 넘는 오래된 항목 제거"""
+        if self.ttl_seconds > 0:
+            cursor = conn.execute(
+                "DELETE FROM parse_cache WHERE last_used < ?", (time.time() - self.ttl_seconds,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+        if self.max_entries > 0:
+            cursor = conn.execute(
+                "DELETE FROM parse_cache WHERE key IN ("
+                "SELECT key FROM parse_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.evictions += max(cursor.rowcount, 0)
+
+
+# 프로세스 전역 파싱 캐시
+parse_cache = ParseCache()
@@ -0,0 +1,338 @@
+"""
+파서 백엔드 레지스트리
+ParserAgent가 사용할 파서를 "이름[:옵션]" 형식의 설정으로 골라 만듭니다.
+
+- openai: EventParser (OpenAI, "openai:gpt-4o"처럼 모델 지정 가능)
+- rules: 규칙 기반 추출기만 사용 (LLM 호출 없음)
+- replay: 실제 실행에서 녹화한 결과를 지연 시간을 주입해 재생 ("replay:경로.jsonl")
+
+PARSER_ROUTES를 지정하면 행 종류(짧은 문자/긴 문자)마다 다른 백엔드나 모델을 씁니다
+(예: "short=rules,long=openai:gpt-4o"). 지정하지 않은 종류는 PARSER_BACKEND를 사용합니다.
+
+PARSER_RECORD_FILE을 지정하면 어떤 백엔드든 텍스트별 결과와 소요 시간을 JSONL로 녹화하고,
+replay 백엔드는 그 파일로 같은 텍스트에 같은 결과를 돌려주므로 OpenAI 없이
+그래프 전체를 결정적으로 부하 테스트/벤치마크할 수 있습니다.
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from event_parser import EventParser
+from condenser import estimate_tokens
+from parse_cache import normalize_text
+from rule_extractor import extract_event
+from metrics import metrics
+
+# 기본 백엔드 설정 ("이름[:옵션]")
+PARSER_BACKEND = os.getenv("PARSER_BACKEND", "openai")
+
+# 행 종류별 백엔드 설정 ("종류=이름[:옵션],...", 종류: short / long)
+PARSER_ROUTES = os.getenv("PARSER_ROUTES", "")
+
+# 행 종류
+ROW_CLASSES = ("short", "long")
+
+# 이 토큰 추정치 이하인 텍스트를 짧은 문자(short)로 분류
+PARSER_SHORT_TOKENS = int(os.getenv("PARSER_SHORT_TOKENS", "200"))
+
+# 녹화 파일 경로 (지정하면 백엔드 결과를 녹화)
+PARSER_RECORD_FILE = os.getenv("PARSER_RECORD_FILE", "")
+
+# replay 백엔드의 기본 녹화 파일, 주입할 지연 시간(ms 또는 "recorded")과 텍스트별 지터 상한(ms)
+PARSER_REPLAY_FILE = os.getenv("PARSER_REPLAY_FILE", ".cache/parser_recording.jsonl")
+PARSER_REPLAY_LATENCY_MS = os.getenv("PARSER_REPLAY_LATENCY_MS", "0")
+PARSER_REPLAY_JITTER_MS = float(os.getenv("PARSER_REPLAY_JITTER_MS", "0"))
+
+_BACKENDS = {}
+
+
+def register_backend(name: str):
+    """
+    백엔드 팩토리 등록 데코레이터
+
+    팩토리는 설정의 옵션 부분(없으면 None)을 받아 parse_event_text,
+    aparse_event_text, parse_many를 가진 객체를 반환합니다.
+    """
+    def decorator(factory):
+        _BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def available_backends() -> list:
+    """등록된 백엔드 이름 목록"""
+    return sorted(_BACKENDS)
+
+
+def create_backend(spec: str = None, routes: str = None):
+    """
+    설정으로 백엔드 생성 (PARSER_RECORD_FILE이 있으면 녹화 백엔드로 감쌈)
+
+    Args:
+        spec: "이름[:옵션]" (예: "openai", "openai:gpt-4o", "rules", "replay:run.jsonl")
+              기본값은 환경 변수 PARSER_BACKEND
+        routes: 행 종류별 설정 "종류=이름[:옵션],..." (기본값은 환경 변수 PARSER_ROUTES)
+                지정하면 종류마다 다른 백엔드로 보내는 RoutingBackend를 만듦
+    """
+    spec = spec or PARSER_BACKEND
+    routes = PARSER_ROUTES if routes is None else routes
+    backend = _build(spec)
+    if routes:
+        backend = RoutingBackend(
+            {row_class: _build(route) for row_class, route in parse_routes(routes).items()}, backend
+        )
+        spec = f"{spec} ({routes})"
+    if PARSER_RECORD_FILE:
+        backend = RecordingBackend(backend, PARSER_RECORD_FILE, spec)
+    return backend
+
+
+def _build(spec: str):
+    """"이름[:옵션]" 설정 하나로 백엔드 생성"""
+    name, _, option = spec.partition(":")
+    if name not in _BACKENDS:
+        raise ValueError(f"알 수 없는 파서 백엔드: {name} (사용 가능: {', '.join(available_backends())})")
+    return _BACKENDS[name](option or None)
+
+
+def parse_routes(routes: str) -> dict:
+    """"short=rules,long=openai:gpt-4o" → {"short": "rules", "long": "openai:gpt-4o"}"""
+    parsed = {}
+    for item in filter(None, (item.strip() for item in routes.split(","))):
+        row_class, _, spec = item.partition("=")
+        if row_class.strip() not in ROW_CLASSES or not spec.strip():
+            raise ValueError(f"잘못된 파서 경로: {item} (종류: {', '.join(ROW_CLASSES)})")
+        parsed[row_class.strip()] = spec.strip()
+    return parsed
+
+
+def row_class(text: str) -> str:
+    """텍스트의 행 종류 (토큰 추정치가 PARSER_SHORT_TOKENS 이하면 short, 아니면 long)"""
+    return "short" if estimate_tokens(text) <= PARSER_SHORT_TOKENS else "long"
+
+
+def recording_key(text: str) -> str:
+    """녹화/재생 조회 키 (정규화한 텍스트의 해시)"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def load_recordings(path: str) -> dict:
+    """녹화 파일을 {키: 기록} 으로 읽기 (같은 키는 마지막 기록 사용)"""
+    recordings = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                recordings[record["key"]] = record
+    return recordings
+
+
+class ParserBackend(ABC):
+    """
+    파서 백엔드 기본 클래스
+
+    parse_event_text만 구현하면 비동기 버전은 스레드에서, 묶음 버전은 하나씩 실행합니다.
+    """
+
+    @abstractmethod
+    def parse_event_text(self, text: str) -> dict:
+        """텍스트 하나를 파싱해 EventParser와 같은 형식의 dict 반환"""
+
+    async def aparse_event_text(self, text: str) -> dict:
+        return await asyncio.to_thread(self.parse_event_text, text)
+
+    def parse_many(self, texts: list) -> list:
+        return [self.parse_event_text(text) for text in texts]
+
+
+@register_backend("openai")
+def _openai_backend(model: str = None):
+    return EventParser(model=model)
+
+
+@register_backend("rules")
+class RuleBackend(ParserBackend):
+    """규칙 기반 추출기만 사용하는 백엔드 (신뢰도와 관계없이 추출 결과 반환)"""
+
+    def __init__(self, option: str = None):
+        # 옵션 없음 ("rules")
+        pass
+
+    def parse_event_text(self, text: str) -> dict:
+        with metrics.timer("call", "rules.extract"):
+            result, _ = extract_event(text)
+        return result
+
+    async def aparse_event_text(self, text: str) -> dict:
+        return self.parse_event_text(text)
+
+
+@register_backend("replay")
+class ReplayBackend(ParserBackend):
+    """
+    녹화된 결과를 재생하는 백엔드
+
+    지연 시간은 PARSER_REPLAY_LATENCY_MS(숫자면 고정 ms, "recorded"면 녹화 당시 소요 시간)에
+    텍스트 해시로 정한 0~PARSER_REPLAY_JITTER_MS ms를 더해 주입하므로 실행마다 같습니다.
+    녹화에 없는 텍스트는 오류 결과를 반환합니다.
+    """
+
+    def __init__(self, path: str = None, latency_ms: str = PARSER_REPLAY_LATENCY_MS,
+                 jitter_ms: float = PARSER_REPLAY_JITTER_MS):
+        self.path = path or PARSER_REPLAY_FILE
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.recordings = load_recordings(self.path)
+        self.hits = 0
+        self.misses = 0
+        print(f"📼 녹화된 파싱 결과 {len(self.recordings)}개 로드: {self.path}")
+
+    def parse_event_text(self, text: str) -> dict:
+        result, delay = self._lookup(text)
+        with metrics.timer("call", "replay.parse"):
+            time.sleep(delay)
+        return result
+
+    async def aparse_event_text(self, text: str) -> dict:
+        result, delay = self._lookup(text)
+        with metrics.timer("call", "replay.parse"):
+            await asyncio.sleep(delay)
+        return result
+
+    def parse_many(self, texts: list) -> list:
+        """묶음 요청 하나처럼 가장 긴 지연 시간만큼 한 번 대기"""
+        looked_up = [self._lookup(text) for text in texts]
+        with metrics.timer("call", "replay.parse_many"):
+            time.sleep(max((delay for _, delay in looked_up), default=0))
+        return [result for result, _ in looked_up]
+
+    def _lookup(self, text: str) -> tuple:
+        """(결과, 주입할 지연 시간(초))"""
+        key = recording_key(text)
+        record = self.recordings.get(key)
+        if record is None:
+            self.misses += 1
+            return {
+                "title": "", "date": "", "time": "", "location": "", "description": "", "notes": "",
+                "error": f"녹화된 파싱 결과가 없습니다: {key[:12]}",
+            }, 0.0
+
+        self.hits += 1
+        if self.latency_ms == "recorded":
+            base = float(record.get("elapsed_ms", 0))
+        else:
+            base = float(self.latency_ms)
+        jitter = int(key[:8], 16) / 0xFFFFFFFF * self.jitter_ms
+        return dict(record["result"]), (base + jitter) / 1000
+
+
+class RoutingBackend(ParserBackend):
+    """행 종류(row_class)마다 정해진 백엔드로 보내는 백엔드 (경로가 없는 종류는 기본 백엔드)"""
+
+    def __init__(self, routes: dict, default):
+        """
+        Args:
+            routes: {행 종류: 백엔드}
+            default: 경로가 없는 종류에 쓸 백엔드
+        """
+        self.routes = routes
+        self.default = default
+
+    def backend_for(self, text: str):
+        """텍스트를 파싱할 백엔드"""
+        kind = row_class(text)
+        metrics.incr(f"parser.route.{kind}")
+        return self.routes.get(kind, self.default)
+
+    def parse_event_text(self, text: str) -> dict:
+        return self.backend_for(text).parse_event_text(text)
+
+    async def aparse_event_text(self, text: str) -> dict:
+        return await self.backend_for(text).aparse_event_text(text)
+
+    def parse_many(self, texts: list) -> list:
+        """백엔드별로 묶어 parse_many를 한 번씩 호출하고 입력 순서대로 결과를 모음"""
+        groups = {}
+        for index, text in enumerate(texts):
+            backend = self.backend_for(text)
+            groups.setdefault(id(backend), (backend, []))[1].append(index)
+
+        results = [None] * len(texts)
+        for backend, indexes in groups.values():
+            for index, result in zip(indexes, backend.parse_many([texts[index] for index in indexes])):
+                results[index] = result
+        return results
+
+
+class RecordingBackend(ParserBackend):
+    """다른 백엔드의 텍스트별 결과와 소요 시간을 JSONL로 녹화 (replay 백엔드 입력, 오류 결과 제외)"""
+
+    def __init__(self, inner, path: str, spec: str = ""):
+        self.inner = inner
+        self.path = path
+        self.spec = spec
+        self._lock = threading.Lock()
+
+    def parse_event_text(self, text: str) -> dict:
+        start = time.perf_counter()
+        result = self.inner.parse_event_text(text)
+        self._record([text], [result], time.perf_counter() - start)
+        return result
+
+    async def aparse_event_text(self, text: str) -> dict:
+        start = time.perf_counter()
+        result = await self.inner.aparse_event_text(text)
+        self._record([text], [result], time.perf_counter() - start)
+        return result
+
+    def parse_many(self, texts: list) -> list:
+        start = time.perf_counter()
+        results = self.inner.parse_many(texts)
+        self._record(texts, results, time.perf_counter() - start)
+        return results
+
+    def _record(self, texts: list, results: list, elapsed: float):
+        lines = [
+            json.dumps({
+                "key": recording_key(text),
+                "text": text,
+                "result": result,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "backend": self.spec,
+            }, ensure_ascii=False)
+            for text, result in zip(texts, results)
+            if "error" not in result
+        ]
+        if not lines:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    # test_messages.txt 샘플로 백엔드별 파싱 결과와 소요 시간 비교
+    # 예: python parser_backends.py rules / PARSER_RECORD_FILE=run.jsonl python parser_backends.py openai
+    import re
+    import sys
+
+    spec = sys.argv[1] if len(sys.argv) > 1 else PARSER_BACKEND
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_messages.txt")
+    with open(path, encoding="utf-8") as f:
+        samples = re.split(r"^## \d+\.[^\n]*\n", f.read(), flags=re.MULTILINE)[1:]
+
+    backend = create_backend(spec)
+    total = 0.0
+    for index, sample in enumerate(samples, start=1):
+        start = time.perf_counter()
+        result = backend.parse_event_text(sample)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print(f"[{index}] {elapsed * 1000:.1f}ms  {result.get('date')} {result.get('time')}  "
+              f"{result.get('title')}{'  (오류: ' + result['error'] + ')' if 'error' in result else ''}")
+
+    print(f"\n{spec}: {len(samples)}개, 합계 {total * 1000:.1f}ms")
@@ -0,0 +1,110 @@
+"""
+진행 이벤트 채널
+에이전트가 단계(stage)를 마칠 때마다 구조화된 이벤트를 내보내고,
+호출자는 스트리밍 실행으로 이벤트를 실시간으로 받습니다.
+
+이벤트 형식:
+    {
+        "stage": "parse",        # fetch / dedup / select / condense / parse / validate / write / calendar / mark_synced / chunk
+                                 # (sheets: 시트 핸들러의 읽기/쓰기 반영)
+        "status": "done",        # started / done / warning / error
+        "row": 2,                # 행 번호 (배치/전체 단위 이벤트는 None)
+        "message": "✅ ...",     # 사람이 읽을 수 있는 메시지
+        ...                      # 단계별 추가 데이터 (title, date, event_id 등)
+    }
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from langgraph.config import get_stream_writer
+
+# 그래프 밖에서 발생한 이벤트를 받을 수신자 (capture로 지정)
+_fallback_sink = ContextVar("progress_fallback_sink", default=None)
+
+
+def emit(stage: str, status: str, message: str, row: int = None, **data):
+    """
+    진행 이벤트를 내보냅니다.
+
+    그래프 실행 중이면 LangGraph custom 스트림으로 보내고, 그래프 밖에서
+    호출되면 capture로 지정한 수신자에게, 수신자가 없으면(에이전트 단독
+    실행 등) 메시지를 콘솔에 출력합니다.
+
+    Args:
+        stage: 처리 단계 이름
+        status: started / done / warning / error
+        message: 사람이 읽을 수 있는 메시지
+        row: 행 번호
+        data: 단계별 추가 데이터
+    """
+    event = {"stage": stage, "status": status, "row": row, "message": message, **data}
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        sink = _fallback_sink.get()
+        if sink is not None:
+            sink(event)
+        else:
+            print(message)
+        return
+    writer(event)
+
+
+@contextmanager
+def capture(sink):
+    """
+    with 블록 안에서 그래프 밖에서 발생한 이벤트를 sink로 전달합니다.
+
+    그래프 밖 드라이버(ChunkedWorkflowRunner 등)가 직접 호출한 에이전트의
+    이벤트도 같은 스트림으로 모을 때 사용합니다.
+    """
+    token = _fallback_sink.set(sink)
+    try:
+        yield
+    finally:
+        _fallback_sink.reset(token)
+
+
+def stream_run(app, input, config: dict = None, **kwargs):
+    """
+    워크플로우를 스트리밍 모드로 실행하며 진행 이벤트를 순서대로 내보냅니다.
+
+    행 단위 서브그래프의 이벤트도 함께 전달됩니다(subgraphs=True).
+    상태 전체를 모아두지 않으므로 메모리는 상태 크기로 제한됩니다.
+
+    Args:
+        app: 컴파일된 워크플로우
+        input: 초기 상태 (재개 시 None)
+        config: 실행 설정
+        kwargs: app.stream에 전달할 추가 인자 (durability 등)
+
+    Yields:
+        ("progress", event): 단계 완료 이벤트
+        ("result", state): 마지막 항목, 최종 상태
+    """
+    final_state = None
+    for namespace, mode, chunk in app.stream(
+        input, config, stream_mode=["custom", "values"], subgraphs=True, **kwargs
+    ):
+        if mode == "custom":
+            yield "progress", chunk
+        elif not namespace:
+            final_state = chunk
+    yield "result", final_state
+
+
+async def astream_run(app, input, config: dict = None, **kwargs):
+    """
+    stream_run의 비동기 버전 (비동기 워크플로우용)
+
+    Yields:
+        ("progress", event) 또는 마지막 ("result", state)
+    """
+    final_state = None
+    async for namespace, mode, chunk in app.astream(
+        input, config, stream_mode=["custom", "values"], subgraphs=True, **kwargs
+    ):
+        if mode == "custom":
+            yield "progress", chunk
+        elif not namespace:
+            final_state = chunk
+    yield "result", final_state
@@ -0,0 +1,240 @@
+"""
+외부 API 호출 속도 제한 모듈
+OpenAI/Google Sheets/Google Calendar 호출을 API별 토큰 버킷으로 제한하고,
+429/5xx 응답은 Retry-After를 따르거나 지터를 준 지수 백오프로 재시도합니다.
+
+제한 속도는 할당량(분당 요청/토큰 수)에서 시작해, 제한 응답을 받으면 절반으로
+줄이고 성공할 때마다 조금씩 늘려 할당량까지만 회복합니다 (AIMD).
+"""
+import os
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from metrics import metrics
+
+# 제한 응답으로 줄일 수 있는 최저 속도 (할당량 대비 비율)
+_MIN_RATE_RATIO = 0.1
+
+# 성공 한 번마다 회복할 속도 (할당량 대비 비율)
+_RECOVERY_RATIO = 0.05
+
+# 버킷 용량 (할당량의 몇 초 분량까지 한 번에 보낼 수 있는지)
+_BURST_SECONDS = 10
+
+
+class _Bucket:
+    """분당 할당량 기반 토큰 버킷 (예약 방식: 부족하면 음수로 빌리고 그만큼 대기)"""
+
+    def __init__(self, per_minute: float):
+        self.max_rate = per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = max(1.0, self.max_rate * _BURST_SECONDS)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, cost: float) -> float:
+        """cost만큼 예약하고 기다려야 할 시간(초)을 반환 (잠금 안에서 호출)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= cost
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def slow_down(self):
+        self.rate = max(self.max_rate * _MIN_RATE_RATIO, self.rate / 2)
+
+    def speed_up(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * _RECOVERY_RATIO)
+
+
+class RateLimiter:
+    """
+    API 하나의 요청/토큰 속도 제한기 (스레드/코루틴 공용)
+
+    call/acall로 감싼 함수는 할당량 안에서 실행되며, 재시도 가능한 오류
+    (429, 5xx, 403 rateLimitExceeded, 연결 오류)는 max_retries번까지 재시도합니다.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, tokens_per_minute: float = 0,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Args:
+            name: API 이름 (지표 이름에 사용)
+            requests_per_minute: 분당 요청 할당량 (0 이하면 제한 없음)
+            tokens_per_minute: 분당 토큰 할당량 (0 이하면 제한 없음, OpenAI TPM용)
+            max_retries: 재시도 가능한 오류의 최대 재시도 횟수
+            base_delay: 첫 재시도 대기 시간 상한(초), 재시도마다 두 배
+            max_delay: 재시도 대기 시간 상한(초)
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._buckets = {}
+        if requests_per_minute > 0:
+            self._buckets["requests"] = _Bucket(requests_per_minute)
+        if tokens_per_minute > 0:
+            self._buckets["tokens"] = _Bucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def call(self, fn, *args, cost: float = 1, tokens: float = 0, **kwargs):
+        """
+        속도 제한과 재시도를 적용하여 fn(*args, **kwargs) 실행
+
+        Args:
+            fn: 호출할 함수
+            cost: 요청 수 (배치 요청은 담긴 요청 수)
+            tokens: 예상 토큰 수 (tokens_per_minute 제한용)
+
+        Returns:
+            fn의 반환값 (재시도를 모두 실패하면 마지막 오류를 그대로 발생)
+        """
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._acquire(cost, tokens))
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._on_success()
+            return result
+
+    async def acall(self, fn, *args, cost: float = 1, tokens: float = 0, **kwargs):
+        """call의 비동기 버전 (fn은 코루틴 함수)"""
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._acquire(cost, tokens))
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._on_success()
+            return result
+
+    def timed_call(self, name: str, fn, *args, cost: float = 1, **kwargs):
+        """
+        call과 같되 실제 호출마다 지연 시간 지표("call", name)를 기록
+
+        속도 제한 대기와 재시도 백오프 시간은 지연 시간에 포함하지 않습니다.
+        """
+        def timed():
+            with metrics.timer("call", name):
+                return fn(*args, **kwargs)
+
+        return self.call(timed, cost=cost)
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """
+        제한 응답을 받았을 때 속도를 줄이고 다음 시도까지 기다릴 시간(초)을 반환
+
+        배치 요청 안의 개별 요청이 제한되었을 때처럼 call 밖에서 재시도할 때 사용합니다.
+        Retry-After가 있으면 그 값을, 없으면 지터를 준 지수 백오프를 사용합니다.
+        """
+        with self._lock:
+            for bucket in self._buckets.values():
+                bucket.slow_down()
+        metrics.incr(f"ratelimit.{self.name}.retries")
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _acquire(self, cost: float, tokens: float) -> float:
+        """요청/토큰을 예약하고 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            wait = 0.0
+            if "requests" in self._buckets:
+                wait = max(wait, self._buckets["requests"].reserve(cost))
+            if "tokens" in self._buckets and tokens:
+                wait = max(wait, self._buckets["tokens"].reserve(tokens))
+        metrics.incr(f"ratelimit.{self.name}.requests", cost)
+        if wait > 0:
+            metrics.incr(f"ratelimit.{self.name}.wait_seconds", wait)
+        return wait
+
+    def _retry_delay(self, error: Exception, attempt: int):
+        """재시도할 오류면 대기 시간(초), 아니면 None"""
+        retryable, retry_after = classify_error(error)
+        if not retryable or attempt >= self.max_retries:
+            return None
+        return self.backoff(attempt, retry_after)
+
+    def _on_success(self):
+        with self._lock:
+            for bucket in self._buckets.values():
+                bucket.speed_up()
+
+
+def classify_error(error) -> tuple:
+    """
+    OpenAI/googleapiclient/gspread 오류가 재시도 가능한지 판단
+
+    Returns:
+        tuple: (재시도 가능 여부, Retry-After 초 또는 None)
+    """
+    status = _status_code(error)
+    if status is None:
+        # 응답 없이 실패한 연결/시간 초과 오류
+        retryable = isinstance(error, (ConnectionError, TimeoutError)) or \
+            any(word in type(error).__name__ for word in ("Connection", "Timeout"))
+        return retryable, None
+
+    retryable = status == 429 or status >= 500 or \
+        (status == 403 and "ratelimitexceeded" in str(error).lower())
+    return retryable, _retry_after(error) if retryable else None
+
+
+def _status_code(error):
+    """오류 객체에서 HTTP 상태 코드 추출"""
+    status = getattr(error, "status_code", None)  # openai.APIStatusError
+    if status is None and getattr(error, "resp", None) is not None:
+        status = getattr(error.resp, "status", None)  # googleapiclient HttpError
+    if status is None and getattr(error, "response", None) is not None:
+        status = getattr(error.response, "status_code", None)  # gspread APIError
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환"""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        headers = getattr(error, "resp", None)
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+# API별 공용 속도 제한기 (분당 할당량은 환경 변수로 조정)
+openai_limiter = RateLimiter(
+    "openai",
+    requests_per_minute=float(os.getenv("OPENAI_RPM", "500")),
+    tokens_per_minute=float(os.getenv("OPENAI_TPM", "200000")),
+    max_retries=int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5")),
+)
+sheets_limiter = RateLimiter(
+    "sheets",
+    requests_per_minute=float(os.getenv("SHEETS_RPM", "60")),
+    max_retries=int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5")),
+)
+calendar_limiter = RateLimiter(
+    "calendar",
+    requests_per_minute=float(os.getenv("CALENDAR_RPM", "600")),
+    max_retries=int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5")),
+)
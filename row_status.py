@@ -0,0 +1,126 @@
+"""
+행 처리 상태 모듈
+H열(처리 상태)에 기록하는 행별 처리 단계를 정의합니다.
+
+    대기(빈 칸) → 파싱 완료 → 캘린더 등록 완료 / 오류 / 건너뜀
+
+- 대기, 파싱 완료, 오류: 아직 할 일이 남은 행이라 다음 실행에서 다시 읽음
+  (파싱 완료는 캘린더 등록 전에 중단된 행, 오류는 재시도할 행)
+- 캘린더 등록 완료, 건너뜀 (이유), 중복 (행 N): 끝난 행이라 다시 읽지 않음
+
+오류 상태에는 실패 횟수를 함께 적고("오류 (캘린더 등록 실패, 2회)"), ROW_MAX_ATTEMPTS번째 실패는
+끝난 행("건너뜀 (캘린더 등록 실패, 3회 실패)")으로 기록해 계속 실패하는 행을 무한히 다시 처리하거나
+읽기 시작 행(high-water mark)을 붙잡아 두지 않습니다.
+
+이전 버전이 기록한 상태("완료")도 LEGACY_STATUSES로 같은 단계에 대응시키므로 시트를 옮기지 않아도
+그대로 동작하며, migrate_status로 새 상태 문구로 바꿀 수 있습니다.
+"""
+import os
+import re
+from dedup import is_duplicate_status
+
+# 처리 단계
+PENDING = "pending"
+PARSED = "parsed"
+SYNCED = "synced"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# 다음 실행에서 다시 처리할 단계
+NEEDS_WORK = {PENDING, PARSED, FAILED}
+
+# H열에 기록하는 상태 문구
+STATUS_PARSED = "파싱 완료"
+STATUS_SYNCED = "캘린더 등록 완료"
+STATUS_FAILED = "오류"
+STATUS_SKIPPED = "건너뜀"
+
+# 오류 행을 처리할 최대 횟수 (이 횟수째 실패하면 끝난 행으로 기록, 0 이하면 제한 없음)
+ROW_MAX_ATTEMPTS = int(os.getenv("ROW_MAX_ATTEMPTS", "3"))
+
+# 이전 버전의 상태 문구 → 새 상태 문구
+# "완료"는 파싱 후 캘린더 등록에 성공하지 못한 행이지만, 이전 버전은 다시 처리하지 않았으므로
+# 캘린더에 이미 등록됐을 가능성을 고려해 보수적으로 끝난 행(건너뜀)으로 봅니다.
+LEGACY_STATUSES = {
+    "완료": f"{STATUS_SKIPPED} (이전 버전에서 완료)",
+}
+
+# 오류 상태의 이유와 실패 횟수 ("오류", "오류 (이유)", "오류 (이유, N회)", "오류 (N회)")
+_FAILED_STATUS = re.compile(r"^" + STATUS_FAILED + r"(?:\s*\((.*?)(?:,?\s*(\d+)회)?\))?$")
+
+
+def skipped_status(reason: str) -> str:
+    """처리하지 않고 끝낸 행의 상태 (예: "건너뜀 (날짜 없음)")"""
+    return f"{STATUS_SKIPPED} ({reason})"
+
+
+def failed_status(reason: str = "") -> str:
+    """다시 처리할 실패 행의 상태 (예: "오류 (캘린더 등록 실패)")"""
+    return f"{STATUS_FAILED} ({reason})" if reason else STATUS_FAILED
+
+
+def failure_attempts(status: str) -> int:
+    """오류 상태에 기록된 실패 횟수 (횟수가 없는 오류는 1, 오류가 아니면 0)"""
+    match = _FAILED_STATUS.match((status or "").strip())
+    if not match:
+        return 0
+    return int(match.group(2)) if match.group(2) else 1
+
+
+def count_failures(statuses: dict, previous: dict, max_attempts: int = ROW_MAX_ATTEMPTS) -> dict:
+    """
+    새로 기록할 오류 상태에 행별 실패 횟수를 붙입니다.
+
+    직전 상태가 오류였던 행은 그 횟수에 1을 더하고, max_attempts번째 실패이면
+    다시 처리하지 않도록 건너뜀 상태로 바꿉니다. 오류가 아닌 상태는 그대로 둡니다.
+
+    Args:
+        statuses: {행 번호: 기록할 상태}
+        previous: {행 번호: 읽을 때의 상태} (없는 행은 첫 실패)
+        max_attempts: 최대 처리 횟수 (0 이하면 제한 없음)
+
+    Returns:
+        dict: {행 번호: 실제로 기록할 상태}
+    """
+    counted = {}
+    for row_number, status in statuses.items():
+        match = _FAILED_STATUS.match((status or "").strip())
+        if not match:
+            counted[row_number] = status
+            continue
+        reason = match.group(1) or ""
+        attempt = failure_attempts(previous.get(row_number, "")) + 1
+        if 0 < max_attempts <= attempt:
+            counted[row_number] = skipped_status(f"{reason or STATUS_FAILED}, {attempt}회 실패")
+        else:
+            counted[row_number] = failed_status(f"{reason}, {attempt}회" if reason else f"{attempt}회")
+    return counted
+
+
+def state_of(status: str) -> str:
+    """
+    H열 상태 문구의 처리 단계
+
+    알 수 없는 문구(직접 입력한 값 등)는 대기로 봅니다.
+    """
+    status = (status or "").strip()
+    status = LEGACY_STATUSES.get(status, status)
+    if status == STATUS_PARSED:
+        return PARSED
+    if status == STATUS_SYNCED:
+        return SYNCED
+    if status.startswith(STATUS_FAILED):
+        return FAILED
+    if status.startswith(STATUS_SKIPPED) or is_duplicate_status(status):
+        return SKIPPED
+    return PENDING
+
+
+def needs_work(status: str) -> bool:
+    """다음 실행에서 다시 처리해야 하는 상태이면 True"""
+    return state_of(status) in NEEDS_WORK
+
+
+def migrate_status(status: str):
+    """이전 버전의 상태 문구이면 새 문구, 아니면 None"""
+    return LEGACY_STATUSES.get((status or "").strip())
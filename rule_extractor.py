@@ -0,0 +1,260 @@
+"""
+규칙 기반 일정 정보 추출기
+정형화된 한국어 안내 문자("검진일은 2025-12-15 10:00입니다", "12월6일(토) 오후 12시" 등)에서
+날짜/시간/장소를 정규식으로 추출하고 신뢰도를 함께 반환합니다.
+
+EventParser는 신뢰도가 충분히 높고 필수 필드가 모두 있으면 LLM을 호출하지 않습니다.
+"""
+import re
+from datetime import date
+
+# 텍스트에 연도가 명시되어 있는지 판단 (2025-12-15, 2025.12.15, 2025년 등)
+_EXPLICIT_YEAR = re.compile(r"(?<!\d)20\d{2}\s*(?:[-./]|년)")
+
+# 신뢰도 가중치 (합계 1.0)
+_WEIGHTS = {"date": 0.5, "time": 0.3, "title": 0.1, "location": 0.1}
+
+# LLM 없이 결과를 사용하기 위해 반드시 있어야 하는 필드
+REQUIRED_FIELDS = ("title", "date", "time")
+
+_WEEKDAY = r"\s*\(\s*[월화수목금토일]\s*\)"
+
+# 날짜 패턴 (그룹: 연도(없으면 빈 문자열), 월, 일)
+_DATE_PATTERNS = [
+    re.compile(r"(?<!\d)(20\d{2})\s*[-./]\s*(\d{1,2})\s*[-./]\s*(\d{1,2})(?!\d)"),
+    re.compile(r"(?<!\d)(20\d{2})\s*년\s*(\d{1,2})\s*월\s*(\d{1,2})\s*일"),
+    re.compile(r"(?<![\d년])()(\d{1,2})\s*월\s*(\d{1,2})\s*일"),
+    re.compile(r"(?<![\d/.])()(\d{1,2})/(\d{1,2})(?=" + _WEEKDAY + ")"),
+]
+
+_TIME_PATTERNS = [
+    # 오후 12시 20분, 오전 10시 반, 3시
+    re.compile(r"(오전|오후|낮|저녁|밤|새벽)?\s*(?<!\d)(\d{1,2})\s*시(?!간)\s*(?:(\d{1,2})\s*분|(반))?"),
+    # 10:00, 14:00~14:05
+    re.compile(r"()(?<![\d:])(\d{1,2}):(\d{2})(?![\d:])()"),
+]
+
+# 시간이 적힌 줄의 라벨
+_TIME_LABEL = re.compile(r"^\s*(?:시간|일시|시각)\s*[:：]")
+
+# 장소 라벨 (앞쪽일수록 우선)
+_LOCATION_LABELS = ("장소", "위치", "주소", "매장")
+_LOCATION_LINE = re.compile(r"^\s*(" + "|".join(_LOCATION_LABELS) + r")\s*[:：]\s*(.+?)\s*$")
+
+# 제목 후보에서 제외할 줄과 끝에 붙는 상투어
+_SKIP_LINE = re.compile(r"^\s*(?:\[?\s*Web발신\s*\]?|#.*|-{3,})\s*$")
+_TITLE_SUFFIX = re.compile(r"(?:\s*(?:완료|확인|안내|알림))+\s*$")
+_BRACKET_TITLE = re.compile(r"^\s*[\[【]\s*([^\]】]+?)\s*[\]】]\s*(.*)$")
+
+# 광고 문자 첫 줄 앞에 붙는 "(광고)" 표시 (제목에서 제외)
+AD_MARK = re.compile(r"^\s*\(\s*광고\s*\)\s*")
+
+# 주의사항으로 볼 줄의 머리 기호
+_NOTE_LINE = re.compile(r"^\s*[★※]\s*(.+?)\s*[★※]?\s*$")
+
+
+def extract_event(text: str, today: date = None) -> tuple:
+    """
+    텍스트에서 일정 정보를 규칙으로 추출합니다.
+
+    Args:
+        text: 파싱할 텍스트
+        today: 연도 추정 기준 날짜 (기본값: 오늘)
+
+    Returns:
+        tuple: (EventParser와 같은 형식의 dict, 신뢰도 0.0~1.0)
+    """
+    today = today or date.today()
+    lines = [line.strip() for line in text.splitlines()]
+
+    result = {
+        "title": _extract_title(lines),
+        "date": "",
+        "time": "",
+        "location": _extract_location(lines),
+        "description": "",
+        "notes": "\n".join(
+            match.group(1) for match in map(_NOTE_LINE.match, lines) if match
+        ),
+    }
+
+    # 서로 다른 날짜가 둘 이상이면 어느 것이 일정인지 알 수 없으므로 낮은 신뢰도
+    dates = _find_dates(lines, today)
+    distinct_dates = {value for value, _, _ in dates}
+    ambiguous = len(distinct_dates) > 1
+
+    if dates:
+        value, line_index, end = dates[0]
+        result["date"] = value
+        result["description"] = lines[line_index]
+        result["time"] = _extract_time(lines, line_index, end)
+
+    confidence = sum(weight for field, weight in _WEIGHTS.items() if result[field])
+    if ambiguous:
+        confidence = min(confidence, 0.3)
+
+    return result, round(confidence, 2)
+
+
+def has_explicit_year(text: str) -> bool:
+    """텍스트에 연도가 명시되어 있으면 True"""
+    return bool(_EXPLICIT_YEAR.search(text))
+
+
+def nearest_future(month: int, day: int, today: date) -> date:
+    """연도 없는 월/일을 오늘 이후 가장 가까운 날짜로 추정 (오늘 포함)"""
+    candidate = date(today.year, month, day)
+    if candidate < today:
+        candidate = date(today.year + 1, month, day)
+    return candidate
+
+
+def mentions_schedule(line: str) -> bool:
+    """줄에 날짜나 시간 표현이 있으면 True"""
+    return any(pattern.search(line) for pattern in _DATE_PATTERNS + _TIME_PATTERNS)
+
+
+def is_location_line(line: str) -> bool:
+    """장소/위치/주소/매장 라벨이 붙은 줄이면 True"""
+    return bool(_LOCATION_LINE.match(line))
+
+
+def dates_in(text: str, today: date = None) -> list:
+    """텍스트의 날짜 목록 (YYYY-MM-DD, 등장 순서, 연도가 없으면 오늘 이후 가장 가까운 날짜)"""
+    lines = [line.strip() for line in text.splitlines()]
+    return [value for value, _, _ in _find_dates(lines, today or date.today())]
+
+
+def times_in(text: str) -> list:
+    """텍스트의 시간 목록 (HH:MM, 등장 순서)"""
+    return [value for line in text.splitlines() for value in _find_times(line)]
+
+
+def is_confident(result: dict, confidence: float, threshold: float) -> bool:
+    """신뢰도가 기준 이상이고 필수 필드가 모두 있으면 True"""
+    return confidence >= threshold and all(result.get(field) for field in REQUIRED_FIELDS)
+
+
+def _find_dates(lines: list, today: date) -> list:
+    """[(YYYY-MM-DD, 줄 번호, 줄 안에서 날짜가 끝나는 위치), ...] (등장 순서)"""
+    found = []
+    for index, line in enumerate(lines):
+        matches = []
+        for pattern in _DATE_PATTERNS:
+            for match in pattern.finditer(line):
+                # 연도 있는 패턴이 먼저 잡은 구간 안의 "M월 D일"은 중복이므로 건너뜀
+                if any(start <= match.start() < end for start, end, _ in matches):
+                    continue
+                value = _to_date(match.group(1), match.group(2), match.group(3), today)
+                if value:
+                    matches.append((match.start(), match.end(), value))
+        found.extend((value, index, end) for _, end, value in sorted(matches))
+    return found
+
+
+def _to_date(year: str, month: str, day: str, today: date) -> str:
+    """연도가 없으면 오늘 이후 가장 가까운 날짜로 추정 (EventParser와 같은 규칙)"""
+    try:
+        month, day = int(month), int(day)
+        if year:
+            return date(int(year), month, day).isoformat()
+        return nearest_future(month, day, today).isoformat()
+    except ValueError:
+        return ""
+
+
+def _extract_time(lines: list, date_line: int, date_end: int) -> str:
+    """
+    일정 시간 추출
+
+    날짜와 같은 줄(날짜 뒤) → 시간/일시 라벨이 붙은 줄 → 본문 전체에서 유일한 시간 순으로 찾습니다.
+    """
+    same_line = _find_times(lines[date_line][date_end:])
+    if same_line:
+        return same_line[0]
+
+    for line in lines:
+        if _TIME_LABEL.match(line):
+            labeled = _find_times(line)
+            if labeled:
+                return labeled[0]
+
+    everywhere = {value for line in lines for value in _find_times(line)}
+    return everywhere.pop() if len(everywhere) == 1 else ""
+
+
+def _find_times(line: str) -> list:
+    """줄에서 HH:MM 형식 시간 목록 (등장 순서)"""
+    found = []
+    for pattern in _TIME_PATTERNS:
+        for match in pattern.finditer(line):
+            meridiem, hour, minute, half = match.groups()
+            hour = int(hour)
+            minute = 30 if half else int(minute or 0)
+            if meridiem in ("오후", "저녁", "밤") and hour < 12:
+                hour += 12
+            elif meridiem == "낮" and hour < 6:
+                hour += 12
+            elif meridiem == "오전" and hour == 12:
+                hour = 0
+            if hour < 24 and minute < 60:
+                found.append((match.start(), f"{hour:02d}:{minute:02d}"))
+    return [value for _, value in sorted(found)]
+
+
+def _extract_location(lines: list) -> str:
+    """장소/위치/주소/매장 라벨이 붙은 줄에서 장소 추출"""
+    labeled = {}
+    for line in lines:
+        match = _LOCATION_LINE.match(line)
+        if match and match.group(1) not in labeled:
+            labeled[match.group(1)] = match.group(2)
+    for label in _LOCATION_LABELS:
+        if label in labeled:
+            return labeled[label]
+    return ""
+
+
+def _extract_title(lines: list) -> str:
+    """첫 번째 내용 줄을 제목으로 사용 ("[보낸 곳] 내용" 형식이면 "보낸 곳 내용")"""
+    for line in lines:
+        if not line or _SKIP_LINE.match(line):
+            continue
+        line = AD_MARK.sub("", line).strip("\"'“”")
+        match = _BRACKET_TITLE.match(line)
+        if match:
+            sender, rest = match.group(1), _TITLE_SUFFIX.sub("", match.group(2))
+            line = f"{sender} {rest}".strip()
+        return line[:50]
+    return ""
+
+
+if __name__ == "__main__":
+    # 정답 세트(golden_set.py)로 규칙 추출 정확도와 LLM 생략 비율 확인
+    import sys
+    from golden_set import GOLDEN_TODAY, MIN_ACCURACY, REQUIRED_CORRECT, load_golden_set, field_accuracy, mismatches
+
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 0.8
+    golden = load_golden_set()
+
+    results = []
+    fast = fast_wrong = 0
+    for index, (sample, answer) in enumerate(golden, start=1):
+        result, confidence = extract_event(sample, GOLDEN_TODAY)
+        results.append(result)
+        use_rules = is_confident(result, confidence, threshold)
+        wrong = mismatches(result, answer)
+        fast += use_rules
+        fast_wrong += use_rules and any(field in wrong for field in REQUIRED_CORRECT)
+        print(f"\n[{index}] 신뢰도 {confidence:.2f} → {'규칙 사용' if use_rules else 'LLM 호출'}")
+        for field in ("title", "date", "time", "location"):
+            expected = f"  (정답: {wrong[field][1]})" if field in wrong else ""
+            print(f"  {field}: {result[field]}{expected}")
+
+    accuracy = field_accuracy(results, [answer for _, answer in golden])
+    print(f"\nLLM 생략: {fast}/{len(golden)}개 (기준 신뢰도 {threshold}), 그중 날짜/시간 오답 {fast_wrong}개")
+    print("정확도: " + ", ".join(f"{field} {value:.0%}" for field, value in accuracy.items()))
+
+    assert fast_wrong == 0, "LLM을 생략한 결과에 날짜/시간 오답이 있습니다."
+    for field, minimum in MIN_ACCURACY.items():
+        assert accuracy[field] >= minimum, f"{field} 정확도 {accuracy[field]:.0%} < {minimum:.0%}"
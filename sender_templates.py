@@ -0,0 +1,462 @@
+"""
+발신자 템플릿 학습 모듈
+병원/항공사/치과처럼 같은 발신자가 날짜/시간만 바꿔 보내는 안내 문자를 템플릿으로 묶고,
+저장된 LLM 파싱 결과로 필드별 추출 규칙을 만들어 같은 템플릿의 새 문자는 LLM 없이 파싱합니다.
+
+- 템플릿: 발신자(첫 [대괄호] 이름 또는 첫 줄)가 같고, 숫자를 가린 줄 목록이
+  TEMPLATE_MIN_SIMILARITY 이상 비슷한 문자들의 묶음
+- 추출 규칙: 필드마다 모든 예시의 LLM 결과를 재현하는 규칙
+  (고정값 / 대응하는 줄의 n번째 날짜·시간 / 대응하는 줄의 정규식 슬롯)
+- 검증: 규칙으로 파싱한 결과를 TEMPLATE_SPOT_CHECK_EVERY번에 한 번 LLM 결과와 비교하고,
+  날짜/시간/장소가 다르면 규칙을 폐기한 뒤 새 예시를 포함해 다시 만듦
+
+템플릿은 SQLite에 저장되며, 규칙이 바뀔 때마다 템플릿 버전이 올라갑니다.
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import unicodedata
+from datetime import date
+from difflib import SequenceMatcher
+from metrics import metrics
+from parse_cache import PROMPT_VERSION
+from rule_extractor import dates_in, times_in
+
+# 템플릿 파일 경로 (빈 문자열이면 템플릿 사용 안 함)
+TEMPLATE_DB = os.getenv("TEMPLATE_DB", ".cache/templates.sqlite3")
+
+# 규칙을 만들기 위한 최소 예시 수와 템플릿마다 보관할 최근 예시 수
+TEMPLATE_MIN_EXAMPLES = int(os.getenv("TEMPLATE_MIN_EXAMPLES", "2"))
+TEMPLATE_MAX_EXAMPLES = int(os.getenv("TEMPLATE_MAX_EXAMPLES", "5"))
+
+# 같은 템플릿으로 볼 최소 줄 목록 유사도 (0~1)
+TEMPLATE_MIN_SIMILARITY = float(os.getenv("TEMPLATE_MIN_SIMILARITY", "0.85"))
+
+# 규칙으로 파싱할 때 몇 번에 한 번 LLM으로 검증할지 (규칙을 만든 직후 첫 사용은 항상 검증, 0이면 검증 안 함)
+TEMPLATE_SPOT_CHECK_EVERY = int(os.getenv("TEMPLATE_SPOT_CHECK_EVERY", "10"))
+
+# 저장 형식 버전 (바꾸면 기존 템플릿을 버리고 새로 학습)
+SCHEMA_VERSION = "1"
+
+FIELDS = ("title", "date", "time", "location", "description", "notes")
+
+# 검증에서 비교할 필드
+_CHECKED_FIELDS = ("date", "time", "location")
+
+# 예시마다 표현만 달라도 한 예시의 값을 그대로 쓸 수 있는 필드 (숫자가 없는 값만)
+_FREE_TEXT_FIELDS = ("description", "notes")
+
+_SENDER = re.compile(r"^[\[【]\s*([^\]】]+?)\s*[\]】]")
+_NOT_SENDER = re.compile(r"^(?:Web발신|국외발신|국제발신)$")
+_DIGITS = re.compile(r"\d+")
+
+
+def split_lines(text: str) -> list:
+    """유니코드 정규화(NFKC) 후 앞뒤 공백을 지운 내용 줄 목록"""
+    lines = (unicodedata.normalize("NFKC", line).strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
+def mask_line(line: str) -> str:
+    """숫자를 가린 줄 (날짜/시간/번호만 다른 줄을 같은 줄로 보기 위함)"""
+    return _DIGITS.sub("#", line)
+
+
+def sender_of(lines: list) -> str:
+    """발신자: 첫 [대괄호] 이름 ([Web발신] 제외), 없으면 숫자를 가린 첫 줄"""
+    for line in lines:
+        match = _SENDER.match(line)
+        if match and not _NOT_SENDER.match(match.group(1)):
+            return match.group(1)
+    return mask_line(lines[0])[:30] if lines else ""
+
+
+def compile_extractor(skeleton: list, examples: list, previous: dict = None):
+    """
+    모든 예시의 LLM 결과를 재현하는 필드별 추출 규칙
+
+    설명/메모처럼 LLM이 예시마다 다르게 표현하는 필드는 숫자(날짜, 편명, 번호 등)가
+    없을 때만 한 예시의 값을 고정값으로 사용하며, 이전 규칙의 값이 있으면 유지합니다.
+
+    Args:
+        skeleton: 템플릿의 숫자를 가린 줄 목록
+        examples: [{"text", "result", "parsed_on"}, ...]
+        previous: 이전 추출 규칙 (자유 텍스트 필드 값 유지용)
+
+    Returns:
+        dict: {필드: 규칙} 또는 None (예시가 부족하거나 재현할 수 없는 필드가 있는 경우)
+    """
+    if len(examples) < max(1, TEMPLATE_MIN_EXAMPLES):
+        return None
+
+    prepared = []
+    for example in examples:
+        lines = split_lines(example["text"])
+        _, mapping = _align(skeleton, [mask_line(line) for line in lines])
+        prepared.append((lines, mapping, date.fromisoformat(example["parsed_on"]), example["result"]))
+
+    extractor = {}
+    for field in FIELDS:
+        common = None
+        for lines, mapping, today, result in prepared:
+            candidates = {
+                json.dumps(rule, ensure_ascii=False, sort_keys=True): rule
+                for rule in _candidates(field, result.get(field, ""), lines, mapping, today)
+            }
+            common = candidates if common is None else {
+                key: rule for key, rule in common.items() if key in candidates
+            }
+
+        if common:
+            extractor[field] = next(iter(common.values()))
+            continue
+
+        if field in _FREE_TEXT_FIELDS:
+            kept = (previous or {}).get(field)
+            latest = prepared[-1][3].get(field, "")
+            if kept and kept["kind"] == "const" and not _DIGITS.search(kept["value"]):
+                extractor[field] = kept
+                continue
+            if not _DIGITS.search(latest):
+                extractor[field] = {"kind": "const", "value": latest}
+                continue
+        return None
+
+    return extractor
+
+
+def run_extractor(extractor: dict, lines: list, mapping: dict, today: date = None):
+    """추출 규칙 적용 (규칙 하나라도 적용할 수 없으면 None)"""
+    today = today or date.today()
+    result = {}
+    for field, rule in extractor.items():
+        value = _run_rule(rule, lines, mapping, today)
+        if value is None:
+            return None
+        result[field] = value
+    return result
+
+
+class TemplateStore:
+    """발신자 템플릿과 추출 규칙 저장소 (메모리 + SQLite, 스레드 안전)"""
+
+    def __init__(self, path: str = TEMPLATE_DB):
+        """
+        Args:
+            path: SQLite 파일 경로 (빈 문자열이면 템플릿 사용 안 함)
+        """
+        self.path = path
+        self.hits = 0
+        self.checks = 0
+        self.mismatches = 0
+        self._conn = None
+        self._templates = None  # 발신자 → [템플릿 dict, ...]
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def apply(self, text: str, today: date = None):
+        """
+        학습된 템플릿의 규칙으로 파싱
+
+        Returns:
+            tuple: (결과 dict, 템플릿 ID, LLM 검증 필요 여부) 또는 None (맞는 템플릿이 없는 경우)
+                검증이 필요하면 LLM 결과로 verify를 호출해야 합니다.
+        """
+        if not self.enabled:
+            return None
+
+        with metrics.timer("call", "templates.apply"):
+            lines = split_lines(text)
+            masked = [mask_line(line) for line in lines]
+            with self._lock:
+                match = self._best_match(sender_of(lines), masked, compiled_only=True)
+                if match is None:
+                    return None
+                template, mapping = match
+                result = run_extractor(template["extractor"], lines, mapping, today)
+                if result is None:
+                    return None
+
+                check = TEMPLATE_SPOT_CHECK_EVERY > 0 and template["uses"] % TEMPLATE_SPOT_CHECK_EVERY == 0
+                template["uses"] += 1
+                if not check:
+                    self.hits += 1
+                return result, template["id"], check
+
+    def verify(self, template_id: int, local: dict, llm: dict) -> bool:
+        """
+        규칙 결과를 LLM 결과와 비교하고, 날짜/시간/장소가 다르거나 LLM이 일정을
+        여러 개 찾았으면(규칙은 일정 하나만 추출) 규칙 폐기
+
+        Returns:
+            bool: 일치 여부
+        """
+        mismatched = "events" in llm or any(
+            local.get(field, "") != llm.get(field, "") for field in _CHECKED_FIELDS
+        )
+        with self._lock:
+            template = self._find(template_id)
+            if template is None:
+                return not mismatched
+            self.checks += 1
+            template["checks"] += 1
+            if mismatched:
+                self.mismatches += 1
+                template["mismatches"] += 1
+                template["extractor"] = None
+                template["version"] += 1
+                template["uses"] = 0
+            self._save(template)
+        return not mismatched
+
+    def learn(self, text: str, result: dict, today: date = None):
+        """
+        LLM 파싱 결과를 예시로 추가하고 템플릿 규칙을 다시 만듦
+        (오류 결과와 일정이 여러 개인 결과는 무시)
+        """
+        if not self.enabled or "error" in result or "events" in result:
+            return
+
+        lines = split_lines(text)
+        if not lines:
+            return
+        masked = [mask_line(line) for line in lines]
+        sender = sender_of(lines)
+        example = {
+            "text": "\n".join(lines),
+            "result": {field: result.get(field, "") for field in FIELDS},
+            "parsed_on": (today or date.today()).isoformat(),
+        }
+
+        with self._lock:
+            match = self._best_match(sender, masked)
+            if match is None:
+                template = {
+                    "id": None, "sender": sender, "skeleton": masked, "examples": [],
+                    "extractor": None, "version": 0, "checks": 0, "mismatches": 0, "uses": 0,
+                }
+                self._templates.setdefault(sender, []).append(template)
+            else:
+                template = match[0]
+
+            # 같은 텍스트는 최신 결과 하나만 예시로 유지
+            examples = [item for item in template["examples"] if item["text"] != example["text"]]
+            template["examples"] = (examples + [example])[-max(1, TEMPLATE_MAX_EXAMPLES):]
+
+            extractor = compile_extractor(template["skeleton"], template["examples"], template["extractor"])
+            if extractor != template["extractor"]:
+                template["extractor"] = extractor
+                template["version"] += 1
+                template["uses"] = 0
+            self._save(template)
+
+    def stats(self) -> dict:
+        """템플릿/규칙 수와 규칙 사용/검증/불일치 횟수"""
+        templates = []
+        if self.enabled:
+            with self._lock:
+                templates = [item for group in self._load().values() for item in group]
+        return {
+            "templates": len(templates),
+            "compiled": sum(1 for item in templates if item["extractor"]),
+            "hits": self.hits,
+            "checks": self.checks,
+            "mismatches": self.mismatches,
+        }
+
+    def templates(self) -> list:
+        """저장된 템플릿 목록 (발신자, 예시 수, 버전, 규칙 유무, 검증/불일치 횟수)"""
+        with self._lock:
+            return [
+                {
+                    "id": item["id"],
+                    "sender": item["sender"],
+                    "examples": len(item["examples"]),
+                    "version": item["version"],
+                    "compiled": bool(item["extractor"]),
+                    "checks": item["checks"],
+                    "mismatches": item["mismatches"],
+                }
+                for group in self._load().values() for item in group
+            ]
+
+    def _best_match(self, sender: str, masked: list, compiled_only: bool = False):
+        """같은 발신자 템플릿 중 가장 비슷한 것 (템플릿, 줄 대응) 또는 None (잠금 안에서 호출)"""
+        best, best_ratio = None, TEMPLATE_MIN_SIMILARITY
+        for template in self._load().get(sender, []):
+            if compiled_only and not template["extractor"]:
+                continue
+            ratio, mapping = _align(template["skeleton"], masked)
+            if ratio >= best_ratio:
+                best, best_ratio = (template, mapping), ratio
+        return best
+
+    def _find(self, template_id: int):
+        for group in self._load().values():
+            for template in group:
+                if template["id"] == template_id:
+                    return template
+        return None
+
+    def _load(self) -> dict:
+        """처음 사용할 때 SQLite에서 템플릿을 읽어 메모리에 올림 (잠금 안에서 호출)"""
+        if self._templates is not None:
+            return self._templates
+
+        conn = self._connect()
+        self._templates = {}
+        rows = conn.execute(
+            "SELECT id, sender, skeleton, examples, extractor, version, checks, mismatches "
+            "FROM templates ORDER BY id"
+        )
+        for row in rows:
+            self._templates.setdefault(row[1], []).append({
+                "id": row[0],
+                "sender": row[1],
+                "skeleton": json.loads(row[2]),
+                "examples": json.loads(row[3]),
+                "extractor": json.loads(row[4]) if row[4] else None,
+                "version": row[5],
+                "checks": row[6],
+                "mismatches": row[7],
+                "uses": 0,
+            })
+        return self._templates
+
+    def _save(self, template: dict):
+        """템플릿 하나를 SQLite에 저장 (잠금 안에서 호출)"""
+        values = (
+            template["sender"],
+            json.dumps(template["skeleton"], ensure_ascii=False),
+            json.dumps(template["examples"], ensure_ascii=False),
+            json.dumps(template["extractor"], ensure_ascii=False) if template["extractor"] else None,
+            template["version"],
+            template["checks"],
+            template["mismatches"],
+            time.time(),
+        )
+        conn = self._connect()
+        if template["id"] is None:
+            cursor = conn.execute(
+                "INSERT INTO templates (sender, skeleton, examples, extractor, version, checks, "
+                "mismatches, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values
+            )
+            template["id"] = cursor.lastrowid
+        else:
+            conn.execute(
+                "UPDATE templates SET sender = ?, skeleton = ?, examples = ?, extractor = ?, "
+                "version = ?, checks = ?, mismatches = ?, updated = ? WHERE id = ?",
+                values + (template["id"],)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 연결을 열고 테이블 생성 (저장 형식/프롬프트 버전이 다르면 비움)"""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS templates ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, sender TEXT NOT NULL, skeleton TEXT NOT NULL, "
+                "examples TEXT NOT NULL, extractor TEXT, version INTEGER NOT NULL, "
+                "checks INTEGER NOT NULL, mismatches INTEGER NOT NULL, updated REAL NOT NULL)"
+            )
+
+            # 예시는 LLM 결과이므로 프롬프트가 바뀌면 다시 학습
+            version = f"{SCHEMA_VERSION}:{PROMPT_VERSION}"
+            row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != version:
+                conn.execute("DELETE FROM templates")
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (version,))
+            self._conn = conn
+        return self._conn
+
+
+def _align(skeleton: list, masked: list) -> tuple:
+    """
+    템플릿 줄과 새 문자 줄의 대응
+
+    같은 줄, 그리고 줄 수가 같은 교체 구간(이름만 다른 줄 등)은 순서대로 대응시킵니다.
+
+    Returns:
+        tuple: (유사도, {템플릿 줄 번호: 문자 줄 번호})
+    """
+    matcher = SequenceMatcher(None, skeleton, masked, autojunk=False)
+    mapping = {}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal" or (tag == "replace" and i2 - i1 == j2 - j1):
+            mapping.update(zip(range(i1, i2), range(j1, j2)))
+    return matcher.ratio(), mapping
+
+
+def _candidates(field: str, value: str, lines: list, mapping: dict, today: date) -> list:
+    """예시 하나의 field 값을 재현하는 규칙 후보 (우선순위 순)"""
+    found = []
+    if field not in ("date", "time"):
+        found.append({"kind": "const", "value": value})
+    elif not value:
+        # 날짜/시간은 값이 없을 때만 고정값 허용 (항상 본문에서 읽음)
+        found.append({"kind": "const", "value": ""})
+    if not value:
+        return found
+
+    for skeleton_index, line_index in sorted(mapping.items()):
+        line = lines[line_index]
+        if field in ("date", "time"):
+            values = dates_in(line, today) if field == "date" else times_in(line)
+            found.extend(
+                {"kind": field, "line": skeleton_index, "nth": nth}
+                for nth, candidate in enumerate(values) if candidate == value
+            )
+        elif value in line:
+            found.append({"kind": "slot", "line": skeleton_index, "pattern": _slot_pattern(line, value)})
+    return found
+
+
+def _slot_pattern(line: str, value: str) -> str:
+    """줄에서 값 앞뒤 문구를 고정하고 값 자리를 캡처하는 정규식 (앞뒤 문구의 숫자는 \\d+)"""
+    start = line.index(value)
+
+    def literal(part):
+        return _DIGITS.sub(lambda _: r"\d+", re.escape(part))
+
+    return "^" + literal(line[:start]) + "(.+?)" + literal(line[start + len(value):]) + "$"
+
+
+def _run_rule(rule: dict, lines: list, mapping: dict, today: date):
+    """규칙 하나 적용 (적용할 수 없으면 None)"""
+    if rule["kind"] == "const":
+        return rule["value"]
+
+    line_index = mapping.get(rule["line"])
+    if line_index is None:
+        return None
+    line = lines[line_index]
+
+    if rule["kind"] == "slot":
+        match = re.match(rule["pattern"], line)
+        return match.group(1) if match else None
+
+    values = dates_in(line, today) if rule["kind"] == "date" else times_in(line)
+    return values[rule["nth"]] if rule["nth"] < len(values) else None
+
+
+# 프로세스 전역 템플릿 저장소
+template_store = TemplateStore()
+
+
+if __name__ == "__main__":
+    # 저장된 템플릿 목록 확인
+    for item in template_store.templates():
+        print(f"[{item['id']}] {item['sender']} - 예시 {item['examples']}개, 버전 {item['version']}, "
+              f"{'규칙 있음' if item['compiled'] else '규칙 없음'}, "
+              f"검증 {item['checks']}회 (불일치 {item['mismatches']}회)")
+    print(template_store.stats())
@@ -0,0 +1,205 @@
+"""
+테스트 공용 설정
+구글 시트/캘린더 핸들러와 LLM 파서를 메모리 안의 가짜 객체로 바꿔 워크플로우 전체를 실행합니다.
+
+모듈 전역 캐시/인덱스는 임포트할 때 환경 변수를 읽으므로, 프로젝트 모듈을 임포트하기 전에
+캐시 파일을 끄고 체크포인트/작업 큐를 임시 디렉터리로 돌립니다.
+"""
+import os
+import sys
+import tempfile
+import threading
+
+_TMP = tempfile.mkdtemp(prefix="event-agent-tests-")
+os.environ.update({
+    "CHECKPOINT_DB": os.path.join(_TMP, "checkpoints.sqlite3"),
+    "WORK_QUEUE_DIR": os.path.join(_TMP, "work_queues"),
+    "PROCESSED_EVENTS_LOG": "",
+    "PARSE_CACHE_DB": "",
+    "TEMPLATE_DB": "",
+    "DEDUP_DB": "",
+    "EVENT_REGISTRY_DB": os.path.join(_TMP, "event_registry.sqlite3"),
+    "SHEETS_JOURNAL_DIR": "",
+    "SHEETS_CURSOR_FILE": "",
+    "PARSER_BACKEND": "fake",
+    "PARSER_RECORD_FILE": "",
+    "FAST_PATH_MIN_CONFIDENCE": "2",
+    "CONDENSE_MAX_TOKENS": "0",
+    "METRICS_JSON": "",
+    "GOOGLE_SHEET_ID": "test-sheet",
+    "SHEETS_RPM": "100000",
+    "LANGCHAIN_TRACING_V2": "false",
+})
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+import parser_backends
+import agents.sheets_agent
+import agents.calendar_agent
+import main
+from google_sheets_handler import is_pending, SHEETS_PAGE_ROWS
+from row_status import count_failures
+from event_registry import event_registry
+
+
+class FakeSheetsHandler:
+    """A열(원본 텍스트), B~G열(파싱 결과), H열(처리 상태)을 메모리에 가진 시트"""
+
+    rows = {}           # 행 번호 → {"text", "fields", "status"}
+    read_statuses = {}  # 미처리 행을 읽을 때의 상태 (오류 횟수 계산용)
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def load(cls, texts: list):
+        """2행부터 texts를 채운 새 시트"""
+        cls.rows = {
+            row_number: {"text": text, "fields": {}, "status": ""}
+            for row_number, text in enumerate(texts, start=2)
+        }
+        cls.read_statuses = {}
+
+    @classmethod
+    def statuses(cls) -> dict:
+        return {row_number: row["status"] for row_number, row in cls.rows.items()}
+
+    def read_unprocessed_events(self) -> list:
+        with self.lock:
+            pending = {
+                row_number: row for row_number, row in sorted(self.rows.items())
+                if is_pending(row["text"], row["status"])
+            }
+            self.read_statuses.update({row_number: row["status"] for row_number, row in pending.items()})
+            return [(row_number, row["text"]) for row_number, row in pending.items()]
+
+    def iter_unprocessed_events(self, page_size: int = SHEETS_PAGE_ROWS):
+        pending = self.read_unprocessed_events()
+        for start in range(0, len(pending), page_size):
+            yield pending[start:start + page_size]
+
+    def get_change_token(self) -> tuple:
+        pending = self.read_unprocessed_events()
+        return hash(tuple(pending)), len(pending)
+
+    def read_row_text(self, row_number: int) -> str:
+        with self.lock:
+            return self.rows.get(row_number, {}).get("text", "")
+
+    def write_parsed_event(self, row_number: int, event_info: dict):
+        with self.lock:
+            self.rows[row_number]["fields"] = dict(event_info)
+
+    def write_parsed_events(self, items: list, status: str):
+        with self.lock:
+            for row_number, event_info in items:
+                self.rows[row_number]["fields"] = dict(event_info)
+                self.rows[row_number]["status"] = status
+
+    def mark_statuses(self, statuses: dict):
+        with self.lock:
+            previous = {row_number: self.read_statuses.get(row_number, "") for row_number in statuses}
+            for row_number, status in count_failures(statuses, previous).items():
+                self.rows[row_number]["status"] = status
+
+    def mark_rows(self, row_numbers: list, status: str):
+        self.mark_statuses({row_number: status for row_number in row_numbers})
+
+    def mark_as_processed(self, row_number: int):
+        self.mark_statuses({row_number: "파싱 완료"})
+
+    def mark_as_calendar_synced(self, row_number: int):
+        self.mark_statuses({row_number: "캘린더 등록 완료"})
+
+    def flush(self):
+        pass
+
+
+class Crash(BaseException):
+    """프로세스 강제 종료 흉내 (에이전트의 except Exception에 잡히지 않음)"""
+
+
+class FakeCalendarHandler:
+    """events.insert 호출을 세는 캘린더 (같은 이벤트 ID는 409처럼 기존 ID 반환)"""
+
+    inserts = []        # events.insert를 호출한 이벤트 ID (호출 순서)
+    events = {}         # 이벤트 ID → 일정 정보
+    crash_after = None  # 이 횟수만큼 등록한 뒤 다음 등록 요청에서 Crash 발생
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    @classmethod
+    def reset(cls):
+        cls.inserts = []
+        cls.events = {}
+        cls.crash_after = None
+
+    def create_event(self, event_info: dict) -> str:
+        with self.lock:
+            if self.crash_after is not None and len(self.inserts) >= self.crash_after:
+                # crash_after번 등록한 뒤 다음 등록 요청에서 종료
+                raise Crash(f"{self.crash_after}번째 등록 후 종료")
+            event_id = event_info["event_id"]
+            self.inserts.append(event_id)
+            self.events.setdefault(event_id, dict(event_info))
+        return event_id
+
+    def create_events(self, event_infos: list) -> list:
+        # 배치 요청 하나는 한 번의 HTTP 호출이므로 전부 등록되거나 보내기 전에 종료
+        with self.lock:
+            if self.crash_after is not None and len(self.inserts) + len(event_infos) > self.crash_after:
+                raise Crash(f"{self.crash_after}번째 등록 후 종료")
+            for event_info in event_infos:
+                self.inserts.append(event_info["event_id"])
+                self.events.setdefault(event_info["event_id"], dict(event_info))
+        return [(event_info["event_id"], None) for event_info in event_infos]
+
+
+class FakeParser:
+    """LLM 대신 "제목|날짜|시간" 형식의 텍스트를 나누는 파서 (호출 수를 셈)"""
+
+    calls = []  # 파싱한 텍스트 (호출 순서)
+    lock = threading.Lock()
+
+    def __init__(self, option=None):
+        pass
+
+    def parse_event_text(self, text: str) -> dict:
+        with self.lock:
+            self.calls.append(text)
+        title, date, time = (text.split("|") + ["", ""])[:3]
+        return {"title": title, "date": date, "time": time, "location": "", "description": "", "notes": ""}
+
+    async def aparse_event_text(self, text: str) -> dict:
+        return self.parse_event_text(text)
+
+    def parse_many(self, texts: list) -> list:
+        return [self.parse_event_text(text) for text in texts]
+
+
+parser_backends.register_backend("fake")(FakeParser)
+agents.sheets_agent.GoogleSheetsHandler = FakeSheetsHandler
+main.GoogleSheetsHandler = FakeSheetsHandler
+agents.calendar_agent.GoogleCalendarHandler = FakeCalendarHandler
+
+
+def synthetic_rows(count: int) -> list:
+    """서로 다른 날짜/시간을 가진 합성 행 텍스트"""
+    return [
+        f"행사 {index}|2030-{index % 12 + 1:02d}-{index % 28 + 1:02d}|{index % 24:02d}:{index % 60:02d}"
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def sheet():
+    """빈 가짜 시트, 캘린더, 파서 기록, 캘린더 등록 기록으로 시작"""
+    FakeSheetsHandler.load([])
+    FakeCalendarHandler.reset()
+    FakeParser.calls = []
+    event_registry.path = os.path.join(tempfile.mkdtemp(dir=_TMP), "event_registry.sqlite3")
+    event_registry._conn = None
+    yield FakeSheetsHandler
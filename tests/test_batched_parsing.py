@@ -0,0 +1,97 @@
+"""
+EventParser.parse_many의 묶음 요청 확인
+
+OpenAI 대신 프롬프트에서 "제목|날짜|시간" 텍스트를 꺼내 JSON으로 답하는 가짜 채팅 요청을 씁니다.
+"""
+import re
+import json
+from types import SimpleNamespace
+import pytest
+import event_parser
+from event_parser import EventParser
+from progress import capture
+
+
+def response(payload: dict):
+    """chat.completions.create 응답 흉내"""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(payload)))])
+
+
+def fields(text: str) -> dict:
+    title, date, time = text.split("|")
+    return {"title": title, "date": date, "time": time}
+
+
+class StubChatParser(EventParser):
+    """
+    요청(묶음/개별)을 기록하고 프롬프트의 텍스트를 그대로 파싱해 답하는 EventParser
+
+    묶음 응답은 index를 붙여 입력의 역순으로 답하며, batch_reply로 묶음 요청의 실패("error")나
+    항목이 하나 모자란 응답("short")을 흉내냅니다.
+    """
+
+    def __init__(self, batch_reply: str = "ok"):
+        super().__init__()
+        self.batch_reply = batch_reply
+        self.requests = []
+
+    def _chat(self, name: str, messages: list, events: int = 1):
+        content = messages[1]["content"]
+        if name == "openai.chat_batch":
+            texts = [text for _, text in re.findall(r"### 텍스트 (\d+)\n(.*)", content)]
+            self.requests.append(texts)
+            if self.batch_reply == "error":
+                raise RuntimeError("500 Internal Server Error")
+            events = [{"index": index, **fields(text)} for index, text in enumerate(texts, 1)][::-1]
+            if self.batch_reply == "short":
+                events = events[1:]
+            return response({"events": events})
+
+        text = content.split("\n\n")[1]
+        self.requests.append([text])
+        return response(fields(text))
+
+
+TEXTS = [f"행사 {index}|2030-01-{index + 1:02d}|{index + 8:02d}:00" for index in range(7)]
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return StubChatParser
+
+
+def test_pack_events_reach_the_callers_capture_sink(parser):
+    stub = parser(batch_reply="error")
+    events = []
+    with capture(events.append):
+        results = stub.parse_many(["검진|2030-01-02|10:00", "설명회|2030-02-03|14:00"])
+
+    # 묶음 스레드에서 낸 경고도 호출한 쪽의 수신자로 전달
+    assert [event["message"] for event in events if event["stage"] == "parse"][0].startswith("묶음 파싱 오류")
+    assert [result["title"] for result in results] == ["검진", "설명회"]
+
+
+def test_texts_are_packed_into_few_requests_in_input_order(parser, monkeypatch):
+    monkeypatch.setattr(event_parser, "PARSE_BATCH_MAX_ITEMS", 3)
+    stub = parser()
+    texts = TEXTS[:4] + [TEXTS[1]] + TEXTS[4:]
+
+    results = stub.parse_many(texts)
+
+    # 같은 텍스트는 한 번만 요청하고, 묶음은 PARSE_BATCH_MAX_ITEMS개씩 (묶음끼리는 동시에 요청)
+    assert sorted(stub.requests) == sorted([TEXTS[:3], TEXTS[3:6], TEXTS[6:]])
+    assert [(result["title"], result["date"]) for result in results] == [
+        tuple(text.split("|")[:2]) for text in texts
+    ]
+
+
+def test_mismatched_batch_response_falls_back_to_single_requests(parser):
+    stub = parser(batch_reply="short")
+
+    results = stub.parse_many(TEXTS[:3])
+
+    assert stub.requests[0] == TEXTS[:3]
+    assert sorted(stub.requests[1:]) == [[text] for text in TEXTS[:3]]
+    assert [result["title"] for result in results] == ["행사 0", "행사 1", "행사 2"]
+    assert not any("error" in result for result in results)
@@ -0,0 +1,60 @@
+"""
+청크 모드 드라이버(ChunkedWorkflowRunner.stream)의 이벤트 전달과 정리, 전체 읽기와 같은 결과 확인
+"""
+import os
+import pytest
+import main
+from event_registry import event_registry
+from workflow import ChunkedWorkflowRunner
+from agents.sheets_agent import SheetsAgent
+from conftest import Crash, FakeCalendarHandler, synthetic_rows
+
+
+def test_row_events_arrive_before_chunk_done(sheet):
+    sheet.load(synthetic_rows(7))
+    runner = ChunkedWorkflowRunner(chunk_size=3, page_size=100)
+
+    stages = [payload["stage"] for kind, payload in runner.stream({}) if kind == "progress"]
+
+    chunk_ends = [index for index, stage in enumerate(stages) if stage == "chunk"]
+    assert len(chunk_ends) == 3
+    assert stages[-1] == "chunk"
+    assert stages.count("mark_synced") + stages.count("calendar") >= 7
+
+
+def test_failed_row_closes_the_page_reader(sheet):
+    sheet.load(synthetic_rows(10))
+    FakeCalendarHandler.crash_after = 3
+    runner = ChunkedWorkflowRunner(chunk_size=2, page_size=100)
+    closed = []
+
+    def pages(page_size):
+        try:
+            yield from SheetsAgent.iter_unprocessed_events(runner.sheets_agent, page_size)
+        finally:
+            closed.append(True)
+
+    runner.sheets_agent.iter_unprocessed_events = pages
+    with pytest.raises(Crash) as error:
+        list(runner.stream({}))
+
+    # 예외의 traceback이 드라이버 프레임을 잡고 있어도 페이지 읽기는 이미 닫혀 있어야 함
+    assert error.traceback and closed == [True]
+
+
+def test_chunked_run_matches_a_full_read_run(sheet, tmp_path):
+    rows = synthetic_rows(17) + ["날짜 없는 문자||"]
+
+    def run(argv: list) -> tuple:
+        sheet.load(rows)
+        FakeCalendarHandler.reset()
+        event_registry.path = os.path.join(tmp_path, f"{len(argv)}.sqlite3")
+        event_registry._conn = None
+        main.main(argv)
+        return (
+            {row_number: (row["fields"], row["status"]) for row_number, row in sheet.rows.items()},
+            sorted(FakeCalendarHandler.inserts),
+        )
+
+    # 페이지/청크 경계가 행 수와 맞지 않도록 나눠 읽어도 한 번에 읽은 실행과 결과가 같음
+    assert run(["--chunked", "--chunk-size", "3", "--page-size", "4"]) == run([])
@@ -0,0 +1,68 @@
+"""
+데몬 모드가 캘린더 등록에 실패한 행을 시트가 바뀌지 않아도 다시 처리하고,
+건너뜀으로 끝난 행은 실패로 보지 않는지 확인
+"""
+import pytest
+import main
+from conftest import FakeCalendarHandler, synthetic_rows
+
+
+class Stop(BaseException):
+    """정해진 주기만큼 돈 뒤 데몬 루프 종료"""
+
+
+def quiet(event: dict):
+    pass
+
+
+def test_daemon_retries_rows_that_failed(sheet, monkeypatch):
+    rows = synthetic_rows(3)
+    sheet.load(rows)
+
+    # 첫 등록 요청만 실패
+    create_event = FakeCalendarHandler.create_event
+    attempts = []
+
+    def flaky_create_event(self, event_info: dict) -> str:
+        attempts.append(event_info["event_id"])
+        if len(attempts) == 1:
+            raise RuntimeError("503 Service Unavailable")
+        return create_event(self, event_info)
+
+    monkeypatch.setattr(FakeCalendarHandler, "create_event", flaky_create_event)
+
+    cycles = []
+
+    def sleep(seconds):
+        cycles.append(seconds)
+        if len(cycles) == 3:
+            raise Stop()
+
+    monkeypatch.setattr(main.time, "sleep", sleep)
+    with pytest.raises(Stop):
+        main.run_daemon(main.parse_args(["--daemon", "--interval", "0"]), quiet)
+
+    # 실패한 행 하나만 다음 주기에 다시 등록
+    assert len(attempts) == 4
+    assert len(FakeCalendarHandler.inserts) == len(set(FakeCalendarHandler.inserts)) == 3
+    assert set(sheet.statuses().values()) == {"캘린더 등록 완료"}
+
+
+def test_daemon_does_not_back_off_on_skipped_rows(sheet, monkeypatch, capsys):
+    sheet.load(synthetic_rows(2) + ["날짜 없는 문자||"])
+
+    cycles = []
+
+    def sleep(seconds):
+        cycles.append(seconds)
+        if len(cycles) == 2:
+            raise Stop()
+
+    monkeypatch.setattr(main.time, "sleep", sleep)
+    with pytest.raises(Stop):
+        main.run_daemon(main.parse_args(["--daemon", "--interval", "0"]), quiet)
+
+    # 건너뜀으로 끝난 행은 실패가 아니므로 재시도를 예약하지 않고 다시 처리하지도 않음
+    assert sheet.statuses()[4] == "건너뜀 (날짜 없음)"
+    assert len(FakeCalendarHandler.inserts) == 2
+    assert "다시 처리합니다" not in capsys.readouterr().out
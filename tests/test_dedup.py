@@ -0,0 +1,54 @@
+"""
+중복 인덱스가 시트별로 나뉘고, 행 삽입/삭제로 행 번호가 바뀌어도 잘못된 "중복 (행 N)"을 내지 않는지 확인
+"""
+import os
+import tempfile
+from dedup import DedupIndex
+
+TEXT = "[Web발신] 2030년 5월 3일 오후 2시 시민회관 대강당 봄맞이 음악회에 초대합니다."
+OTHER = "[Web발신] 2030년 6월 9일 오전 10시 구민체육관 주민 건강걷기 대회 안내"
+
+
+def make_index(sheet: str = "sheet-a\x1fSheet1", path: str = None) -> DedupIndex:
+    path = path or os.path.join(tempfile.mkdtemp(), "dedup.sqlite3")
+    return DedupIndex(path, sheet=sheet)
+
+
+def test_copy_of_text_points_at_original_row():
+    index = make_index()
+    rows = {2: TEXT, 7: TEXT}
+    assert index.claim_text(2, TEXT, row_text=rows.get) is None
+    assert index.claim_text(7, TEXT, row_text=rows.get) == 2
+
+
+def test_sheets_sharing_a_file_do_not_collide():
+    path = os.path.join(tempfile.mkdtemp(), "dedup.sqlite3")
+    first = make_index("sheet-a\x1fSheet1", path)
+    second = make_index("sheet-b\x1fSheet1", path)
+    assert first.claim_text(2, TEXT) is None
+    assert second.claim_text(2, TEXT) is None
+    assert second.claim_text(5, TEXT) == 2
+    assert first.claim_event(2, TEXT, "봄맞이 음악회", "2030-05-03", "14:00") is None
+    assert second.claim_event(2, TEXT, "봄맞이 음악회", "2030-05-03", "14:00") is None
+
+
+def test_row_shift_is_not_a_duplicate():
+    index = make_index()
+    assert index.claim_text(4, TEXT, row_text={4: TEXT}.get) is None
+
+    # 위쪽에 행이 삽입되어 같은 문자가 5행으로, 4행에는 다른 문자가 옴
+    rows = {4: OTHER, 5: TEXT}
+    assert index.claim_text(5, TEXT, row_text=rows.get) is None
+    assert index.claim_text(4, OTHER, row_text=rows.get) is None
+
+    # 옮겨진 행 번호를 원본 위치로 기록
+    rows[9] = TEXT
+    assert index.claim_text(9, TEXT, row_text=rows.get) == 5
+
+
+def test_same_text_reclaimed_after_failure_is_not_its_own_event_duplicate():
+    index = make_index()
+    assert index.claim_event(4, TEXT, "봄맞이 음악회", "2030-05-03", "14:00") is None
+    # 행이 옮겨진 뒤 같은 문자를 다시 등록
+    assert index.claim_event(5, TEXT, "봄맞이 음악회", "2030-05-03", "14:00") is None
+    assert index.claim_event(8, OTHER + " 재안내", "봄맞이 음악회", "2030-05-03", "14:00") == (5, "")
@@ -0,0 +1,56 @@
+"""
+정답 세트(golden_set.py)로 규칙 추출기와 입력 축약의 제목/날짜/시간/장소 정확도 확인
+"""
+import pytest
+from golden_set import GOLDEN_TODAY, MIN_ACCURACY, REQUIRED_CORRECT, load_golden_set, field_accuracy, mismatches
+from rule_extractor import extract_event, is_confident
+from condenser import condense
+
+GOLDEN = load_golden_set()
+
+
+def test_rule_extractor_accuracy():
+    results = [extract_event(text, GOLDEN_TODAY)[0] for text, _ in GOLDEN]
+    accuracy = field_accuracy(results, [answer for _, answer in GOLDEN])
+    for field, minimum in MIN_ACCURACY.items():
+        assert accuracy[field] >= minimum, (field, accuracy)
+
+
+def test_fast_path_results_have_correct_date_and_time():
+    # LLM을 생략하는 기본 기준(0.8) 이상의 결과는 날짜/시간이 모두 정답이어야 함
+    for text, answer in GOLDEN:
+        result, confidence = extract_event(text, GOLDEN_TODAY)
+        if is_confident(result, confidence, 0.8):
+            wrong = mismatches(result, answer)
+            assert not any(field in wrong for field in REQUIRED_CORRECT), (result["title"], wrong)
+
+
+@pytest.mark.parametrize("max_tokens", [800, 200, 120])
+def test_condensed_input_keeps_golden_fields(max_tokens):
+    results = []
+    for text, answer in GOLDEN:
+        condensed, _ = condense(text, max_tokens)
+        result = extract_event(condensed, GOLDEN_TODAY)[0]
+        results.append(result)
+        # 원문에서 맞던 필드는 축약한 입력에서도 정답이어야 함
+        expected_wrong = set(mismatches(extract_event(text, GOLDEN_TODAY)[0], answer))
+        assert set(mismatches(result, answer)) <= expected_wrong, (text.splitlines()[0], max_tokens)
+
+    accuracy = field_accuracy(results, [answer for _, answer in GOLDEN])
+    for field, minimum in MIN_ACCURACY.items():
+        assert accuracy[field] >= minimum, (field, accuracy)
+
+
+def test_condenser_shrinks_golden_set_without_falling_back():
+    # 기본 예산에서는 원문으로 되돌리지 않고 실제로 축약한 입력으로 위 정답을 맞춰야 함
+    stats = [condense(text, 800)[1] for text, _ in GOLDEN]
+    assert not any(item["guarded"] for item in stats)
+    assert sum(item["tokens_after"] for item in stats) < sum(item["tokens_before"] for item in stats)
+
+
+def test_ad_mark_is_dropped_but_subject_line_kept():
+    text = "(광고)[한빛학원] 학부모 설명회 안내\n2030년 5월 3일 오후 7시 본관 3층\n무료수신거부 080-111-2222"
+    condensed, stats = condense(text, 800)
+    assert condensed.splitlines()[0] == "[한빛학원] 학부모 설명회 안내"
+    assert not stats["guarded"]
+    assert extract_event(condensed)[0]["title"] == extract_event(text)[0]["title"] == "한빛학원 학부모 설명회"
@@ -0,0 +1,41 @@
+"""
+--json-events 출력이 JSON 줄로만 이루어지는지 확인
+
+사람이 읽는 출력(시작 배너, 모드 안내, 요약 등)은 표준 오류로 가야 다른 프로그램이
+표준 출력을 한 줄씩 JSON으로 읽을 수 있습니다.
+"""
+import json
+import pytest
+import main
+from conftest import synthetic_rows
+
+
+@pytest.mark.parametrize("argv", [[], ["--batched", "--batch-size", "5"], ["--chunked"], ["--async"]])
+def test_stdout_is_json_lines_only(sheet, capsys, argv):
+    sheet.load(synthetic_rows(12))
+
+    main.main(["--json-events"] + argv)
+
+    out, err = capsys.readouterr()
+    events = [json.loads(line) for line in out.splitlines()]
+    assert {"stage", "status", "row", "message"} <= set(events[0])
+    assert any(event["stage"] == "calendar" and event["status"] == "done" for event in events)
+    assert "🤖 LangGraph 멀티에이전트 이벤트 처리 시작" in err
+
+
+def test_sheet_write_flush_is_a_progress_event(capsys):
+    from google_sheets_handler import SheetHandle, WriteBuffer
+    from progress import capture
+
+    class Worksheet:
+        def batch_update(self, ranges):
+            self.ranges = ranges
+
+    events = []
+    buffer = WriteBuffer("json-events-test", SheetHandle(Worksheet), max_rows=100, max_delay_ms=0, journal_dir="")
+    with capture(events.append):
+        buffer.stage({2: {8: "캘린더 등록 완료"}})
+        buffer.flush()
+
+    assert capsys.readouterr().out == ""
+    assert [(event["stage"], event["status"], event["count"]) for event in events] == [("sheets", "done", 1)]
@@ -0,0 +1,42 @@
+"""
+수천 개 행의 백로그를 한 번의 실행으로 처리하는지 확인
+
+순차/배치 모드는 미처리 행 수에 맞춘 recursion_limit으로, 청크 모드는 행 수와 무관한
+그래프 깊이로 전체 백로그를 GraphRecursionError 없이 끝내야 합니다.
+"""
+import uuid
+import pytest
+import main
+from workflow import recursion_limit_for, MIN_RECURSION_LIMIT
+from conftest import FakeCalendarHandler, FakeParser, synthetic_rows
+
+
+def run(argv: list) -> dict:
+    """main과 같은 설정으로 새 실행을 끝까지 진행하고 최종 상태 반환"""
+    args = main.parse_args(argv)
+    config = main.make_config(args, uuid.uuid4().hex, main.count_pending(args))
+    return main.run_workflow(args, main.new_initial_state(), config, on_event=lambda event: None)
+
+
+@pytest.mark.parametrize("argv, rows", [
+    ([], 1500),
+    (["--batched", "--batch-size", "20"], 3000),
+    (["--chunked", "--chunk-size", "100", "--page-size", "500"], 5000),
+])
+def test_backlog_finishes_in_one_invocation(sheet, argv, rows):
+    sheet.load(synthetic_rows(rows))
+
+    result = run(argv)
+
+    assert result["processed_count"] == rows
+    assert result["success_count"] == rows
+    assert len(FakeParser.calls) == rows
+    assert len(set(FakeCalendarHandler.inserts)) == len(FakeCalendarHandler.inserts) == rows
+    assert set(sheet.statuses().values()) == {"캘린더 등록 완료"}
+
+
+def test_recursion_limit_grows_with_backlog():
+    assert recursion_limit_for(0) == MIN_RECURSION_LIMIT
+    # 행(배치)마다 7 슈퍼스텝: 순차 10,000행 / 배치(20개씩) 10,000행
+    assert recursion_limit_for(10_000) > 7 * 10_000
+    assert recursion_limit_for(10_000, 20) > 7 * 500
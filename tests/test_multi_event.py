@@ -0,0 +1,61 @@
+"""
+일정이 여러 개인 행이 일정마다 캘린더 이벤트 하나씩으로 등록되는지 확인
+
+";"로 나눈 일정마다 "날짜|시간"을 적은 텍스트를 EventParser의 다중 일정 형식(events)으로 파싱하는
+백엔드를 씁니다.
+"""
+import uuid
+import pytest
+import main
+import parser_backends
+from conftest import FakeCalendarHandler, FakeParser
+
+ROWS = [
+    "왕복 항공권|2030-03-01|09:00;2030-03-05|18:00",
+    "진료 예약|2030-04-02|10:00;2030-04-09|10:00;2030-04-16|10:30",
+    "설명회|2030-05-20|14:00",
+]
+
+
+class MultiEventParser(FakeParser):
+    """"제목|날짜|시간;날짜|시간;..."을 일정 목록으로 파싱"""
+
+    def parse_event_text(self, text: str) -> dict:
+        title, rest = text.split("|", 1)
+        events = [
+            {**FakeParser.parse_event_text(self, f"{title}|{part}"), "title": f"{title} {index + 1}"}
+            for index, part in enumerate(rest.split(";"))
+        ]
+        result = dict(events[0])
+        if len(events) > 1:
+            result["events"] = events
+        return result
+
+
+parser_backends.register_backend("multi")(MultiEventParser)
+
+
+def quiet(event: dict):
+    pass
+
+
+@pytest.mark.parametrize("argv", [[], ["--parallel"], ["--batched", "--batch-size", "2"], ["--async"]],
+                         ids=["sequential", "parallel", "batched", "async"])
+def test_each_event_in_a_row_becomes_a_calendar_event(sheet, monkeypatch, argv):
+    monkeypatch.setattr(parser_backends, "PARSER_BACKEND", "multi")
+    sheet.load(ROWS)
+    args = main.parse_args(argv)
+
+    result = main.run_workflow(args, main.new_initial_state(), main.make_config(args, uuid.uuid4().hex, len(ROWS)),
+                               on_event=quiet)
+
+    events = list(FakeCalendarHandler.events.values())
+    assert len(FakeCalendarHandler.inserts) == len(set(FakeCalendarHandler.inserts)) == 6
+    assert sorted((event["source_row"], event["part"], event["date"]) for event in events) == [
+        (2, 0, "2030-03-01"), (2, 1, "2030-03-05"),
+        (3, 0, "2030-04-02"), (3, 1, "2030-04-09"), (3, 2, "2030-04-16"),
+        (4, 0, "2030-05-20"),
+    ]
+    assert {event["title"] for event in events if event["source_row"] == 2} == {"왕복 항공권 1", "왕복 항공권 2"}
+    assert result["success_count"] == len(ROWS)
+    assert set(sheet.statuses().values()) == {"캘린더 등록 완료"}
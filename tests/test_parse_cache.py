@@ -0,0 +1,75 @@
+"""
+파싱 캐시가 다른 날 다시 실행해도 적중하는지 확인
+
+연도가 없는 텍스트를 하루 실행하고, 몇 달 뒤 같은 텍스트로 다시 실행했을 때
+LLM을 다시 호출하지 않고 캐시 결과의 연도만 새 기준 날짜로 보정해야 합니다.
+"""
+import os
+import re
+import uuid
+from datetime import date
+import pytest
+import main
+import event_parser
+import parser_backends
+from event_parser import EventParser, _to_result
+from parse_cache import ParseCache
+from conftest import FakeCalendarHandler
+
+TEXTS = ["치과 검진|3월 10일|10:00", "학부모 설명회|11월 20일|14:30"]
+
+
+class StubLLMParser(EventParser):
+    """OpenAI 요청 대신 "제목|M월 D일|시간"을 기준 날짜의 연도로 파싱하는 EventParser (호출 수를 셈)"""
+
+    calls = []
+
+    def _complete(self, text: str) -> dict:
+        self.calls.append(text)
+        title, day, time = text.split("|")
+        month, day = map(int, re.findall(r"\d+", day))
+        today = event_parser.date.today()
+        return _to_result({"title": title, "date": f"{today.year}-{month:02d}-{day:02d}", "time": time}, text)
+
+    def _parse_pack(self, pack: list) -> list:
+        return [self._complete(text) for _, text, _ in pack]
+
+
+parser_backends.register_backend("stub-llm")(StubLLMParser)
+
+
+def on(day: date):
+    """date.today()가 day를 돌려주는 date 하위 클래스"""
+    class Fixed(date):
+        @classmethod
+        def today(cls):
+            return day
+    return Fixed
+
+
+def quiet(event: dict):
+    pass
+
+
+@pytest.mark.parametrize("argv", [[], ["--batched"]], ids=["sequential", "batched"])
+def test_warm_rerun_on_a_later_day_makes_no_llm_call(sheet, monkeypatch, tmp_path, argv):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(parser_backends, "PARSER_BACKEND", "stub-llm")
+    monkeypatch.setattr(event_parser, "parse_cache", ParseCache(os.path.join(tmp_path, "parse_cache.sqlite3")))
+    StubLLMParser.calls = []
+    args = main.parse_args(argv)
+
+    def run(day: date) -> list:
+        monkeypatch.setattr(event_parser, "date", on(day))
+        sheet.load(TEXTS)
+        FakeCalendarHandler.reset()
+        main.run_workflow(args, main.new_initial_state(), main.make_config(args, uuid.uuid4().hex), on_event=quiet)
+        return [row["fields"]["date"] for _, row in sorted(sheet.rows.items())]
+
+    assert run(date(2026, 1, 5)) == ["2026-03-10", "2026-11-20"]
+    assert len(StubLLMParser.calls) == len(TEXTS)
+
+    # 두 번째 실행은 모두 캐시 적중, 지난 날짜만 다음 해로 보정
+    StubLLMParser.calls = []
+    assert run(date(2026, 6, 1)) == ["2027-03-10", "2026-11-20"]
+    assert StubLLMParser.calls == []
@@ -0,0 +1,55 @@
+"""
+파서 백엔드 인터페이스와 행 종류별 경로 확인
+"""
+import pytest
+import parser_backends
+from parser_backends import ParserBackend, create_backend, register_backend, row_class
+
+
+class Named(ParserBackend):
+    """결과 제목에 백엔드 이름을 적고 parse_many 호출을 기록"""
+
+    def __init__(self, option=None):
+        self.name = option
+        self.batches = []
+
+    def parse_event_text(self, text: str) -> dict:
+        return {"title": f"{self.name}:{text}", "date": "", "time": "", "location": "", "description": "", "notes": ""}
+
+    def parse_many(self, texts: list) -> list:
+        self.batches.append(list(texts))
+        return super().parse_many(texts)
+
+
+register_backend("named")(Named)
+
+SHORT = "짧은 문자"
+LONG = "긴 문자 " + "본문 " * 200
+
+
+def test_backend_must_implement_parse_event_text():
+    class Incomplete(ParserBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_routes_send_each_row_class_to_its_backend(monkeypatch):
+    monkeypatch.setattr(parser_backends, "PARSER_RECORD_FILE", "")
+    assert (row_class(SHORT), row_class(LONG)) == ("short", "long")
+
+    backend = create_backend("named:default", routes="long=named:big")
+    assert backend.parse_event_text(SHORT)["title"] == f"default:{SHORT}"
+    assert backend.parse_event_text(LONG)["title"] == f"big:{LONG}"
+
+    # 묶음 파싱은 백엔드마다 한 번씩 보내고 입력 순서대로 결과를 돌려줌
+    results = backend.parse_many([LONG, SHORT, LONG])
+    assert [result["title"].split(":")[0] for result in results] == ["big", "default", "big"]
+    assert backend.routes["long"].batches == [[LONG, LONG]]
+    assert backend.default.batches == [[SHORT]]
+
+
+def test_unknown_row_class_is_rejected():
+    with pytest.raises(ValueError):
+        create_backend("named", routes="huge=named")
@@ -0,0 +1,47 @@
+"""
+처리된 이벤트 이력(PROCESSED_EVENTS_LOG)이 재개 후에도 행마다 한 줄씩만 남는지 확인
+
+이력 파일은 리듀서가 아니라 단계가 기록된 뒤 드라이버가 쓰므로, 중단된 실행을 재개해도
+이미 완료된 노드의 결과가 다시 기록되지 않아야 합니다.
+"""
+import json
+import uuid
+import pytest
+import main
+import agents.state
+from agents.state import keep_last, AgentState
+from typing import get_type_hints
+from conftest import Crash, FakeCalendarHandler, synthetic_rows
+
+ROWS = 12
+
+
+def test_processed_events_reducer_is_pure(tmp_path, monkeypatch):
+    monkeypatch.setattr(agents.state, "PROCESSED_EVENTS_LOG", str(tmp_path / "log.jsonl"))
+    reducer = get_type_hints(AgentState, include_extras=True)["processed_events"].__metadata__[0]
+
+    assert reducer([{"row_number": 1}], [{"row_number": 2}]) == [{"row_number": 1}, {"row_number": 2}]
+    assert keep_last(2)([1, 2], [3]) == [2, 3]
+    assert not (tmp_path / "log.jsonl").exists()
+
+
+@pytest.mark.parametrize("argv", [[], ["--parallel"], ["--batched", "--batch-size", "5"], ["--chunked"]])
+def test_log_has_one_line_per_row_after_resume(sheet, tmp_path, monkeypatch, argv):
+    log_path = tmp_path / "processed.jsonl"
+    monkeypatch.setattr(agents.state, "PROCESSED_EVENTS_LOG", str(log_path))
+    sheet.load(synthetic_rows(ROWS))
+    args = main.parse_args(argv)
+    config = main.make_config(args, uuid.uuid4().hex, ROWS)
+
+    if not args.chunked:
+        # 중간에 종료된 뒤 같은 thread_id로 재개
+        FakeCalendarHandler.crash_after = ROWS // 2
+        with pytest.raises(Crash):
+            main.run_workflow(args, main.new_initial_state(), config, on_event=lambda event: None)
+        FakeCalendarHandler.crash_after = None
+        main.run_workflow(args, None, config, on_event=lambda event: None)
+    else:
+        main.run_workflow(args, main.new_initial_state(), config, on_event=lambda event: None)
+
+    rows = [json.loads(line)["row_number"] for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert sorted(rows) == list(range(2, ROWS + 2))
@@ -0,0 +1,81 @@
+"""
+속도 제한기의 429/5xx 재시도와 Retry-After 처리 확인
+
+실제로 기다리지 않도록 rate_limiter.time.sleep을 대기 시간 기록으로 바꿉니다.
+"""
+from types import SimpleNamespace
+import pytest
+import rate_limiter
+from rate_limiter import RateLimiter
+
+
+class StatusError(Exception):
+    """status_code와 응답 헤더를 가진 API 오류 (openai.APIStatusError 흉내)"""
+
+    def __init__(self, status: int, headers: dict = None):
+        super().__init__(f"{status} error")
+        self.status_code = status
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    waited = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", waited.append)
+    return waited
+
+
+def flaky(*errors):
+    """errors를 차례로 발생시킨 뒤 "ok"를 반환하는 함수와 호출 기록"""
+    calls = []
+
+    def fn():
+        calls.append(True)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return "ok"
+
+    return fn, calls
+
+
+def test_429_waits_for_retry_after_and_slows_down(sleeps):
+    limiter = RateLimiter("test", requests_per_minute=600, max_retries=3)
+    fn, calls = flaky(StatusError(429, {"retry-after": "7"}))
+
+    assert limiter.call(fn) == "ok"
+    assert len(calls) == 2
+    assert 7 in sleeps
+    # 제한 응답을 받으면 속도를 절반으로 줄이고 성공하면 조금 회복
+    bucket = limiter._buckets["requests"]
+    assert bucket.rate < bucket.max_rate
+
+
+def test_retry_after_is_capped_by_max_delay(sleeps):
+    limiter = RateLimiter("test", requests_per_minute=0, max_retries=1, max_delay=30)
+    fn, _ = flaky(StatusError(429, {"retry-after": "3600"}))
+
+    assert limiter.call(fn) == "ok"
+    assert sleeps == [0.0, 30, 0.0]
+
+
+def test_5xx_without_retry_after_uses_exponential_backoff(sleeps):
+    limiter = RateLimiter("test", requests_per_minute=0, max_retries=3, base_delay=1.0)
+    fn, calls = flaky(StatusError(503), StatusError(503))
+
+    assert limiter.call(fn) == "ok"
+    backoffs = sleeps[1::2][:2]
+    assert len(calls) == 3
+    assert 0 <= backoffs[0] <= 1.0 and 0 <= backoffs[1] <= 2.0
+
+
+def test_gives_up_after_max_retries_and_does_not_retry_client_errors(sleeps):
+    limiter = RateLimiter("test", requests_per_minute=0, max_retries=2)
+    fn, calls = flaky(*[StatusError(429)] * 5)
+    with pytest.raises(StatusError):
+        limiter.call(fn)
+    assert len(calls) == 3
+
+    fn, calls = flaky(StatusError(400))
+    with pytest.raises(StatusError):
+        limiter.call(fn)
+    assert len(calls) == 1
@@ -0,0 +1,45 @@
+"""
+중단된 실행을 재개할 때 이미 끝난 작업을 반복하지 않는지 확인
+
+N번째 캘린더 등록 뒤 프로세스가 종료된 것처럼 Crash를 일으키고, 같은 thread_id로
+재개했을 때 LLM 파싱과 events.insert가 행마다 한 번씩만 호출되어야 합니다.
+"""
+import uuid
+import pytest
+import main
+from conftest import Crash, FakeCalendarHandler, FakeParser, synthetic_rows
+
+ROWS = 30
+CRASH_AFTER = 11
+
+MODES = [
+    [],
+    ["--parallel"],
+    ["--batched", "--batch-size", "4"],
+    ["--async"],
+]
+
+
+def quiet(event: dict):
+    pass
+
+
+@pytest.mark.parametrize("argv", MODES, ids=["sequential", "parallel", "batched", "async"])
+def test_resume_repeats_no_llm_call_or_insert(sheet, argv):
+    sheet.load(synthetic_rows(ROWS))
+    args = main.parse_args(argv)
+    config = main.make_config(args, uuid.uuid4().hex, ROWS)
+
+    FakeCalendarHandler.crash_after = CRASH_AFTER
+    with pytest.raises(Crash):
+        main.run_workflow(args, main.new_initial_state(), config, on_event=quiet)
+    assert 0 < len(FakeCalendarHandler.inserts) <= CRASH_AFTER
+
+    FakeCalendarHandler.crash_after = None
+    result = main.run_workflow(args, None, config, on_event=quiet)
+
+    # 재개한 실행은 아직 파싱/등록하지 않은 행만 처리
+    assert len(FakeParser.calls) == len(set(FakeParser.calls)) == ROWS
+    assert len(FakeCalendarHandler.inserts) == len(set(FakeCalendarHandler.inserts)) == ROWS
+    assert result["success_count"] == ROWS
+    assert set(sheet.statuses().values()) == {"캘린더 등록 완료"}
@@ -0,0 +1,57 @@
+"""
+계속 실패하는 행이 ROW_MAX_ATTEMPTS번째 실패에서 끝난 행으로 기록되는지 확인
+"""
+import uuid
+import main
+from conftest import FakeCalendarHandler, synthetic_rows
+from row_status import count_failures, migrate_status, needs_work
+
+
+def quiet(event: dict):
+    pass
+
+
+def test_failure_count_grows_until_row_is_given_up():
+    assert count_failures({2: "오류 (캘린더 등록 실패)"}, {}, 3) == {2: "오류 (캘린더 등록 실패, 1회)"}
+    assert count_failures({2: "오류 (캘린더 등록 실패)"}, {2: "오류 (캘린더 등록 실패, 1회)"}, 3) == {
+        2: "오류 (캘린더 등록 실패, 2회)"
+    }
+    given_up = count_failures({2: "오류 (파싱 실패)"}, {2: "오류 (캘린더 등록 실패, 2회)"}, 3)
+    assert given_up == {2: "건너뜀 (파싱 실패, 3회 실패)"}
+    assert not needs_work(given_up[2])
+    # 오류가 아닌 상태와 제한 없음(0)
+    assert count_failures({2: "캘린더 등록 완료"}, {2: "오류 (2회)"}, 3) == {2: "캘린더 등록 완료"}
+    assert count_failures({2: "오류"}, {2: "오류 (9회)"}, 0) == {2: "오류 (10회)"}
+
+
+def test_only_statuses_the_old_version_wrote_are_migrated():
+    assert migrate_status("완료") == "건너뜀 (이전 버전에서 완료)"
+    assert migrate_status("완료 (날짜 없음)") is None
+    assert migrate_status("완료 (캘린더 등록 실패)") is None
+
+
+def test_row_that_keeps_failing_stops_being_retried(sheet, monkeypatch):
+    rows = synthetic_rows(2)
+    sheet.load(rows)
+    create_event = FakeCalendarHandler.create_event
+
+    def failing_create_event(self, event_info: dict) -> str:
+        if event_info["title"] == "행사 0":
+            raise RuntimeError("403 Forbidden")
+        return create_event(self, event_info)
+
+    monkeypatch.setattr(FakeCalendarHandler, "create_event", failing_create_event)
+
+    args = main.parse_args([])
+    statuses = []
+    for _ in range(3):
+        main.run_workflow(args, main.new_initial_state(), main.make_config(args, uuid.uuid4().hex, 2), on_event=quiet)
+        statuses.append(sheet.statuses()[2])
+
+    assert statuses == [
+        "오류 (캘린더 등록 실패, 1회)",
+        "오류 (캘린더 등록 실패, 2회)",
+        "건너뜀 (캘린더 등록 실패, 3회 실패)",
+    ]
+    assert sheet.statuses()[3] == "캘린더 등록 완료"
+    assert sheet().read_unprocessed_events() == []
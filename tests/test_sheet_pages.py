@@ -0,0 +1,132 @@
+"""
+청크 모드의 페이지 읽기 확인
+
+- 페이지로 나눠 읽은 미처리 행은 한 번에 읽은 결과와 같아야 합니다.
+- 워크시트 핸들은 SHEETS_HANDLE_TTL 동안 캐시되므로 그 사이 시트에 행이 추가되면 캐시한
+  row_count가 실제보다 작습니다. 마지막 페이지는 끝을 열어 두어 새 행을 놓치지 않아야 합니다.
+- 읽기 시작 행 위쪽에 행이 삽입되면 같은 문자가 연달아 있어도 처음부터 다시 읽어야 합니다.
+- 다음 페이지는 백그라운드 스레드에서 읽으므로, 읽는 중에 낸 진행 이벤트가 받는 쪽으로 가야 합니다.
+"""
+import os
+import re
+import pytest
+import google_sheets_handler as sheets
+from progress import capture
+
+
+class Grid:
+    """A열/H열만 가진 시트 격자 (범위가 격자 밖이면 실제 API처럼 실패)"""
+
+    def __init__(self, rows: list):
+        self.rows = [["원본", "처리 상태"]] + [[text, status] for text, status in rows]
+        self.ranges = []
+
+    def append(self, text: str):
+        self.rows.append([text, ""])
+
+    def open(self):
+        return Worksheet(self)
+
+
+class Worksheet:
+    """gspread 워크시트처럼 row_count는 시트를 연 시점의 격자 행 수"""
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.row_count = len(grid.rows)
+
+    def batch_get(self, ranges: list) -> list:
+        self.grid.ranges.append(ranges[0])
+        result = []
+        for cell_range in ranges:
+            column, start, end = re.match(r"([AH])(\d+):[AH](\d*)$", cell_range).groups()
+            end = int(end) if end else len(self.grid.rows)
+            assert end <= len(self.grid.rows), f"격자 밖 범위: {cell_range}"
+            index = 0 if column == "A" else 1
+            values = [[row[index]] if row[index] else [] for row in self.grid.rows[int(start) - 1:end]]
+            while values and not values[-1]:
+                values.pop()
+            result.append(values)
+        return result
+
+    def batch_update(self, ranges: list):
+        pass
+
+
+def make_handler(grid: Grid, key: str):
+    handler = sheets.GoogleSheetsHandler.__new__(sheets.GoogleSheetsHandler)
+    handler.sheet = sheets.SheetHandle(grid.open)
+    handler.writes = sheets.WriteBuffer(key, handler.sheet, max_delay_ms=0, journal_dir="")
+    handler.cursor_key = key
+    handler.read_statuses = {}
+    return handler
+
+
+def pending_rows(handler, page_size: int) -> list:
+    return [row_number for page in handler.iter_unprocessed_events(page_size) for row_number, _ in page]
+
+
+def test_last_page_reads_rows_added_after_handle_was_cached():
+    grid = Grid([(f"문자 {index}", "캘린더 등록 완료") for index in range(2, 12)])
+    handler = make_handler(grid, "pages-appended")
+    assert pending_rows(handler, 4) == []
+
+    # 캐시한 row_count(11)보다 뒤에 행 추가
+    cached_rows = handler.sheet.get().row_count
+    for index in range(12, 16):
+        grid.append(f"새 문자 {index}")
+    assert handler.sheet.get().row_count == cached_rows
+
+    assert pending_rows(handler, 4) == [12, 13, 14, 15]
+
+
+def test_pages_cover_every_row_once():
+    grid = Grid([(f"문자 {index}", "") for index in range(2, 23)])
+    handler = make_handler(grid, "pages-all")
+
+    assert pending_rows(handler, 5) == list(range(2, 23))
+    assert grid.ranges == ["A1:A5", "A6:A10", "A11:A15", "A16:A20", "A21:A"]
+
+
+def test_prefetched_read_events_reach_the_callers_capture_sink(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheets, "read_cursor", sheets.ReadCursor(os.path.join(tmp_path, "cursor.json")))
+    grid = Grid([(f"문자 {index}", "캘린더 등록 완료") for index in range(2, 12)])
+    handler = make_handler(grid, "pages-events")
+    assert pending_rows(handler, 4) == []
+
+    # 읽기 시작 행 위쪽에 행을 끼워 넣으면 백그라운드 읽기 스레드가 다시 읽기 경고를 냄
+    grid.rows.insert(1, ["끼워 넣은 문자", ""])
+    events = []
+    with capture(events.append):
+        assert pending_rows(handler, 4) == [2]
+    assert [event["status"] for event in events if event["stage"] == "sheets"] == ["warning"]
+
+
+def test_row_inserted_above_mark_is_read_even_if_neighbours_repeat(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheets, "read_cursor", sheets.ReadCursor(os.path.join(tmp_path, "cursor.json")))
+    # 같은 문자가 연달아 있어 한 행만 비교하면 한 칸 밀려도 텍스트가 같음
+    grid = Grid([(f"문자 {index}", "캘린더 등록 완료") for index in range(2, 10)] + [("재발송 문자", "중복 (행 10)")] * 3)
+    handler = make_handler(grid, "pages-inserted")
+    assert pending_rows(handler, 4) == []
+
+    grid.rows.insert(3, ["끼워 넣은 문자", ""])
+    assert pending_rows(handler, 4) == [4]
+
+
+@pytest.mark.parametrize("page_size", [1, 3, 7, 100])
+def test_pages_match_a_full_read(tmp_path, monkeypatch, page_size):
+    monkeypatch.setattr(sheets, "read_cursor", sheets.ReadCursor(os.path.join(tmp_path, "cursor.json")))
+    statuses = ["캘린더 등록 완료", "", "파싱 완료", "건너뜀 (날짜 없음)", "오류 (캘린더 등록 실패, 1회)", "중복 (행 2)"]
+    rows = [(f"문자 {index}" if index % 5 else "", statuses[index % len(statuses)]) for index in range(2, 30)]
+    # 앞쪽은 모두 처리가 끝나 읽기 시작 행이 생기도록 함
+    rows = [(f"처리한 문자 {index}", "캘린더 등록 완료") for index in range(6)] + rows
+
+    expected = make_handler(Grid(rows), f"full-{page_size}").read_unprocessed_events()
+    assert expected
+
+    grid = Grid(rows)
+    handler = make_handler(grid, f"paged-{page_size}")
+    for _ in range(2):  # 두 번째는 기록한 읽기 시작 행부터
+        assert [
+            (row_number, text) for page in handler.iter_unprocessed_events(page_size) for row_number, text in page
+        ] == expected
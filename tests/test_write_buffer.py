@@ -0,0 +1,64 @@
+"""
+시트 쓰기 버퍼(WriteBuffer)의 저널 복구 확인
+
+반영 전에 프로세스가 종료되면 같은 시트의 다음 버퍼가 저널을 읽어 남은 쓰기를 한 번에 반영해야 합니다.
+"""
+import os
+import pytest
+import google_sheets_handler as sheets
+
+
+class Sheet:
+    """batch_update 요청을 기록하는 SheetHandle 대용 (failing이면 반영 실패)"""
+
+    def __init__(self, failing: bool = False):
+        self.failing = failing
+        self.updates = []
+
+    def call(self, metric: str, method: str, *args):
+        assert method == "batch_update"
+        if self.failing:
+            raise RuntimeError("503 Service Unavailable")
+        self.updates.append(args[0])
+
+
+def make_buffer(sheet: Sheet, journal_dir: str) -> sheets.WriteBuffer:
+    # 행 수/시간 기준으로는 반영하지 않아 flush 전에 종료된 것처럼 둠
+    return sheets.WriteBuffer("journal-test", sheet, max_rows=100, max_delay_ms=3_600_000, journal_dir=journal_dir)
+
+
+def test_unflushed_writes_are_recovered_from_the_journal(tmp_path):
+    buffer = make_buffer(Sheet(), str(tmp_path))
+    buffer.stage({2: {2: "치과 검진", 8: "파싱 완료"}})
+    buffer.stage({3: {2: "학부모 설명회"}})
+    buffer.stage({2: {8: "캘린더 등록 완료"}})
+    buffer._timer.cancel()
+
+    # 기록 도중 종료된 마지막 줄은 건너뜀
+    with open(buffer.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"4": {"8": "파싱')
+
+    sheet = Sheet()
+    recovered = make_buffer(sheet, str(tmp_path))
+    assert recovered.pending_rows() == 2
+
+    recovered.flush()
+    assert sheet.updates == [[
+        {"range": "B2", "values": [["치과 검진"]]},
+        {"range": "H2", "values": [["캘린더 등록 완료"]]},
+        {"range": "B3", "values": [["학부모 설명회"]]},
+    ]]
+    assert not os.path.exists(recovered.journal_path)
+
+
+def test_failed_flush_keeps_writes_in_the_journal(tmp_path):
+    buffer = make_buffer(Sheet(failing=True), str(tmp_path))
+    buffer.stage({2: {8: "캘린더 등록 완료"}})
+    buffer._timer.cancel()
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert buffer.pending_rows() == 1
+
+    sheet = Sheet()
+    make_buffer(sheet, str(tmp_path)).flush()
+    assert sheet.updates == [[{"range": "H2", "values": [["캘린더 등록 완료"]]}]]
@@ -0,0 +1,105 @@
+"""
+작업 큐 저장소
+미처리 이벤트 목록을 워크플로우 상태 밖에 불변으로 보관합니다.
+
+상태에는 큐 ID와 정수 커서만 저장하므로, 백로그 크기와 관계없이
+슈퍼스텝마다 갱신/직렬화되는 상태 크기가 일정하게 유지됩니다.
+큐는 디스크에도 기록되므로 체크포인트에서 재개할 때 다시 불러올 수 있습니다.
+"""
+import os
+import json
+import threading
+import uuid
+from collections import OrderedDict
+
+# 작업 큐 파일 저장 디렉터리 (빈 문자열이면 메모리에만 보관)
+WORK_QUEUE_DIR = os.getenv("WORK_QUEUE_DIR", ".cache/work_queues")
+
+
+class WorkQueue:
+    """불변 작업 목록 [(row_num, text), ...]을 큐 ID로 보관하는 저장소"""
+
+    def __init__(self, max_queues: int = 8, directory: str = WORK_QUEUE_DIR):
+        """
+        Args:
+            max_queues: 메모리에 유지할 최대 큐 수 (초과 시 가장 오래된 큐 제거)
+            directory: 큐 파일 저장 디렉터리 (재개 시 메모리에 없는 큐를 여기서 로드)
+        """
+        self.max_queues = max_queues
+        self.directory = directory
+        self._queues = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, events: list) -> str:
+        """
+        작업 목록을 저장하고 큐 ID를 반환합니다.
+
+        Args:
+            events: [(row_num, text), ...] 형태의 리스트
+
+        Returns:
+            str: 큐 ID
+        """
+        queue_id = uuid.uuid4().hex
+        events = tuple(tuple(event) for event in events)
+
+        if self.directory:
+            # 임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 깨진 파일이 남지 않도록 함
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(queue_id)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(events, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+
+        with self._lock:
+            self._remember(queue_id, events)
+        return queue_id
+
+    def _path(self, queue_id: str) -> str:
+        return os.path.join(self.directory, f"{queue_id}.json")
+
+    def _remember(self, queue_id: str, events: tuple):
+        self._queues[queue_id] = events
+        while len(self._queues) > self.max_queues:
+            self._queues.popitem(last=False)
+
+    def _get_queue(self, queue_id: str) -> tuple:
+        if not queue_id:
+            return ()
+        with self._lock:
+            if queue_id in self._queues:
+                return self._queues[queue_id]
+
+            # 재개 등으로 메모리에 없으면 파일에서 로드
+            if self.directory and os.path.exists(self._path(queue_id)):
+                with open(self._path(queue_id), encoding="utf-8") as f:
+                    events = tuple(tuple(event) for event in json.load(f))
+                self._remember(queue_id, events)
+                return events
+
+            raise KeyError(f"작업 큐를 찾을 수 없습니다: {queue_id}")
+
+    def get(self, queue_id: str, index: int) -> tuple:
+        """커서 위치의 작업 (row_num, text) 반환"""
+        return self._get_queue(queue_id)[index]
+
+    def slice(self, queue_id: str, start: int, stop: int = None) -> tuple:
+        """커서 구간 [start, stop)의 작업 반환"""
+        return self._get_queue(queue_id)[start:stop]
+
+    def size(self, queue_id: str) -> int:
+        """큐에 담긴 전체 작업 수"""
+        return len(self._get_queue(queue_id))
+
+    def release(self, queue_id: str):
+        """처리가 끝난 큐 제거"""
+        if not queue_id:
+            return
+        with self._lock:
+            self._queues.pop(queue_id, None)
+            if self.directory and os.path.exists(self._path(queue_id)):
+                os.remove(self._path(queue_id))
+
+
+# 프로세스 전역 작업 큐 저장소
+work_queue = WorkQueue()
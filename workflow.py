@@ -2,79 +2,119 @@
 LangGraph 워크플로우 정의
 멀티에이전트가 협업하여 이벤트를 처리합니다.
 """
+import os
+import math
+import asyncio
+import contextvars
+import functools
+import inspect
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from langgraph.graph import StateGraph, END
-from agents.state import AgentState
+from langgraph.types import Send
+from agents.state import AgentState, RowState, apply_update, with_error_count, log_processed_events
 from agents.sheets_agent import SheetsAgent
+from google_sheets_handler import SHEETS_PAGE_ROWS
 from agents.parser_agent import ParserAgent
 from agents.calendar_agent import CalendarAgent
+from work_queue import work_queue
+from dedup import is_duplicate_status
+from row_status import STATUS_SYNCED
+from metrics import metrics
+from progress import emit, capture, stream_run
 
+# 행 단위 서브그래프 결과 중 전역 상태로 합칠 필드 (모두 리듀서가 있는 필드)
+ROW_RESULT_KEYS = (
+    "processed_events", "messages", "errors", "error_count",
+    "processed_count", "success_count", "failed_count",
+)
 
-def create_event_processing_workflow():
-    """
-    이벤트 처리 워크플로우 생성
+# 병렬 처리 모드에서 동시에 처리할 최대 행 수 (config의 max_concurrency로 조정)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "8"))
 
-    워크플로우:
-    1. fetch_events: 구글 시트에서 미처리 이벤트 읽기
-    2. select_next_event: 다음 처리할 이벤트 선택
-    3. parse_event: LLM으로 텍스트 파싱
-    4. validate_data: 파싱 결과 검증
-    5. write_to_sheet: 파싱 결과를 시트에 작성
-    6. create_calendar_event: 캘린더에 등록
-    7. mark_synced: 캘린더 동기화 완료 표시
-    8. check_complete: 모든 이벤트 처리 완료 확인
+# 비동기 모드에서 시트/캘린더 등 블로킹 호출을 실행할 스레드 수
+DEFAULT_IO_WORKERS = int(os.getenv("IO_WORKERS", "16"))
+
+# 배치 모드에서 단계마다 한 번에 처리할 행 수
+DEFAULT_BATCH_SIZE = int(os.getenv("BATCH_SIZE", "20"))
+
+# 청크 모드에서 한 번에 서브그래프로 넘길 행 수
+DEFAULT_CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "50"))
+
+# 순차/배치 워크플로우가 행(배치)마다 거치는 슈퍼스텝 수
+# (select → parse → validate → write → calendar → mark_synced → check_complete)
+STEPS_PER_ITERATION = 7
+
+# recursion_limit 최솟값과, 미처리 행 수를 센 뒤 읽기 전에 추가된 행을 위한 여유 반복 수
+MIN_RECURSION_LIMIT = 100
+RECURSION_SLACK_ITERATIONS = 10
+
+# 청크 모드에서 시트를 한 번에 읽는 행 범위 크기
+DEFAULT_PAGE_SIZE = SHEETS_PAGE_ROWS
+
+
+def _add_node(workflow: StateGraph, name: str, node):
     """
-    # 에이전트 초기화
-    sheets_agent = SheetsAgent()
-    parser_agent = ParserAgent()
-    calendar_agent = CalendarAgent()
+    노드를 그래프에 추가 (동기/코루틴 노드 모두 지원)
 
-    # 그래프 생성
-    workflow = StateGraph(AgentState)
+    노드 실행 시간을 metrics에 기록하고, 결과에 errors가 있으면
+    error_count를 함께 기록합니다.
+    """
+    if inspect.iscoroutinefunction(node):
+        async def wrapped(state):
+            with metrics.timer("node", name):
+                return with_error_count(await node(state))
+    else:
+        def wrapped(state):
+            with metrics.timer("node", name):
+                return with_error_count(node(state))
+
+    workflow.add_node(name, wrapped)
+
+
+def new_event(row_num: int, text: str) -> dict:
+    """처리 대기 행으로부터 current_event 초기값 생성"""
+    return {
+        "row_number": row_num,
+        "original_text": text,
+        "title": "",
+        "date": "",
+        "time": "",
+        "location": "",
+        "description": "",
+        "notes": "",
+        "status": "처리 중",
+        "error": None
+    }
 
-    # 노드 정의
-    def fetch_events_node(state: AgentState) -> AgentState:
-        """1. 구글 시트에서 미처리 이벤트 가져오기"""
-        return sheets_agent.fetch_unprocessed_events(state)
 
-    def select_next_event_node(state: AgentState) -> AgentState:
-        """2. 다음 처리할 이벤트 선택"""
-        unprocessed = state.get("unprocessed_events", [])
+def recursion_limit_for(rows: int, batch_size: int = 1) -> int:
+    """
+    rows개 행을 한 번의 실행으로 처리하는 데 필요한 recursion_limit
 
-        if not unprocessed:
-            return {
-                "current_event": None,
-                "messages": ["ℹ️  처리할 이벤트가 없습니다."]
-            }
+    순차 워크플로우는 행마다, 배치 워크플로우는 batch_size개마다 STEPS_PER_ITERATION 슈퍼스텝을
+    소모하므로 반복 횟수에 비례해 정하고, fetch_events와 마지막 선택 단계(2)와 여유분을 더합니다.
+    병렬/비동기 워크플로우는 깊이가 행 수와 무관하므로 최솟값이면 충분합니다.
+    """
+    iterations = math.ceil(max(rows, 0) / max(batch_size, 1)) + RECURSION_SLACK_ITERATIONS
+    return max(MIN_RECURSION_LIMIT, iterations * STEPS_PER_ITERATION + 2)
 
-        # 첫 번째 이벤트 선택
-        row_num, text = unprocessed[0]
-
-        current_event = {
-            "row_number": row_num,
-            "original_text": text,
-            "title": "",
-            "date": "",
-            "time": "",
-            "location": "",
-            "description": "",
-            "notes": "",
-            "status": "처리 중",
-            "error": None
-        }
 
-        # 나머지 이벤트 목록 업데이트
-        remaining = unprocessed[1:]
+def _is_synced(event: dict) -> bool:
+    """캘린더에 등록됐거나 이미 등록된 일정의 중복이면 True"""
+    status = event.get("status")
+    return status == STATUS_SYNCED or is_duplicate_status(status)
 
-        print(f"\n{'='*60}")
-        print(f"[{state.get('processed_count', 0) + 1}/{state.get('total_events', 0)}] 행 {row_num} 처리 시작")
-        print(f"{'='*60}")
 
-        return {
-            "current_event": current_event,
-            "unprocessed_events": remaining,
-            "messages": [f"📋 행 {row_num} 선택"]
-        }
+def _create_row_nodes(sheets_agent: SheetsAgent,
+                      parser_agent: ParserAgent,
+                      calendar_agent: CalendarAgent) -> dict:
+    """
+    한 행을 처리하는 노드 함수들 생성
 
+    순차 워크플로우와 행 단위 서브그래프가 같은 노드를 공유합니다.
+    카운트 필드는 리듀서로 합산되므로 증분값(1)만 반환합니다.
+    """
     def parse_event_node(state: AgentState) -> AgentState:
         """3. LLM으로 텍스트 파싱"""
         return parser_agent.parse_event_text(state)
@@ -95,52 +135,204 @@ def create_event_processing_workflow():
         """7. 캘린더 동기화 완료 표시"""
         current_event = state.get("current_event")
 
-        # 캘린더 등록 성공 시에만 표시
-        if current_event and current_event.get("status") == "캘린더 등록 완료":
+        # 캘린더 등록 성공 또는 이미 등록된 일정(중복)
+        if current_event and _is_synced(current_event):
             result = sheets_agent.mark_calendar_synced(state)
 
-            # 처리 완료 이벤트를 기록
-            processed_event = {
-                **current_event,
-                "status": "캘린더 등록 완료"
-            }
+            # 처리 완료 이벤트를 기록 (이력 파일은 노드가 성공한 뒤 한 번만 기록)
+            processed_event = dict(current_event)
+            log_processed_events([processed_event])
 
             return {
                 **result,
                 "processed_events": [processed_event],
-                "processed_count": state.get("processed_count", 0) + 1,
-                "success_count": state.get("success_count", 0) + 1,
+                "processed_count": 1,
+                "success_count": 1,
             }
         else:
-            # 캘린더 등록 실패한 경우
-            processed_event = {
-                **current_event,
-                "status": current_event.get("status", "완료 (캘린더 등록 실패)")
-            }
+            # 캘린더 등록 실패 또는 건너뜀: 캘린더 단계가 정한 상태(오류/건너뜀)를 기록해 오류 행만 다음 실행에서 다시 처리
+            processed_event = dict(current_event)
+            result = sheets_agent.mark_calendar_synced(state)
+
+            log_processed_events([processed_event])
+
+            warning_msg = f"⚠️  행 {current_event['row_number']} 처리 완료 (캘린더 등록 실패)"
+            emit("mark_synced", "warning", warning_msg, row=current_event["row_number"],
+                 status_text=processed_event["status"])
 
             return {
+                **result,
                 "processed_events": [processed_event],
-                "processed_count": state.get("processed_count", 0) + 1,
-                "failed_count": state.get("failed_count", 0) + 1,
-                "messages": [f"⚠️  행 {current_event['row_number']} 처리 완료 (캘린더 등록 실패)"]
+                "processed_count": 1,
+                "failed_count": 1,
+                "messages": result.get("messages", []) + [warning_msg]
             }
 
+    return {
+        "parse_event": parse_event_node,
+        "validate_data": validate_data_node,
+        "write_to_sheet": write_to_sheet_node,
+        "create_calendar_event": create_calendar_event_node,
+        "mark_synced": mark_synced_node,
+    }
+
+
+def _add_row_pipeline(workflow: StateGraph, row_nodes: dict):
+    """parse_event → ... → mark_synced 노드와 엣지를 그래프에 추가"""
+    for name, node in row_nodes.items():
+        _add_node(workflow, name, node)
+
+    workflow.add_edge("parse_event", "validate_data")
+    workflow.add_edge("validate_data", "write_to_sheet")
+    workflow.add_edge("write_to_sheet", "create_calendar_event")
+    workflow.add_edge("create_calendar_event", "mark_synced")
+
+
+def _offload(node, executor: ThreadPoolExecutor):
+    """블로킹 노드를 스레드 풀에서 실행하는 코루틴 노드로 감싸기"""
+    async def async_node(state):
+        loop = asyncio.get_running_loop()
+        # 추적(LangSmith) 컨텍스트가 유지되도록 현재 컨텍스트에서 실행
+        call = functools.partial(contextvars.copy_context().run, node, state)
+        return await loop.run_in_executor(executor, call)
+    return async_node
+
+
+def _create_async_row_nodes(sheets_agent: SheetsAgent,
+                            parser_agent: ParserAgent,
+                            calendar_agent: CalendarAgent,
+                            executor: ThreadPoolExecutor) -> dict:
+    """
+    한 행을 처리하는 코루틴 노드 함수들 생성
+
+    파싱은 AsyncOpenAI로 직접 대기하고, 시트/캘린더 호출은
+    크기가 제한된 스레드 풀로 넘겨 이벤트 루프를 막지 않습니다.
+    """
+    row_nodes = _create_row_nodes(sheets_agent, parser_agent, calendar_agent)
+
+    async def parse_event_node(state: AgentState) -> AgentState:
+        """3. LLM으로 텍스트 파싱 (비동기)"""
+        return await parser_agent.aparse_event_text(state)
+
+    async def validate_data_node(state: AgentState) -> AgentState:
+        """4. 파싱 결과 검증 (I/O 없음)"""
+        return row_nodes["validate_data"](state)
+
+    return {
+        "parse_event": parse_event_node,
+        "validate_data": validate_data_node,
+        "write_to_sheet": _offload(row_nodes["write_to_sheet"], executor),
+        "create_calendar_event": _offload(row_nodes["create_calendar_event"], executor),
+        "mark_synced": _offload(row_nodes["mark_synced"], executor),
+    }
+
+
+def _compile_row_workflow(row_nodes: dict):
+    """행 단위 노드로 서브그래프 컴파일"""
+    workflow = StateGraph(RowState)
+    _add_row_pipeline(workflow, row_nodes)
+    workflow.set_entry_point("parse_event")
+    workflow.add_edge("mark_synced", END)
+    return workflow.compile()
+
+
+def create_row_workflow(sheets_agent: SheetsAgent,
+                        parser_agent: ParserAgent,
+                        calendar_agent: CalendarAgent):
+    """
+    한 행만 처리하는 서브그래프 생성
+
+    parse_event → validate_data → write_to_sheet
+    → create_calendar_event → mark_synced
+
+    입력: {"current_event": new_event(row_num, text)}
+    """
+    return _compile_row_workflow(_create_row_nodes(sheets_agent, parser_agent, calendar_agent))
+
+
+def _remaining(state: AgentState) -> int:
+    """커서 이후 남은 이벤트 수"""
+    return state.get("total_events", 0) - state.get("cursor", 0)
+
+
+def _fan_out_events(state: AgentState):
+    """미처리 이벤트를 행 단위 Send로 분기 (map)"""
+    if _remaining(state) <= 0:
+        return END
+    return [
+        Send("process_event", {"current_event": new_event(row_num, text)})
+        for row_num, text in work_queue.slice(state["queue_id"], state.get("cursor", 0))
+    ]
+
+
+def create_event_processing_workflow(checkpointer=None):
+    """
+    이벤트 처리 워크플로우 생성
+
+    워크플로우:
+    1. fetch_events: 구글 시트에서 미처리 이벤트 읽기
+    2. select_next_event: 다음 처리할 이벤트 선택
+    3. parse_event: LLM으로 텍스트 파싱
+    4. validate_data: 파싱 결과 검증
+    5. write_to_sheet: 파싱 결과를 시트에 작성
+    6. create_calendar_event: 캘린더에 등록
+    7. mark_synced: 캘린더 동기화 완료 표시
+    8. check_complete: 모든 이벤트 처리 완료 확인
+
+    Args:
+        checkpointer: 체크포인트 저장소 (지정 시 thread_id로 중단된 실행 재개 가능)
+    """
+    # 에이전트 초기화
+    sheets_agent = SheetsAgent()
+    parser_agent = ParserAgent()
+    calendar_agent = CalendarAgent()
+
+    # 그래프 생성
+    workflow = StateGraph(AgentState)
+
+    # 노드 정의
+    def fetch_events_node(state: AgentState) -> AgentState:
+        """1. 구글 시트에서 미처리 이벤트 가져오기"""
+        return sheets_agent.fetch_unprocessed_events(state)
+
+    def select_next_event_node(state: AgentState) -> AgentState:
+        """2. 다음 처리할 이벤트 선택"""
+        if _remaining(state) <= 0:
+            return {
+                "current_event": None,
+                "messages": ["ℹ️  처리할 이벤트가 없습니다."]
+            }
+
+        # 커서 위치의 이벤트 선택 (목록은 복사하지 않고 커서만 전진)
+        cursor = state.get("cursor", 0)
+        row_num, text = work_queue.get(state["queue_id"], cursor)
+        current_event = new_event(row_num, text)
+
+        emit(
+            "select", "started",
+            f"{'='*60}\n"
+            f"[{state.get('processed_count', 0) + 1}/{state.get('total_events', 0)}] 행 {row_num} 처리 시작\n"
+            f"{'='*60}",
+            row=row_num
+        )
+
+        return {
+            "current_event": current_event,
+            "cursor": cursor + 1,
+            "messages": [f"📋 행 {row_num} 선택"]
+        }
+
     def check_complete_node(state: AgentState) -> AgentState:
         """8. 처리 완료 확인"""
-        unprocessed = state.get("unprocessed_events", [])
         return {
-            "messages": [f"✓ 남은 이벤트: {len(unprocessed)}개"]
+            "messages": [f"✓ 남은 이벤트: {_remaining(state)}개"]
         }
 
     # 노드 추가
-    workflow.add_node("fetch_events", fetch_events_node)
-    workflow.add_node("select_next_event", select_next_event_node)
-    workflow.add_node("parse_event", parse_event_node)
-    workflow.add_node("validate_data", validate_data_node)
-    workflow.add_node("write_to_sheet", write_to_sheet_node)
-    workflow.add_node("create_calendar_event", create_calendar_event_node)
-    workflow.add_node("mark_synced", mark_synced_node)
-    workflow.add_node("check_complete", check_complete_node)
+    _add_node(workflow, "fetch_events", fetch_events_node)
+    _add_node(workflow, "select_next_event", select_next_event_node)
+    _add_row_pipeline(workflow, _create_row_nodes(sheets_agent, parser_agent, calendar_agent))
+    _add_node(workflow, "check_complete", check_complete_node)
 
     # 엣지 정의 (워크플로우 흐름)
     workflow.set_entry_point("fetch_events")
@@ -165,17 +357,12 @@ def create_event_processing_workflow():
         }
     )
 
-    workflow.add_edge("parse_event", "validate_data")
-    workflow.add_edge("validate_data", "write_to_sheet")
-    workflow.add_edge("write_to_sheet", "create_calendar_event")
-    workflow.add_edge("create_calendar_event", "mark_synced")
     workflow.add_edge("mark_synced", "check_complete")
 
     # 조건부 엣지: 다음 이벤트가 있으면 반복, 없으면 종료
     def should_continue(state: AgentState) -> str:
         """계속 처리할 이벤트가 있는지 확인"""
-        unprocessed = state.get("unprocessed_events", [])
-        if unprocessed:
+        if _remaining(state) > 0:
             return "select_next_event"
         else:
             return "end"
@@ -190,35 +377,421 @@ def create_event_processing_workflow():
     )
 
     # 그래프 컴파일 (recursion_limit을 늘려서 더 많은 이벤트 처리 가능)
-    app = workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
 
     return app
 
 
+def create_parallel_workflow(checkpointer=None):
+    """
+    병렬(map-reduce) 이벤트 처리 워크플로우 생성
+
+    워크플로우:
+    1. fetch_events: 구글 시트에서 미처리 이벤트 읽기
+    2. process_event: 행마다 Send로 분기하여 행 단위 서브그래프 실행 (동시 처리)
+    3. 각 행의 결과(processed_events, messages, errors, 카운트)는
+       AgentState의 리듀서로 합쳐집니다.
+
+    동시 처리 수는 실행 시 config={"max_concurrency": N}으로 제한합니다.
+
+    Args:
+        checkpointer: 체크포인트 저장소 (행 단위 서브그래프도 같은 저장소에
+                      기록되어, 재개 시 각 행이 마지막 완료 노드부터 이어서 처리됨)
+    """
+    # 에이전트 초기화
+    sheets_agent = SheetsAgent()
+    parser_agent = ParserAgent()
+    calendar_agent = CalendarAgent()
+
+    row_app = create_row_workflow(sheets_agent, parser_agent, calendar_agent)
+
+    # 그래프 생성
+    workflow = StateGraph(AgentState)
+
+    def fetch_events_node(state: AgentState) -> AgentState:
+        """1. 구글 시트에서 미처리 이벤트 가져오기"""
+        return sheets_agent.fetch_unprocessed_events(state)
+
+    def process_event_node(state: RowState) -> AgentState:
+        """2. 한 행을 서브그래프로 처리하고 결과만 반환"""
+        result = row_app.invoke(state)
+        return {key: result[key] for key in ROW_RESULT_KEYS if key in result}
+
+    _add_node(workflow, "fetch_events", fetch_events_node)
+    _add_node(workflow, "process_event", process_event_node)
+
+    # fetch_events 후 행마다 process_event로 분기 (map)
+    workflow.set_entry_point("fetch_events")
+    workflow.add_conditional_edges("fetch_events", _fan_out_events, ["process_event", END])
+    workflow.add_edge("process_event", END)
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def create_async_workflow(io_workers: int = DEFAULT_IO_WORKERS, checkpointer=None, executor=None):
+    """
+    비동기 병렬 이벤트 처리 워크플로우 생성 (ainvoke 전용)
+
+    create_parallel_workflow와 같은 구조이지만 모든 노드가 코루틴입니다.
+    - 파싱: AsyncOpenAI
+    - 시트/캘린더: 최대 io_workers개 스레드 풀에서 실행
+
+    하나의 프로세스에서 수십 개 행을 동시에 처리할 수 있으며,
+    동시 처리 수는 config={"max_concurrency": N}으로 제한합니다.
+
+    Args:
+        io_workers: 블로킹 호출용 스레드 풀 크기
+        checkpointer: 비동기 체크포인트 저장소 (예: AsyncSqliteSaver)
+        executor: 블로킹 호출용 스레드 풀 (실행이 끝나면 넘긴 쪽에서 shutdown)
+                  생략하면 io_workers 크기로 만든 풀을 워크플로우의 io_executor로 노출
+    """
+    # 에이전트 초기화
+    sheets_agent = SheetsAgent()
+    parser_agent = ParserAgent()
+    calendar_agent = CalendarAgent()
+
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="io")
+    row_app = _compile_row_workflow(
+        _create_async_row_nodes(sheets_agent, parser_agent, calendar_agent, executor)
+    )
+
+    # 그래프 생성
+    workflow = StateGraph(AgentState)
+
+    fetch_events_node = _offload(sheets_agent.fetch_unprocessed_events, executor)
+
+    async def process_event_node(state: RowState) -> AgentState:
+        """2. 한 행을 비동기 서브그래프로 처리하고 결과만 반환"""
+        result = await row_app.ainvoke(state)
+        return {key: result[key] for key in ROW_RESULT_KEYS if key in result}
+
+    _add_node(workflow, "fetch_events", fetch_events_node)
+    _add_node(workflow, "process_event", process_event_node)
+
+    workflow.set_entry_point("fetch_events")
+    workflow.add_conditional_edges("fetch_events", _fan_out_events, ["process_event", END])
+    workflow.add_edge("process_event", END)
+
+    app = workflow.compile(checkpointer=checkpointer)
+    app.io_executor = executor
+    return app
+
+
+def create_batched_workflow(batch_size: int = DEFAULT_BATCH_SIZE, checkpointer=None):
+    """
+    단계별 배치 이벤트 처리 워크플로우 생성
+
+    각 노드가 K(batch_size)개 행을 한꺼번에 처리하므로 외부 API 왕복이
+    행당 약 5회에서 배치당 약 5회로 줄어듭니다.
+
+    워크플로우:
+    1. fetch_events: 구글 시트에서 미처리 이벤트 읽기
+    2. select_batch: 다음 K개 이벤트 선택
+    3. parse_batch: K개 텍스트 동시 파싱
+    4. validate_batch: 파싱 결과 검증
+    5. write_batch: 파싱 결과와 상태를 한 번의 Sheets batchUpdate로 작성
+    6. calendar_batch: 한 번의 Calendar 배치 요청으로 등록
+    7. mark_batch: 등록 결과 상태를 한 번에 표시
+    8. check_complete: 남은 이벤트가 있으면 2번으로
+
+    Args:
+        batch_size: 배치 크기 (K)
+        checkpointer: 체크포인트 저장소
+    """
+    # 에이전트 초기화
+    sheets_agent = SheetsAgent()
+    parser_agent = ParserAgent()
+    calendar_agent = CalendarAgent()
+
+    # 그래프 생성
+    workflow = StateGraph(AgentState)
+
+    def fetch_events_node(state: AgentState) -> AgentState:
+        """1. 구글 시트에서 미처리 이벤트 가져오기"""
+        return sheets_agent.fetch_unprocessed_events(state)
+
+    def select_batch_node(state: AgentState) -> AgentState:
+        """2. 다음 처리할 배치 선택"""
+        if _remaining(state) <= 0:
+            return {
+                "current_batch": None,
+                "messages": ["ℹ️  처리할 이벤트가 없습니다."]
+            }
+
+        cursor = state.get("cursor", 0)
+        batch = [
+            new_event(row_num, text)
+            for row_num, text in work_queue.slice(state["queue_id"], cursor, cursor + batch_size)
+        ]
+        processed = state.get("processed_count", 0)
+
+        emit(
+            "select", "started",
+            f"{'='*60}\n"
+            f"[{processed + 1}~{processed + len(batch)}/{state.get('total_events', 0)}] "
+            f"행 {batch[0]['row_number']}~{batch[-1]['row_number']} 배치 처리 시작\n"
+            f"{'='*60}",
+            rows=[event["row_number"] for event in batch]
+        )
+
+        return {
+            "current_batch": batch,
+            "cursor": cursor + len(batch),
+            "messages": [f"📋 행 {batch[0]['row_number']}~{batch[-1]['row_number']} ({len(batch)}개) 선택"]
+        }
+
+    def parse_batch_node(state: AgentState) -> AgentState:
+        """3. 배치 텍스트 동시 파싱"""
+        return parser_agent.parse_batch(state)
+
+    def validate_batch_node(state: AgentState) -> AgentState:
+        """4. 배치 파싱 결과 검증"""
+        return parser_agent.validate_batch(state)
+
+    def write_batch_node(state: AgentState) -> AgentState:
+        """5. 배치 파싱 결과를 시트에 일괄 작성"""
+        return sheets_agent.write_parsed_batch(state)
+
+    def calendar_batch_node(state: AgentState) -> AgentState:
+        """6. 배치 캘린더 일괄 등록"""
+        return calendar_agent.create_calendar_events(state)
+
+    def mark_batch_node(state: AgentState) -> AgentState:
+        """7. 캘린더 동기화 완료 일괄 표시 및 결과 집계"""
+        batch = state.get("current_batch") or []
+        succeeded = [event for event in batch if _is_synced(event)]
+        failed = [event for event in batch if not _is_synced(event)]
+
+        result = sheets_agent.mark_batch_synced(state)
+        for event in failed:
+            emit("mark_synced", "warning", f"⚠️  행 {event['row_number']} 처리 완료 (캘린더 등록 실패)",
+                 row=event["row_number"], status_text=event.get("status", ""))
+
+        processed_events = [dict(event) for event in batch]
+        log_processed_events(processed_events)
+
+        return {
+            **result,
+            "processed_events": processed_events,
+            "processed_count": len(batch),
+            "success_count": len(succeeded),
+            "failed_count": len(failed),
+            "messages": result.get("messages", []) + [
+                f"⚠️  행 {event['row_number']} 처리 완료 (캘린더 등록 실패)" for event in failed
+            ],
+        }
+
+    def check_complete_node(state: AgentState) -> AgentState:
+        """8. 처리 완료 확인"""
+        return {
+            "messages": [f"✓ 남은 이벤트: {_remaining(state)}개"]
+        }
+
+    # 노드 추가
+    _add_node(workflow, "fetch_events", fetch_events_node)
+    _add_node(workflow, "select_batch", select_batch_node)
+    _add_node(workflow, "parse_batch", parse_batch_node)
+    _add_node(workflow, "validate_batch", validate_batch_node)
+    _add_node(workflow, "write_batch", write_batch_node)
+    _add_node(workflow, "calendar_batch", calendar_batch_node)
+    _add_node(workflow, "mark_batch", mark_batch_node)
+    _add_node(workflow, "check_complete", check_complete_node)
+
+    # 엣지 정의
+    workflow.set_entry_point("fetch_events")
+    workflow.add_edge("fetch_events", "select_batch")
+
+    def route_after_selection(state: AgentState) -> str:
+        """배치 선택 후 라우팅"""
+        return "end" if not state.get("current_batch") else "parse_batch"
+
+    workflow.add_conditional_edges(
+        "select_batch",
+        route_after_selection,
+        {
+            "parse_batch": "parse_batch",
+            "end": END
+        }
+    )
+
+    workflow.add_edge("parse_batch", "validate_batch")
+    workflow.add_edge("validate_batch", "write_batch")
+    workflow.add_edge("write_batch", "calendar_batch")
+    workflow.add_edge("calendar_batch", "mark_batch")
+    workflow.add_edge("mark_batch", "check_complete")
+
+    def should_continue(state: AgentState) -> str:
+        """계속 처리할 이벤트가 있는지 확인"""
+        return "select_batch" if _remaining(state) > 0 else "end"
+
+    workflow.add_conditional_edges(
+        "check_complete",
+        should_continue,
+        {
+            "select_batch": "select_batch",
+            "end": END
+        }
+    )
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+# 청크 모드에서 행 하나의 처리가 끝났음을 알리는 이벤트 큐 표시
+_ROW_DONE = object()
+
+
+class ChunkedWorkflowRunner:
+    """
+    행 단위 서브그래프를 청크 단위로 반복 실행하는 외부 드라이버
+
+    순차 워크플로우는 행마다 약 7 슈퍼스텝을 소모하므로 recursion_limit에
+    걸려 한 번에 처리할 수 있는 행 수가 제한됩니다. 이 드라이버는 그래프
+    루프 대신 파이썬 루프로 행을 순회하고, 각 행은 깊이가 고정된
+    서브그래프(create_row_workflow)로 처리하므로 행 수와 관계없이
+    한 번의 실행으로 전체 백로그를 처리합니다.
+
+    미처리 행은 전체를 미리 읽지 않고 page_size행 범위씩 읽는 대로 처리하며,
+    현재 페이지를 처리하는 동안 다음 페이지를 미리 읽습니다.
+    메모리에 남는 행 수는 백로그 크기가 아니라 페이지 크기에 비례합니다.
+
+    컴파일된 그래프와 같은 invoke(state, config) 인터페이스를 제공합니다.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, page_size: int = DEFAULT_PAGE_SIZE):
+        self.chunk_size = chunk_size
+        self.page_size = page_size
+
+        # 에이전트 초기화
+        self.sheets_agent = SheetsAgent()
+        self.parser_agent = ParserAgent()
+        self.calendar_agent = CalendarAgent()
+
+        self.row_app = create_row_workflow(
+            self.sheets_agent, self.parser_agent, self.calendar_agent
+        )
+
+    def invoke(self, initial_state: dict, config: dict = None) -> dict:
+        """
+        미처리 이벤트를 모두 처리하고 최종 상태를 반환합니다.
+
+        Args:
+            initial_state: 초기 상태
+            config: 서브그래프 실행 설정 (max_concurrency로 청크 내 동시 처리 수 제한)
+
+        Returns:
+            최종 상태
+        """
+        result = None
+        for kind, payload in self.stream(initial_state, config):
+            if kind == "result":
+                result = payload
+        return result
+
+    def stream(self, initial_state: dict, config: dict = None):
+        """
+        invoke와 같지만 진행 이벤트를 발생 순서대로 내보냅니다.
+
+        progress.stream_run과 같은 형식으로 ("progress", event)를 내보내고,
+        마지막에 ("result", state)를 내보냅니다.
+        """
+        events = queue.Queue()
+        state = dict(initial_state)
+        max_workers = (config or {}).get("max_concurrency") or DEFAULT_MAX_CONCURRENCY
+        pages = self.sheets_agent.iter_unprocessed_events(self.page_size)
+
+        def run_row(row_num: int, text: str) -> dict:
+            """한 행을 서브그래프로 처리하며 진행 이벤트를 큐로 전달"""
+            result = {}
+            for mode, chunk in self.row_app.stream(
+                {"current_event": new_event(row_num, text)}, config,
+                stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    events.put(chunk)
+                else:
+                    result = chunk
+            return result
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                while True:
+                    # 다음 페이지 (백그라운드에서 미리 읽어 둔 페이지가 있으면 바로 반환)
+                    with capture(events.put):
+                        page = next(pages, None)
+                    while not events.empty():
+                        yield "progress", events.get()
+                    if page is None:
+                        break
+
+                    rows = page.pop("events")
+                    apply_update(state, with_error_count(page))
+                    state["total_events"] = state.get("total_events", 0) + len(rows)
+
+                    for start in range(0, len(rows), self.chunk_size):
+                        chunk = rows[start:start + self.chunk_size]
+                        futures = [executor.submit(run_row, row_num, text) for row_num, text in chunk]
+                        for future in futures:
+                            # 행의 진행 이벤트를 모두 넣은 뒤 완료 표시를 넣음
+                            future.add_done_callback(lambda _: events.put(_ROW_DONE))
+
+                        # 청크의 모든 행이 끝날 때까지 진행 이벤트를 기다려 실시간으로 전달
+                        running = len(futures)
+                        while running:
+                            event = events.get()
+                            if event is _ROW_DONE:
+                                running -= 1
+                            else:
+                                yield "progress", event
+
+                        for future in futures:
+                            result = future.result()
+                            apply_update(state, {key: result[key] for key in ROW_RESULT_KEYS if key in result})
+
+                        state["cursor"] = state.get("cursor", 0) + len(chunk)
+                        yield "progress", {
+                            "stage": "chunk", "status": "done", "row": None,
+                            "message": f"📦 청크 처리 완료: {state['cursor']}/{state['total_events']} (지금까지 읽은 행 기준)",
+                            "cursor": state["cursor"], "total": state["total_events"],
+                        }
+        finally:
+            # 중간에 멈추면(예외, 호출한 쪽의 close) 다음 페이지를 미리 읽는 스레드도 정리
+            pages.close()
+
+        yield "result", state
+
+
 if __name__ == "__main__":
     # 워크플로우 테스트
     app = create_event_processing_workflow()
 
     # 초기 상태
     initial_state = {
-        "unprocessed_events": [],
+        "queue_id": None,
+        "cursor": 0,
         "current_event": None,
         "processed_events": [],
         "messages": [],
         "errors": [],
+        "error_count": 0,
         "total_events": 0,
         "processed_count": 0,
         "success_count": 0,
         "failed_count": 0,
     }
 
-    # 실행
+    # 실행 (진행 이벤트를 받아 출력)
     print("워크플로우 테스트 실행...")
-    result = app.invoke(initial_state)
+    result = None
+    for kind, payload in stream_run(app, initial_state):
+        if kind == "progress":
+            print(payload["message"])
+        else:
+            result = payload
 
     print("\n" + "="*60)
     print("워크플로우 완료!")
     print("="*60)
-    print(f"처리된 이벤트: {len(result.get('processed_events', []))}개")
+    print(f"처리된 이벤트: {result.get('processed_count', 0)}개")
     print(f"성공: {result.get('success_count', 0)}개")
     print(f"실패: {result.get('failed_count', 0)}개")